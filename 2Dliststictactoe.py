@@ -1,40 +1,42 @@
-board = [[0,0,0],[0,0,0],[0,0,0]]
+from mnk_engine import isWinningMove
+
+# Board size and how many in a row win (3, 3, 3 is Tic Tac Toe; try 15, 15, 5 for Gomoku)
+WIDTH = 3
+HEIGHT = 3
+K = 3
+
+board = [[0] * WIDTH for row in range(HEIGHT)]
 
 isWinner = False
 
 def showBoard():
-    print(board[0])
-    print(board[1])
-    print(board[2])
+    for row in board:
+        print(row)
 
 def xTurn():
     col = int(input("It's X's turn, which column?"))
     row = int(input("and which row?"))
     board[row][col] = "x"
-    checkForWin("x")
+    checkForWin("x", row, col)
 
 def yTurn():
     col = int(input("It's Y's turn, which column?"))
     row = int(input("and which row?"))
     board[row][col] = "y"
-    checkForWin("y")
+    checkForWin("y", row, col)
 
-def checkForWin(winner):
-    #horizontal
-    if board[0][0] == board[0][1] == board[0][2] == winner or board[1][0] == board[1][1] == board[1][2] == winner or board[2][0] == board[2][1] == board[2][2] == winner:
-        print(winner, " is the winner!")
-    #diagonal
-    if board[0][0] == board[1][1] == board[2][2] == winner or board[0][2] == board[1][1] == board[2][0] == winner :
-        print(winner, " is the winner!")
-    #vertical
-    if board[0][0] == board[1][0] == board[2][0] == winner or board[0][1] == board[1][1] == board[2][1] == winner or board[0][2] == board[1][2] == board[2][2] == winner :
+def checkForWin(winner, row, col):
+    global isWinner
+    #only the lines through the new piece can have been completed by it
+    if isWinningMove(board, row, col, K):
         print(winner, " is the winner!")
+        isWinner = True
 
 while isWinner == False:
     showBoard()
     xTurn()
+    if isWinner:
+        break
     showBoard()
     yTurn()
-
-
-
+showBoard()
@@ -1,6 +1,8 @@
 # Instructions
 # Demonstartes programmer-based functions
 
+from tictactoe_table import getBestMove
+
 def display_instruct():
     """Display game intructions"""
     print \
@@ -115,27 +117,10 @@ def human_move(board, human):
 
 def computer_move(board, computer, human):
     """Make computer move."""
-    # Make a copy to work with since function will be changing list
-    board = board[:]
-
-    # The best position to have, in order
-    BEST_MOVES = (4, 0, 2, 6, 8, 1, 3, 5, 7)
-    print "I shall take square number",
-
-#If computer can win, take that move.
-    for move in legal_moves(board):
-        board[move] = computer
-        if winner(board) == computer:
-            print move
-            return move
-        # done checking this move, undo it
-        board[move] = EMPTY
-
-# Since no one can win the nest move, pick best open square
-    for move in BEST_MOVES:
-        if move in legal_moves(board):
-            print move
-            return move
+    # Every position has been solved, so the best move is a single table lookup
+    move = getBestMove(board, computer)
+    print "I shall take square number", move
+    return move
     
 def next_turn(turn):
     """Swicth turns."""
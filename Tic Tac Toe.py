@@ -2,6 +2,8 @@
 
 import random
 
+from tictactoe_table import getBestMove
+
 def drawBoard(board):
     # This function prints out the board that it was passed.
     
@@ -94,40 +96,12 @@ def chooseRandomMoveFromList(board, movesList):
             return None
             
 def getComputerMove(board, computerLetter):
-    # Given a board and the computer's letter, determine where to move and reutrn that move.
-    if computerLetter == 'X':
-        playerLetter = 'O'
-    else:
-        playerLetter = 'X'
-        
-    # Here is our algorithm for out Tic Tac Toe AI:
-    # First, check if we can win in the next move
-    for i in range(1, 9):
-        copy = getBoardCopy(board)
-        if isSpaceFree(copy, i):
-            makeMove(copy, computerLetter, i)
-            if isWinner(copy, computerLetter):
-                return i
-    
-    # Check if the player could win on their next move, and block them.
-    for i in range(1,  9):
-        copy = getBoardCopy(board)
-        if isSpaceFree(copy, i):
-            makeMove(copy, playerLetter, i)
-            if isWinner(copy, playerLetter):
-                return i
-    
-    # Try to take one of the corners, if they are free.
-    move = chooseRandomMoveFromList(board, [1, 3, 7, 9])
-    if move != None:
-        return move
-    
-    # Try to take the center, if it is free.
-    if isSpaceFree(board, 5):
-        return 5
-    
-    # Move on one of the sides.
-    return chooseRandomMoveFromList(board, [2, 4, 6, 8])
+    # Given a board and the computer's letter, determine where to move and return that move.
+    # The best move for every position is looked up in the solved table, so the computer never loses.
+    # The table numbers squares from the top-left corner, so turn the board into that order and back.
+    squares = [board[7], board[8], board[9], board[4], board[5], board[6], board[1], board[2], board[3]]
+    move = getBestMove(squares, computerLetter)
+    return [7, 8, 9, 4, 5, 6, 1, 2, 3][move]
     
 def isBoardFull(board):
     # Return True if every space in the board has been taken. Otherwose return False.
@@ -1,7 +1,10 @@
 import pygame
-import heapq
 import random  # For generating random obstacles
 
+from pathfinding import GridMap, HEURISTICS, astar_steps as astar_steps_on_map
+from pathfinding_bidirectional import bidirectional_steps
+from pathfinding_jps import jps_steps, expand_path
+
 # Grid and window dimensions
 CELL_SIZE = 40  # Size of each cell in pixels
 GRID_WIDTH, GRID_HEIGHT = 10, 10  # You can adjust the grid size here
@@ -9,6 +12,13 @@ LOG_PANEL_HEIGHT = 150  # Height of the log panel (in pixels)
 WINDOW_WIDTH = GRID_WIDTH * CELL_SIZE
 WINDOW_HEIGHT = GRID_HEIGHT * CELL_SIZE + LOG_PANEL_HEIGHT
 
+# Search settings
+ALGORITHM = "astar"  # "astar", "jps" (Jump Point Search: only jump points are processed)
+                     # or "bidirectional" (searches from the start and the goal at once)
+DIAGONAL = False  # Allow diagonal moves (cost sqrt(2), no cutting corners of walls)
+HEURISTIC = "manhattan"  # "manhattan", "octile", "euclidean" or "zero" (Dijkstra); use "octile" with DIAGONAL
+TIE_BREAK = False  # Among nodes with equal f, process the one furthest from the start first
+
 # Animation speed (frames per second) when not in stepwise mode
 ANIMATION_SPEED = 0.5  # Adjust this value to change the speed of the visualization
 
@@ -22,6 +32,8 @@ DARK_BROWN = (101, 67, 33)  # Dark brown walls (obstacles)
 ORANGE = (255, 165, 0)  # Goal node
 LIGHT_BLUE = (173, 216, 230)  # Open set (nodes to be evaluated)
 YELLOW = (255, 255, 0)  # Current node being processed
+PURPLE = (128, 0, 128)  # Evaluated nodes of the search from the goal (bidirectional)
+PINK = (255, 192, 203)  # Open set of the search from the goal (bidirectional)
 
 # Global list to store decision logs
 log_messages = []
@@ -34,103 +46,44 @@ def log_decision(message):
     print(message)
 
 
-# Define the Node class for pathfinding
-class Node:
-    def __init__(self, position, parent=None):
-        self.position = position  # (x, y) coordinate on the grid
-        self.parent = parent  # Reference to parent Node for path reconstruction
-        self.g = 0  # Cost from start node to current node
-        self.h = 0  # Heuristic cost from current node to goal
-        self.f = 0  # Total cost (g + h)
-
-    def __lt__(self, other):
-        # Allows Node objects to be compared based on f cost (needed for the priority queue)
-        return self.f < other.f
-
-
-# Heuristic function using Manhattan distance
-def heuristic(current, goal):
-    """Calculate the Manhattan distance between current and goal positions."""
-    return abs(current[0] - goal[0]) + abs(current[1] - goal[1])
-
-
 # Generator-based A* algorithm that yields state after each decision step.
 def astar_steps(grid, start, goal):
     """
-    Perform the A* pathfinding algorithm as a generator.
-    Yields a tuple (current_node, open_list, closed_list) after processing each node.
+    Perform the A* pathfinding algorithm (from pathfinding.py) as a generator.
+    Yields a tuple (current, open_nodes, closed_list, goal_open_nodes, goal_closed_list) after processing
+    each node, where current is the position being processed and open_nodes is a read-only view of the
+    positions in the open set. goal_open_nodes and goal_closed_list are the open and closed sets of the
+    search from the goal (empty unless ALGORITHM is "bidirectional").
+    The views and sets are live: they change as the search goes on, so copy them to keep a snapshot.
     When the goal is reached, yields a tuple ("path", final_path) and returns.
     If no path is found, yields ("no_path", None) at the end.
     """
-    open_list = []  # Priority queue for nodes to be evaluated
-    closed_list = set()  # Set for nodes that have already been evaluated
-
-    start_node = Node(start)
-    heapq.heappush(open_list, (start_node.f, start_node))
-    log_decision(f"Starting A* from {start} to {goal}")
-
-    while open_list:
-        # Pop the node with the lowest f cost
-        current_node = heapq.heappop(open_list)[1]
-        log_decision(
-            f"Processing node {current_node.position} (f={current_node.f}, g={current_node.g}, h={current_node.h})")
-
-        # Yield the current state for visualization
-        yield (current_node, list(open_list), closed_list)
-
-        # Check if the goal is reached
-        if current_node.position == goal:
-            log_decision(f"Goal reached at {current_node.position}. Reconstructing path...")
-            path = []
-            while current_node:
-                path.append(current_node.position)
-                current_node = current_node.parent
-            yield ("path", path[::-1])  # Yield final path (from start to goal)
-            return
-
-        closed_list.add(current_node.position)
-
-        # Explore neighbors (up, down, left, right)
-        for move in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            neighbor_pos = (current_node.position[0] + move[0],
-                            current_node.position[1] + move[1])
-
-            # Check if the neighbor is within grid boundaries
-            if neighbor_pos[0] < 0 or neighbor_pos[0] >= GRID_WIDTH or \
-                    neighbor_pos[1] < 0 or neighbor_pos[1] >= GRID_HEIGHT:
-                log_decision(f"Skipping neighbor {neighbor_pos}: out of bounds")
-                continue
-
-            # Skip if the neighbor is an obstacle
-            if grid[neighbor_pos[1]][neighbor_pos[0]] == 1:
-                log_decision(f"Skipping neighbor {neighbor_pos}: obstacle")
-                continue
-
-            # Skip if the neighbor has already been evaluated
-            if neighbor_pos in closed_list:
-                log_decision(f"Skipping neighbor {neighbor_pos}: already evaluated")
-                continue
-
-            neighbor_node = Node(neighbor_pos, current_node)
-            neighbor_node.g = current_node.g + 1  # Assuming each move costs 1
-            neighbor_node.h = heuristic(neighbor_pos, goal)
-            neighbor_node.f = neighbor_node.g + neighbor_node.h
-
-            # If a node with the same position and a lower g-cost is already in open_list, skip it
-            if any(node.position == neighbor_pos and node.g <= neighbor_node.g for _, node in open_list):
-                log_decision(f"Skipping neighbor {neighbor_pos}: already in open list with lower cost")
-                continue
-
-            heapq.heappush(open_list, (neighbor_node.f, neighbor_node))
-            log_decision(
-                f"Adding neighbor {neighbor_pos} to open list (f={neighbor_node.f}, g={neighbor_node.g}, h={neighbor_node.h})")
-
-    log_decision("No path found")
-    yield ("no_path", None)
+    grid_map = GridMap(grid, diagonal=DIAGONAL)
+    search_steps = {"jps": jps_steps, "bidirectional": bidirectional_steps}.get(ALGORITHM, astar_steps_on_map)
+    steps = search_steps(grid_map, start, goal, HEURISTICS[HEURISTIC], TIE_BREAK, log=log_decision)
+    while True:
+        try:
+            current, open_nodes, closed_list, g = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        if ALGORITHM == "bidirectional":
+            # Pairs of (from the start, from the goal)
+            yield (current, open_nodes[0], closed_list[0], open_nodes[1], closed_list[1])
+        else:
+            yield (current, open_nodes, closed_list, {}, set())
+
+    if result.path is None:
+        yield ("no_path", None)
+    elif ALGORITHM == "jps":
+        yield ("path", expand_path(result.path))  # Fill in the cells between the jump points
+    else:
+        yield ("path", result.path)  # Yield final path (from start to goal)
 
 
 # Function to draw the grid and visualize algorithm elements
-def draw_grid(screen, grid, path, start, goal, open_list=[], closed_list=set(), current_node=None):
+def draw_grid(screen, grid, path, start, goal, open_nodes={}, closed_list=set(), current=None,
+              goal_open_nodes={}, goal_closed_list=set()):
     """Draw the grid, obstacles, and algorithm visualization elements."""
     for y in range(len(grid)):
         for x in range(len(grid[0])):
@@ -148,8 +101,12 @@ def draw_grid(screen, grid, path, start, goal, open_list=[], closed_list=set(),
                 color = GREEN  # Final path
             elif (x, y) in closed_list:
                 color = RED  # Evaluated nodes (closed set)
-            elif any(node.position == (x, y) for _, node in open_list):
+            elif (x, y) in open_nodes:
                 color = LIGHT_BLUE  # Nodes in the open set
+            elif (x, y) in goal_closed_list:
+                color = PURPLE  # Evaluated by the search from the goal
+            elif (x, y) in goal_open_nodes:
+                color = PINK  # In the open set of the search from the goal
             else:
                 color = WHITE  # Unvisited cell
 
@@ -157,8 +114,8 @@ def draw_grid(screen, grid, path, start, goal, open_list=[], closed_list=set(),
             pygame.draw.rect(screen, BLACK, rect, 1)  # Draw cell borders
 
     # Optionally highlight the current node being processed
-    if current_node:
-        cx, cy = current_node.position
+    if current:
+        cx, cy = current
         pygame.draw.rect(screen, YELLOW, (cx * CELL_SIZE, cy * CELL_SIZE, CELL_SIZE, CELL_SIZE))
 
 
@@ -223,8 +180,8 @@ if __name__ == "__main__":
             final_path = []
             break
         else:
-            # Unpack current state: current_node, open_list, and closed_list
-            current_node, open_list, closed_list = result
+            # Unpack current state: current position, open_nodes, and closed_list (and the goal side's sets)
+            current, open_nodes, closed_list, goal_open_nodes, goal_closed_list = result
 
             # Process events (to allow toggling stepwise mode)
             for event in pygame.event.get():
@@ -235,7 +192,8 @@ if __name__ == "__main__":
             # Clear screen and draw current state
             screen.fill(WHITE)
             # During the search, we don't have a final path yet so pass an empty list for path
-            draw_grid(screen, grid, [], start, goal, open_list, closed_list, current_node)
+            draw_grid(screen, grid, [], start, goal, open_nodes, closed_list, current,
+                      goal_open_nodes, goal_closed_list)
             draw_logs(screen, log_messages, font)
 
             # If stepwise mode is active, wait for ENTER to advance; otherwise, auto-advance
@@ -1,8 +1,12 @@
 import pygame
-import heapq
 import sys
 import random
 
+from pathfinding import Graph, Edge as GraphEdge, astar_steps, zero
+from pathfinding_alt import LandmarkGraph, landmark_tables
+from pathfinding_bidirectional import bidirectional_steps
+from pathfinding_lpa import LPAStar
+
 pygame.init()
 
 # --------------------------
@@ -32,19 +36,35 @@ ORANGE = (255, 165, 0)      # Goal node
 LIGHT_BLUE = (173, 216, 230)# Open set in A*
 YELLOW = (255, 255, 0)      # Current node
 DARK_GRAY = (100, 100, 100)
+PURPLE = (128, 0, 128)      # Closed set of the search from the goal (bidirectional)
+PINK = (255, 192, 203)      # Open set of the search from the goal (bidirectional)
 
 # Speed of A* visualization (frames per second)
 ANIMATION_SPEED = 5
 
+# Number of landmarks for A* with landmarks
+LANDMARKS = 4
+
+# Size of the spatial hash cells used to find what was clicked, and how close a click must be to an edge
+CELL_SIZE = 50
+EDGE_CLICK_DISTANCE = 10
+
 # --------------------------
 # Global Variables for Graph and UI
 # --------------------------
-nodes = []       # List of Node objects
-edges = []       # List of Edge objects
+graph = Graph()  # Nodes, edges and the adjacency index (see pathfinding.py)
+nodes = graph.positions  # Node -> position; iterating over it gives the Node objects
+edges = graph.edges      # Set of Edge objects
 buttons = []     # List of UI Button objects
 log_messages = []  # Log panel messages
 
 final_path = None  # Will hold the final A* path once computed
+planner = None  # LPA* planner that keeps final_path up to date while the graph is edited after a run
+
+# Searches the "Run A*" button can run (right-click it to switch), with the button label for each
+# ("A* with landmarks" uses the ALT heuristic, which stays admissible with custom edge costs)
+SEARCH_ALGORITHMS = [("A*", "Run A*"), ("Bidirectional A*", "Run Bi-A*"), ("A* with landmarks", "Run ALT")]
+search_algorithm = 0  # Index into SEARCH_ALGORITHMS
 
 # Modes for user interaction
 # Modes: "add_node", "add_edge", "select_start", "select_goal", "edit_value", "delete", "drag", "none"
@@ -90,21 +110,34 @@ def manhattan(p1, p2):
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
 
-def update_all_values():
+def update_values(moved):
     """
-    Recalculate values for all nodes and default edges.
-    For each node, if a goal is set, update its heuristic (h) using Manhattan distance.
-    If the node already has a g value, update f = g + h.
-    For each edge with default cost, update its cost based on the current positions.
+    Recalculate the values that depend on the position of a node that has moved.
+    Its heuristic (h) is updated using Manhattan distance, or every node's if it is the goal,
+    along with f = g + h, and the edges with default cost touching it get their new length.
     """
     if goal_node is not None:
-        for node in nodes:
+        for node in (nodes if moved == goal_node else [moved]):
             node.h = manhattan(node.pos, goal_node.pos)
             if node.g is not None:
                 node.f = node.g + node.h
-    for edge in edges:
+    for edge in graph.adjacency[moved].values():
         if edge.default:
-            edge.cost = manhattan(edge.node1.pos, edge.node2.pos)
+            graph.set_cost(edge, manhattan(edge.node1.pos, edge.node2.pos))
+
+
+def replan():
+    """Repair the path after an edit, if a search has been run, and show the costs that changed."""
+    global final_path
+    if planner is None:
+        return
+    result = planner.compute()
+    final_path = result.path
+    for node in planner.changed:
+        if node in nodes:
+            node.g = planner.g.get(node, float('inf'))
+            if node.h is not None:
+                node.f = node.g + node.h
 
 
 # --------------------------
@@ -122,8 +155,10 @@ class Node:
         self.h = None  # Heuristic cost (can be manually overridden)
         self.f = None  # g + h (computed automatically)
         self.drag_offset = (0, 0)  # For dragging
-        # For A* algorithm use (not persistent for editing)
-        self.parent = None
+
+    def __str__(self):
+        # Nodes are named by their label in the log messages
+        return str(self.id)
 
     def draw(self, surface):
         """Draw the node as a circle with its label and cost values."""
@@ -154,6 +189,11 @@ class Node:
             f_text = FONT.render(f"f:{self.f}", True, BLACK)
             surface.blit(f_text, (self.pos[0] - self.radius, self.pos[1] - self.radius - 40))
 
+    def bounding_box(self):
+        """Return (left, top, right, bottom) around the node's circle."""
+        x, y = self.pos
+        return (x - self.radius, y - self.radius, x + self.radius, y + self.radius)
+
     def is_clicked(self, pos):
         """Return True if a given pos is within the node's circle."""
         dx = self.pos[0] - pos[0]
@@ -161,23 +201,18 @@ class Node:
         return dx * dx + dy * dy <= self.radius * self.radius
 
 
-class Edge:
+class Edge(GraphEdge):
     def __init__(self, node1, node2, cost=None):
-        self.node1 = node1
-        self.node2 = node2
         # If cost is not provided, use Manhattan distance and mark as default.
         if cost is None:
-            self.cost = manhattan(node1.pos, node2.pos)
+            super().__init__(node1, node2, manhattan(node1.pos, node2.pos))
             self.default = True
         else:
-            self.cost = cost
+            super().__init__(node1, node2, cost)
             self.default = False
 
     def draw(self, surface):
         """Draw the edge as a line between node1 and node2 with cost label at the midpoint."""
-        # If this is a default edge, update its cost based on current positions.
-        if self.default:
-            self.cost = manhattan(self.node1.pos, self.node2.pos)
         pygame.draw.line(surface, BLACK, self.node1.pos, self.node2.pos, 2)
         mid_x = (self.node1.pos[0] + self.node2.pos[0]) // 2
         mid_y = (self.node1.pos[1] + self.node2.pos[1]) // 2
@@ -197,7 +232,60 @@ class Edge:
         ix = p1[0] + u * (p2[0] - p1[0])
         iy = p1[1] + u * (p2[1] - p1[1])
         dist = ((pos[0] - ix) ** 2 + (pos[1] - iy) ** 2) ** 0.5
-        return dist < 10
+        return dist < EDGE_CLICK_DISTANCE
+
+    def bounding_box(self):
+        """Return (left, top, right, bottom) around the line, widened by the click distance."""
+        p1 = self.node1.pos
+        p2 = self.node2.pos
+        return (min(p1[0], p2[0]) - EDGE_CLICK_DISTANCE, min(p1[1], p2[1]) - EDGE_CLICK_DISTANCE,
+                max(p1[0], p2[0]) + EDGE_CLICK_DISTANCE, max(p1[1], p2[1]) + EDGE_CLICK_DISTANCE)
+
+
+class SpatialHash:
+    """
+    A uniform grid of square cells, each holding the items whose bounding boxes overlap it,
+    so finding what is under the mouse only has to look at the items in one cell.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of items
+        self.item_cells = {}  # Item -> the (column, row) cells it is in
+
+    def cells_for(self, box):
+        left, top, right, bottom = box
+        size = self.cell_size
+        return [(column, row)
+                for column in range(int(left // size), int(right // size) + 1)
+                for row in range(int(top // size), int(bottom // size) + 1)]
+
+    def insert(self, item, box):
+        cells = self.cells_for(box)
+        self.item_cells[item] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        for cell in self.item_cells.pop(item):
+            items = self.cells[cell]
+            items.discard(item)
+            if not items:
+                del self.cells[cell]
+
+    def move(self, item, box):
+        """Update an item's bounding box (cheap if it stays in the same cells)."""
+        if self.cells_for(box) != self.item_cells[item]:
+            self.remove(item)
+            self.insert(item, box)
+
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+
+    def near(self, pos):
+        """Return the items whose bounding boxes may contain pos."""
+        return self.cells.get((int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)), ())
 
 
 class Button:
@@ -217,6 +305,11 @@ class Button:
         return self.rect.collidepoint(pos)
 
 
+# Where the nodes and edges are on screen, kept up to date by the graph editing functions below
+node_index = SpatialHash(CELL_SIZE)
+edge_index = SpatialHash(CELL_SIZE)
+
+
 # --------------------------
 # In-Game Popup for Editing Values
 # --------------------------
@@ -254,69 +347,155 @@ def popup_edit_value(initial_value, prompt="Enter new value:"):
 # --------------------------
 # A* Algorithm on Graph (Step-by-Step)
 # --------------------------
-def get_neighbors(node):
-    """Return a list of tuples (neighbor, edge_cost) for the given node using the global edges list."""
-    neighbors = []
-    for edge in edges:
-        if edge.node1 == node:
-            neighbors.append((edge.node2, edge.cost))
-        elif edge.node2 == node:
-            neighbors.append((edge.node1, edge.cost))
-    return neighbors
-
-
 def astar_search(start, goal, update_callback=None):
-    """Perform A* search on the graph. Uses the global nodes/edges.
-       update_callback is called after each step for visualization."""
-    open_list = []
-    closed_set = set()
-
-    # Initialize: set all nodes' g to infinity, h to Manhattan distance, and f to infinity.
+    """Perform the selected search (A*, bidirectional A* or A* with landmarks, from pathfinding) on the graph.
+       update_callback is called after each step for visualization, with the goal side's
+       open and closed sets as extra arguments for bidirectional A*."""
+    name = SEARCH_ALGORITHMS[search_algorithm][0]
+    bidirectional = name == "Bidirectional A*"
+    if name == "A* with landmarks":
+        # The landmark distances are only computed again if the graph has been edited since the last run
+        tables = landmark_tables(graph, LANDMARKS)
+        log_decision(f"Landmarks: {', '.join(str(node) for node in tables.landmarks)}")
+        heuristic = tables.heuristic
+        steps = astar_steps(LandmarkGraph(graph, tables), start, goal, log=log_decision)
+    else:
+        heuristic = lambda node, target: manhattan(node.pos, target.pos)
+        search_steps = bidirectional_steps if bidirectional else astar_steps
+        steps = search_steps(graph, start, goal, manhattan, log=log_decision)
+
+    # Initialize: set all nodes' g to infinity, h to the heuristic, and f to infinity.
     for node in nodes:
         node.g = float('inf')
-        node.h = manhattan(node.pos, goal.pos)
+        node.h = heuristic(node, goal)
         node.f = float('inf')
-        node.parent = None
-    start.g = 0
-    start.f = start.h  # f = g + h
 
-    heapq.heappush(open_list, (start.f, start.id, start))
-    log_decision(f"Starting A* search from node {start.id} to node {goal.id}. The algorithm will explore nodes to determine the lowest cost path.")
+    while True:
+        try:
+            current, open_nodes, closed_set, g = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        goal_sets = ()
+        if bidirectional:
+            # Pairs of (from the start, from the goal); the nodes show the costs from the start
+            goal_sets = (open_nodes[1], closed_set[1])
+            open_nodes, closed_set, g = open_nodes[0], closed_set[0], g[0]
+        # Show the costs found so far on the nodes being considered
+        for node in open_nodes:
+            node.g = g[node]
+            node.f = node.g + node.h
+        if current in g:
+            current.g = g[current]
+            current.f = current.g + current.h
+        if update_callback:
+            update_callback(current, open_nodes, closed_set, *goal_sets)
 
-    while open_list:
-        current = heapq.heappop(open_list)[2]
-        log_decision(f"Processing node {current.id}: f = {current.f} (total estimated cost = g + h), where g = {current.g} and h = {current.h}.")
+    return result.path
 
-        if update_callback:
-            update_callback(current, open_list, closed_set)
 
-        if current == goal:
-            log_decision(f"Goal reached at node {current.id}: reconstructing path.")
-            path = []
-            while current:
-                path.append(current)
-                current = current.parent
-            return path[::-1]
+# --------------------------
+# Graph Editing (keeps the adjacency index and the planner up to date)
+# --------------------------
+def add_node(node):
+    """Add a node to the graph."""
+    graph.add_node(node, node.pos)
+    node_index.insert(node, node.bounding_box())
+
 
-        closed_set.add(current)
+def add_edge(node1, node2, cost=None):
+    """Add an edge between two nodes and return it, or return None if they are already connected."""
+    if graph.find_edge(node1, node2) is not None:
+        return None
+    edge = graph.add_edge(Edge(node1, node2, cost))
+    edge_index.insert(edge, edge.bounding_box())
+    if planner is not None:
+        planner.edge_changed(node1, node2)
+        replan()
+    return edge
+
+
+def start_planner(start, goal):
+    """
+    Start keeping the path from start to goal up to date. Manhattan distance only guides it while every
+    edge costs its length: a custom cost can be lower, which would make the repaired paths wrong.
+    """
+    global planner
+    heuristic = manhattan if all(edge.default for edge in edges) else zero
+    planner = LPAStar(graph, start, goal, heuristic)
+
+
+def set_edge_cost(edge, cost):
+    """Give an edge a new cost of its own."""
+    graph.set_cost(edge, cost)
+    edge.default = False
+    if planner is not None:
+        if planner.heuristic is not zero:
+            start_planner(planner.start, planner.goal)  # Manhattan distance no longer bounds the costs
+        else:
+            planner.edge_changed(edge.node1, edge.node2)
+        replan()
+
+
+def move_node(node, pos):
+    """Move a node to a new position, updating its default edge costs and heuristic values."""
+    node.pos = pos
+    graph.move_node(node, pos)
+    node_index.move(node, node.bounding_box())
+    for edge in graph.adjacency[node].values():
+        edge_index.move(edge, edge.bounding_box())
+    update_values(node)
+    if planner is not None:
+        planner.node_moved(node)
+        replan()
+
+
+def remove_edge(edge):
+    """Remove an edge from the graph."""
+    graph.remove_edge(edge)
+    edge_index.remove(edge)
+    if planner is not None:
+        planner.edge_changed(edge.node1, edge.node2)
+        replan()
+
+
+def remove_node(node):
+    """Remove a node and the edges touching it from the graph."""
+    global planner, final_path
+    neighbors = list(graph.adjacency[node])
+    for edge in graph.adjacency[node].values():
+        edge_index.remove(edge)
+    node_index.remove(node)
+    graph.remove_node(node)
+    if planner is not None:
+        if node in (planner.start, planner.goal):
+            planner = None
+            final_path = None
+        else:
+            planner.node_removed(node, neighbors)
+            replan()
+
+
+def clear_graph():
+    """Remove every node and edge."""
+    global planner
+    graph.clear()
+    node_index.clear()
+    edge_index.clear()
+    planner = None
+
+
+def node_at(pos):
+    """Return the node under pos (the first added, if they overlap), or None."""
+    clicked = [node for node in node_index.near(pos) if node.is_clicked(pos)]
+    return min(clicked, key=lambda node: node.id) if clicked else None
 
-        for neighbor, cost in get_neighbors(current):
-            if neighbor in closed_set:
-                log_decision(f"Skipping neighbor node {neighbor.id}: already evaluated.")
-                continue
 
-            tentative_g = current.g + cost
-            if tentative_g < neighbor.g:
-                neighbor.parent = current
-                neighbor.g = tentative_g
-                neighbor.h = manhattan(neighbor.pos, goal.pos)
-                neighbor.f = neighbor.g + neighbor.h
-                log_decision(f"Updating neighbor node {neighbor.id}: new g = {neighbor.g}, h = {neighbor.h}, f = {neighbor.f}.")
-                heapq.heappush(open_list, (neighbor.f, neighbor.id, neighbor))
-            else:
-                log_decision(f"Skipping neighbor node {neighbor.id}: existing path has lower cost (g = {neighbor.g}) than tentative g = {tentative_g}.")
-
-    log_decision("No path found: the algorithm could not find a viable route.")
+def edge_at(pos):
+    """Return an edge under pos, or None."""
+    for edge in edge_index.near(pos):
+        if edge.is_clicked(pos):
+            return edge
     return None
 
 
@@ -345,7 +524,7 @@ def setup_buttons():
     x += btn_width + margin
     buttons.append(Button((x, margin, btn_width, btn_height), "Set Goal", "select_goal"))
     x += btn_width + margin
-    buttons.append(Button((x, margin, btn_width, btn_height), "Run A*", "run_astar"))
+    buttons.append(Button((x, margin, btn_width, btn_height), SEARCH_ALGORITHMS[search_algorithm][1], "run_astar"))
     x += btn_width + margin
     buttons.append(Button((x, margin, btn_width, btn_height), "Reset", "reset"))
 
@@ -406,6 +585,7 @@ def draw_log_panel():
 # --------------------------
 def main_loop():
     global current_mode, edge_start_node, dragging_node, start_node, goal_node, nodes, edges, log_messages, final_path
+    global search_algorithm, planner
     running = True
     astar_path = None
 
@@ -421,20 +601,27 @@ def main_loop():
                     for btn in buttons:
                         if btn.is_clicked(pos):
                             if btn.mode == "reset":
-                                nodes.clear()
-                                edges.clear()
+                                clear_graph()
                                 start_node = None
                                 goal_node = None
                                 final_path = None
                                 log_messages.clear()
                                 log_decision("Graph reset: all nodes and edges cleared.")
+                            elif btn.mode == "run_astar" and event.button == 3:
+                                # Right-click switches which search the button runs
+                                search_algorithm = (search_algorithm + 1) % len(SEARCH_ALGORITHMS)
+                                btn.text = SEARCH_ALGORITHMS[search_algorithm][1]
+                                log_decision(f"Search algorithm: {SEARCH_ALGORITHMS[search_algorithm][0]}.")
                             elif btn.mode == "run_astar":
                                 if start_node is None or goal_node is None:
                                     log_decision("Error: Select both start and goal nodes before running A*.")
                                 else:
-                                    log_decision("Running A* algorithm...")
+                                    log_decision(f"Running {SEARCH_ALGORITHMS[search_algorithm][0]} algorithm...")
                                     astar_path = astar_search(start_node, goal_node, update_callback=astar_update)
                                     final_path = astar_path
+                                    # Keep the path up to date from now on as the graph is edited
+                                    start_planner(start_node, goal_node)
+                                    planner.compute()
                                     if final_path:
                                         log_decision("A* algorithm completed: path found.")
                                     else:
@@ -446,77 +633,69 @@ def main_loop():
 
                 if current_mode == "add_node":
                     new_node = Node((pos[0], pos[1]))
-                    nodes.append(new_node)
+                    add_node(new_node)
                     log_decision(f"Added node {new_node.id} at {new_node.pos}.")
                 elif current_mode == "add_edge":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            if edge_start_node is None:
-                                edge_start_node = node
-                                log_decision(f"Selected node {node.id} as start for new edge.")
-                            else:
-                                if node != edge_start_node:
-                                    new_edge = Edge(edge_start_node, node)
-                                    edges.append(new_edge)
+                    node = node_at(pos)
+                    if node is not None:
+                        if edge_start_node is None:
+                            edge_start_node = node
+                            log_decision(f"Selected node {node.id} as start for new edge.")
+                        else:
+                            if node != edge_start_node:
+                                new_edge = add_edge(edge_start_node, node)
+                                if new_edge is None:
+                                    log_decision(f"Node {edge_start_node.id} and node {node.id} are already connected.")
+                                else:
                                     log_decision(f"Created edge between node {edge_start_node.id} and node {node.id} with cost {new_edge.cost}.")
-                                    edge_start_node = None
-                            break
+                                edge_start_node = None
                 elif current_mode == "delete":
-                    deleted = False
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            log_decision(f"Deleted node {node.id}.")
-                            edges = [edge for edge in edges if edge.node1 != node and edge.node2 != node]
-                            if node == start_node:
-                                start_node = None
-                            if node == goal_node:
-                                goal_node = None
-                            nodes.remove(node)
-                            deleted = True
-                            break
-                    if not deleted:
-                        for edge in edges:
-                            if edge.is_clicked(pos):
-                                log_decision(f"Deleted edge between node {edge.node1.id} and node {edge.node2.id}.")
-                                edges.remove(edge)
-                                break
+                    node = node_at(pos)
+                    if node is not None:
+                        log_decision(f"Deleted node {node.id}.")
+                        if node == start_node:
+                            start_node = None
+                        if node == goal_node:
+                            goal_node = None
+                        remove_node(node)
+                    else:
+                        edge = edge_at(pos)
+                        if edge is not None:
+                            log_decision(f"Deleted edge between node {edge.node1.id} and node {edge.node2.id}.")
+                            remove_edge(edge)
                 elif current_mode == "edit_value":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            if pos[1] < node.pos[1]:
-                                new_val = popup_edit_value(node.g if node.g is not None else 0, prompt=f"Enter new g for node {node.id}:")
-                                node.g = new_val
-                                log_decision(f"Updated node {node.id} g value to {node.g}.")
-                            else:
-                                new_val = popup_edit_value(node.h if node.h is not None else 0, prompt=f"Enter new h for node {node.id}:")
-                                node.h = new_val
-                                log_decision(f"Updated node {node.id} h value to {node.h}.")
-                            break
-                    for edge in edges:
-                        if edge.is_clicked(pos):
-                            new_cost = popup_edit_value(edge.cost, prompt=f"Enter new cost for edge between {edge.node1.id} and {edge.node2.id}:")
-                            edge.cost = new_cost
-                            edge.default = False
-                            log_decision(f"Updated cost for edge between node {edge.node1.id} and node {edge.node2.id} to {edge.cost}.")
-                            break
+                    node = node_at(pos)
+                    if node is not None:
+                        if pos[1] < node.pos[1]:
+                            new_val = popup_edit_value(node.g if node.g is not None else 0, prompt=f"Enter new g for node {node.id}:")
+                            node.g = new_val
+                            log_decision(f"Updated node {node.id} g value to {node.g}.")
+                        else:
+                            new_val = popup_edit_value(node.h if node.h is not None else 0, prompt=f"Enter new h for node {node.id}:")
+                            node.h = new_val
+                            log_decision(f"Updated node {node.id} h value to {node.h}.")
+                    edge = edge_at(pos)
+                    if edge is not None:
+                        new_cost = popup_edit_value(edge.cost, prompt=f"Enter new cost for edge between {edge.node1.id} and {edge.node2.id}:")
+                        set_edge_cost(edge, new_cost)
+                        log_decision(f"Updated cost for edge between node {edge.node1.id} and node {edge.node2.id} to {edge.cost}.")
                 elif current_mode == "select_start":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            start_node = node
-                            log_decision(f"Node {node.id} set as START node.")
-                            break
+                    node = node_at(pos)
+                    if node is not None:
+                        start_node = node
+                        planner = None
+                        log_decision(f"Node {node.id} set as START node.")
                 elif current_mode == "select_goal":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            goal_node = node
-                            log_decision(f"Node {node.id} set as GOAL node.")
-                            break
+                    node = node_at(pos)
+                    if node is not None:
+                        goal_node = node
+                        planner = None
+                        log_decision(f"Node {node.id} set as GOAL node.")
                 elif current_mode == "drag":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            dragging_node = node
-                            dragging_node.drag_offset = (node.pos[0] - pos[0], node.pos[1] - pos[1])
-                            break
+                    node = node_at(pos)
+                    if node is not None:
+                        dragging_node = node
+                        dragging_node.drag_offset = (node.pos[0] - pos[0], node.pos[1] - pos[1])
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 if current_mode == "drag":
@@ -529,9 +708,8 @@ def main_loop():
                     new_y = min(TOP_PANEL_HEIGHT + DRAWING_AREA_HEIGHT - dragging_node.radius, new_y)
                     new_x = max(dragging_node.radius, new_x)
                     new_x = min(WINDOW_WIDTH - dragging_node.radius, new_x)
-                    dragging_node.pos = (new_x, new_y)
-                    # Recalculate heuristic and default edge costs for all nodes and edges
-                    update_all_values()
+                    # Updates the dragged node's values and edges, and repairs the path
+                    move_node(dragging_node, (new_x, new_y))
 
         screen.fill(WHITE)
         draw_top_panel()
@@ -543,15 +721,19 @@ def main_loop():
     pygame.quit()
 
 
-def astar_update(current_node, open_list, closed_set):
+def astar_update(current_node, open_nodes, closed_set, goal_open_nodes=(), goal_closed_set=()):
     """Callback for A* algorithm visualization updates."""
     screen.fill(WHITE)
     draw_top_panel()
     draw_drawing_area()
     for node in closed_set:
         pygame.draw.circle(screen, RED, node.pos, node.radius + 4, 2)
-    for _, _, node in open_list:
+    for node in open_nodes:
         pygame.draw.circle(screen, LIGHT_BLUE, node.pos, node.radius + 4, 2)
+    for node in goal_closed_set:
+        pygame.draw.circle(screen, PURPLE, node.pos, node.radius + 4, 2)
+    for node in goal_open_nodes:
+        pygame.draw.circle(screen, PINK, node.pos, node.radius + 4, 2)
     pygame.draw.circle(screen, YELLOW, current_node.pos, current_node.radius + 6, 3)
     draw_log_panel()
     pygame.display.flip()
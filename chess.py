@@ -8,17 +8,61 @@ Features:
  • Two modes: Two–player and Single–player (with a simple heuristic AI for black)
  • Top–down view with a 512x512 board and 45x45 piece images centered in each square
  • A simple, modern splash screen for mode selection
+ • An analysis panel (press 'A') listing the engine's best lines, see chess_analysis.py
 
-Note: The piece images are assumed to be in PNG format.
+Note: The piece images are assumed to be in PNG format. They are packed into a
+pre-scaled atlas the first time a board is drawn, and the atlas is saved next to
+them so later runs load a single image.
 """
 
+import os
 import pygame
 import sys
 
+from chess_assets import get_asset_atlas
+
 # Global constants for board and piece sizes
 BOARD_SIZE = 512          # Board image is 512x512 pixels
 SQUARE_SIZE = BOARD_SIZE // 8  # Each square is 64x64 pixels (512/8)
 PIECE_SIZE = 45           # Piece icons are 45x45 pixels
+ANALYSIS_PANEL_WIDTH = 320  # Width of the optional analysis panel to the right of the board
+ANALYSIS_LINES = 3        # Number of lines shown in the analysis panel
+ANALYSIS_DEPTH = 2        # Search depth (plies) used by the analysis panel
+
+# FEN piece letters (lower case; upper case is used for white)
+FEN_PIECES = {'k': 'king', 'q': 'queen', 'r': 'rook', 'b': 'bishop', 'n': 'knight', 'p': 'pawn'}
+FEN_SYMBOLS = {ptype: symbol for symbol, ptype in FEN_PIECES.items()}
+# Castling flag -> (back-rank row, rook column)
+CASTLING_SQUARES = {'K': (7, 7), 'Q': (7, 0), 'k': (0, 7), 'q': (0, 0)}
+
+# ------------------------------
+# Notation helpers
+# ------------------------------
+def coords_to_square(col, row):
+    """
+    Convert board coordinates to algebraic notation, e.g. (4, 6) -> 'e2'.
+    """
+    return 'abcdefgh'[col] + str(8 - row)
+
+def square_to_coords(square):
+    """
+    Convert algebraic notation to board coordinates, e.g. 'e2' -> (4, 6).
+    """
+    return 'abcdefgh'.index(square[0]), 8 - int(square[1])
+
+def move_to_uci(move):
+    """
+    Convert a move tuple (start_col, start_row, end_col, end_row, special) to UCI notation, e.g. 'e7e8q'.
+    """
+    start_col, start_row, end_col, end_row, special = move
+    text = coords_to_square(start_col, start_row) + coords_to_square(end_col, end_row)
+    # Promotions always produce a queen in this game.
+    return text + 'q' if special == 'promotion' else text
+
+# ------------------------------
+# Shared asset atlas (see chess_assets.py)
+# ------------------------------
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
 # ------------------------------
 # Chess piece class definition
@@ -52,27 +96,19 @@ class ChessGame:
         self.valid_moves = []         # List of valid moves for the selected piece
         self.en_passant_target = None # Square available for en passant capture (if any)
         self.move_history = []        # History of moves made (for potential further expansion)
-        self.load_assets()            # Load board and piece images
+        self.board_img = None         # Board and piece images are loaded on first draw,
+        self.images = None            # so headless games never touch them
         self.initialize_board()       # Set up initial board state
 
     def load_assets(self):
         """
-        Load images for the board and all pieces.
-        """
-        # Load and scale the board image
-        self.board_img = pygame.image.load("assets/board.png")
-        self.board_img = pygame.transform.scale(self.board_img, (BOARD_SIZE, BOARD_SIZE))
-        # Dictionary to store piece images with keys: (color, piece_type)
-        self.images = {}
-        pieces = ['king', 'queen', 'rook', 'bishop', 'knight', 'pawn']
-        for color in ['white', 'black']:
-            for piece in pieces:
-                key = (color, piece)
-                # Build the file path; note: using 'w' for white and 'b' for black
-                path = f"assets/{color}/{'w' if color=='white' else 'b'}{piece}.png"
-                img = pygame.image.load(path)
-                # Scale the image to PIECE_SIZE x PIECE_SIZE
-                self.images[key] = pygame.transform.scale(img, (PIECE_SIZE, PIECE_SIZE))
+        Point the game at the shared, pre-scaled board and piece images.
+        Only the first call in a process loads anything; later games reuse the same atlas.
+        """
+        atlas = get_asset_atlas(ASSETS_DIR, BOARD_SIZE, PIECE_SIZE)
+        self.board_img = atlas.board_img
+        # Dictionary of piece images with keys: (color, piece_type)
+        self.images = atlas.images
 
     def initialize_board(self):
         """
@@ -104,11 +140,110 @@ class ChessGame:
         for col in range(8):
             self.board[1][col] = Piece('black', 'pawn')
 
+    def load_fen(self, fen):
+        """
+        Set up the board from a FEN string.
+        Castling rights are mapped onto the has_moved flags of the kings and rooks.
+        The halfmove clock and fullmove number fields are ignored.
+        :param fen: e.g. 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+        """
+        fields = fen.split()
+        ranks = fields[0].split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"Invalid FEN (expected 8 ranks): {fen}")
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        # FEN lists rank 8 first, which is row 0 on our board.
+        for row, rank in enumerate(ranks):
+            col = 0
+            for symbol in rank:
+                if symbol.isdigit():
+                    col += int(symbol)
+                    continue
+                if symbol.lower() not in FEN_PIECES or col > 7:
+                    raise ValueError(f"Invalid FEN (bad rank '{rank}'): {fen}")
+                color = 'white' if symbol.isupper() else 'black'
+                piece = Piece(color, FEN_PIECES[symbol.lower()])
+                # Only pawns on their starting row and castling pieces are treated as unmoved.
+                start_row = 6 if color == 'white' else 1
+                piece.has_moved = not (piece.type == 'pawn' and row == start_row)
+                self.board[row][col] = piece
+                col += 1
+        self.turn = 'black' if len(fields) > 1 and fields[1] == 'b' else 'white'
+        castling = fields[2] if len(fields) > 2 else '-'
+        for flag, (row, rook_col) in CASTLING_SQUARES.items():
+            if flag in castling:
+                king = self.board[row][4]
+                rook = self.board[row][rook_col]
+                if king is not None and king.type == 'king':
+                    king.has_moved = False
+                if rook is not None and rook.type == 'rook':
+                    rook.has_moved = False
+        self.en_passant_target = None
+        if len(fields) > 3 and fields[3] != '-':
+            self.en_passant_target = square_to_coords(fields[3])
+        self.selected_piece = None
+        self.selected_pos = None
+        self.valid_moves = []
+        self.move_history = []
+
+    def to_fen(self):
+        """
+        Return the current position as a FEN string (move counters are always '0 1').
+        """
+        ranks = []
+        for row in range(8):
+            rank = ''
+            empty = 0
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                symbol = FEN_SYMBOLS[piece.type]
+                rank += symbol.upper() if piece.color == 'white' else symbol
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        castling = ''
+        for flag, (row, rook_col) in CASTLING_SQUARES.items():
+            king = self.board[row][4]
+            rook = self.board[row][rook_col]
+            color = 'white' if flag.isupper() else 'black'
+            if (king is not None and king.type == 'king' and king.color == color and not king.has_moved and
+                    rook is not None and rook.type == 'rook' and rook.color == color and not rook.has_moved):
+                castling += flag
+        ep = coords_to_square(*self.en_passant_target) if self.en_passant_target is not None else '-'
+        return f"{'/'.join(ranks)} {self.turn[0]} {castling or '-'} {ep} 0 1"
+
+    def copy(self):
+        """
+        Return a copy of the game state (board, turn and en passant square).
+        Used by the search code so it can play moves without touching the real game.
+        """
+        game = ChessGame.__new__(ChessGame)
+        game.mode = self.mode
+        game.board_img = self.board_img
+        game.images = self.images
+        game.board = self.copy_board()
+        game.turn = self.turn
+        game.selected_piece = None
+        game.selected_pos = None
+        game.valid_moves = []
+        game.en_passant_target = self.en_passant_target
+        game.move_history = list(self.move_history)
+        return game
+
     def draw(self, screen):
         """
         Draw the board and all pieces onto the screen.
         Highlights the selected piece and its valid moves.
         """
+        # Images are fetched on first draw, so creating a game costs nothing.
+        if self.images is None:
+            self.load_assets()
         # Draw board background
         screen.blit(self.board_img, (0, 0))
         # Draw each piece on the board
@@ -691,10 +826,36 @@ def splash_screen(screen, clock):
         pygame.display.flip()
         clock.tick(60)
 
+# ------------------------------
+# Analysis Panel
+# ------------------------------
+def draw_analysis_panel(screen, font, lines):
+    """
+    Draw the analysis lines (score and principal variation) to the right of the board.
+    :param lines: list of line dictionaries as returned by Analyzer.analyse()
+    """
+    panel_rect = pygame.Rect(BOARD_SIZE, 0, ANALYSIS_PANEL_WIDTH, BOARD_SIZE)
+    pygame.draw.rect(screen, (30, 30, 30), panel_rect)
+    title_text = font.render("Analysis", True, (255, 255, 255))
+    screen.blit(title_text, (BOARD_SIZE + 10, 10))
+    y = 40
+    for number, line in enumerate(lines, 1):
+        if line['mate'] is not None:
+            score = f"#{line['mate']}"
+        else:
+            score = f"{line['score'] / 10:+.1f}"  # Piece values are in tenths of a pawn
+        header = font.render(f"{number}. {line['move']}  {score}", True, (255, 255, 255))
+        screen.blit(header, (BOARD_SIZE + 10, y))
+        pv_text = font.render(' '.join(line['pv']), True, (180, 180, 180))
+        screen.blit(pv_text, (BOARD_SIZE + 20, y + 22))
+        y += 56
+
 # ------------------------------
 # Main Game Loop
 # ------------------------------
 def main():
+    # Imported here because chess_analysis imports this module.
+    from chess_analysis import Analyzer
     pygame.init()
     screen = pygame.display.set_mode((BOARD_SIZE, BOARD_SIZE))
     pygame.display.set_caption("Chess Game")
@@ -702,11 +863,21 @@ def main():
     # Show splash screen and get selected mode (1 or 2 player)
     mode = splash_screen(screen, clock)
     game = ChessGame(mode)
+    analyzer = Analyzer()
+    show_analysis = False
+    analysis_fen = None   # Position the current analysis lines belong to
+    analysis_lines = []
+    panel_font = pygame.font.SysFont(None, 24)
     running = True
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            # Toggle the analysis panel, widening the window to make room for it.
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_a:
+                show_analysis = not show_analysis
+                width = BOARD_SIZE + ANALYSIS_PANEL_WIDTH if show_analysis else BOARD_SIZE
+                screen = pygame.display.set_mode((width, BOARD_SIZE))
             # Allow human move input only if it's the human's turn.
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # In two-player mode, both colors are human.
@@ -718,7 +889,13 @@ def main():
             # Delay a bit so the AI move isn’t instantaneous.
             pygame.time.delay(500)
             game.ai_move()
+        # Only re-analyse when the position has changed.
+        if show_analysis and game.to_fen() != analysis_fen:
+            analysis_fen = game.to_fen()
+            analysis_lines = analyzer.analyse(game, ANALYSIS_LINES, ANALYSIS_DEPTH)
         game.draw(screen)
+        if show_analysis:
+            draw_analysis_panel(screen, panel_font, analysis_lines)
         pygame.display.flip()
         clock.tick(60)
     pygame.quit()
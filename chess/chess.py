@@ -9,17 +9,29 @@ Features:
  • Top–down view with a 512x512 board and 45x45 piece images centered in each square
  • A simple, modern splash screen for mode selection
 
-Note: The piece images are assumed to be in PNG format.
+Note: The piece images are assumed to be in PNG format. They are packed into a
+pre-scaled atlas the first time a board is drawn, and the atlas is saved next to
+them so later runs load a single image.
 """
 
+import os
 import pygame
 import sys
 
+# chess_assets.py lives next to the top-level chess.py, one directory up
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chess_assets import get_asset_atlas
+
 # Global constants for board and piece sizes
 BOARD_SIZE = 512          # Board image is 512x512 pixels
 SQUARE_SIZE = BOARD_SIZE // 8  # Each square is 64x64 pixels (512/8)
 PIECE_SIZE = 45           # Piece icons are 45x45 pixels
 
+# ------------------------------
+# Shared asset atlas (see chess_assets.py)
+# ------------------------------
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
 # ------------------------------
 # Chess piece class definition
 # ------------------------------
@@ -52,27 +64,19 @@ class ChessGame:
         self.valid_moves = []         # List of valid moves for the selected piece
         self.en_passant_target = None # Square available for en passant capture (if any)
         self.move_history = []        # History of moves made (for potential further expansion)
-        self.load_assets()            # Load board and piece images
+        self.board_img = None         # Board and piece images are loaded on first draw,
+        self.images = None            # so headless games never touch them
         self.initialize_board()       # Set up initial board state
 
     def load_assets(self):
         """
-        Load images for the board and all pieces.
-        """
-        # Load and scale the board image
-        self.board_img = pygame.image.load("assets/board.png")
-        self.board_img = pygame.transform.scale(self.board_img, (BOARD_SIZE, BOARD_SIZE))
-        # Dictionary to store piece images with keys: (color, piece_type)
-        self.images = {}
-        pieces = ['king', 'queen', 'rook', 'bishop', 'knight', 'pawn']
-        for color in ['white', 'black']:
-            for piece in pieces:
-                key = (color, piece)
-                # Build the file path; note: using 'w' for white and 'b' for black
-                path = f"assets/{color}/{'w' if color=='white' else 'b'}{piece}.png"
-                img = pygame.image.load(path)
-                # Scale the image to PIECE_SIZE x PIECE_SIZE
-                self.images[key] = pygame.transform.scale(img, (PIECE_SIZE, PIECE_SIZE))
+        Point the game at the shared, pre-scaled board and piece images.
+        Only the first call in a process loads anything; later games reuse the same atlas.
+        """
+        atlas = get_asset_atlas(ASSETS_DIR, BOARD_SIZE, PIECE_SIZE)
+        self.board_img = atlas.board_img
+        # Dictionary of piece images with keys: (color, piece_type)
+        self.images = atlas.images
 
     def initialize_board(self):
         """
@@ -109,6 +113,9 @@ class ChessGame:
         Draw the board and all pieces onto the screen.
         Highlights the selected piece and its valid moves.
         """
+        # Images are fetched on first draw, so creating a game costs nothing.
+        if self.images is None:
+            self.load_assets()
         # Draw board background
         screen.blit(self.board_img, (0, 0))
         # Draw each piece on the board
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Multi-PV Analysis for the Pygame Chess Game
+-------------------------------------------
+Searches a position once and reports the best K moves, each with a score and a
+principal variation. All lines share one transposition table, so the second and
+later lines reuse the work done for the first instead of starting from scratch.
+
+Scores use the same convention as ChessGame.evaluate_board(): positive favours white.
+
+Usage (headless, prints JSON):
+    python chess_analysis.py --fen "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 0 1" --lines 3 --depth 2
+"""
+
+import argparse
+import json
+import sys
+
+from chess import ChessGame, move_to_uci
+
+MATE_SCORE = 100000  # Score of a checkmate (reduced by the number of plies needed)
+MATE_THRESHOLD = MATE_SCORE - 1000  # Scores at least this far from zero are mate scores
+DEFAULT_LINES = 3
+DEFAULT_DEPTH = 2
+TABLE_SIZE = 100000  # Most transposition table entries kept; the older half is dropped when it fills up
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class Analyzer:
+    def __init__(self):
+        """
+        Alpha-beta searcher with a transposition table that is kept between lines and calls.
+        The table holds at most TABLE_SIZE positions, so a long game does not keep growing it.
+        """
+        self.table = {}  # position key -> (depth, score, bound, best_move), least recently stored first
+        self.nodes = 0
+
+    def analyse(self, game, lines=DEFAULT_LINES, depth=DEFAULT_DEPTH):
+        """
+        Return up to `lines` analysis lines for the side to move, best first.
+        Each line is a dictionary with keys:
+          move:  UCI move
+          score: evaluation after the line (positive favours white)
+          mate:  moves until mate (positive if white mates, negative if black does), or None
+          pv:    principal variation as a list of UCI moves, starting with `move`
+        """
+        root = game.copy()
+        moves = root.get_all_moves(root.turn)
+        results = []
+        # Iterative deepening fills the table so deeper iterations search the best moves first.
+        for current_depth in range(1, depth + 1):
+            excluded = []
+            results = []
+            for _ in range(min(lines, len(moves))):
+                score, move = self.search_root(root, moves, excluded, current_depth)
+                excluded.append(move)
+                results.append((score, move))
+        color = 1 if root.turn == 'white' else -1
+        analysis = []
+        for score, move in results:
+            child = root.copy()
+            child.make_move(move)
+            pv = [move] + self.principal_variation(child, depth - 1)
+            analysis.append({
+                'move': move_to_uci(move),
+                'score': color * score,
+                'mate': mate_distance(color * score),
+                'pv': [move_to_uci(pv_move) for pv_move in pv],
+            })
+        return analysis
+
+    def search_root(self, game, moves, excluded, depth):
+        """
+        Search the root moves that are not excluded (already reported as better lines).
+        Returns (score, move) from the point of view of the side to move.
+        """
+        best_score = -MATE_SCORE - 1
+        best_move = None
+        for move in self.order_moves(game, moves):
+            if move in excluded:
+                continue
+            child = game.copy()
+            child.make_move(move)
+            score = -self.negamax(child, depth - 1, -MATE_SCORE - 1, -best_score, 1)
+            if score > best_score:
+                best_score = score
+                best_move = move
+        return best_score, best_move
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        """
+        Alpha-beta search returning the score for the side to move.
+        """
+        self.nodes += 1
+        key = position_key(game)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, score, bound, _ = entry
+            score = score_from_table(score, ply)
+            if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                return score
+        moves = game.get_all_moves(game.turn)
+        if not moves:
+            # Checkmate or stalemate
+            return -(MATE_SCORE - ply) if game.is_in_check(game.board, game.turn) else 0
+        if depth <= 0:
+            color = 1 if game.turn == 'white' else -1
+            return color * game.evaluate_board(game.board)
+        original_alpha = alpha
+        best_score = -MATE_SCORE - 1
+        best_move = None
+        for move in self.order_moves(game, moves):
+            child = game.copy()
+            child.make_move(move)
+            score = -self.negamax(child, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.store(key, (depth, score_to_table(best_score, ply), bound, best_move))
+        return best_score
+
+    def store(self, key, entry):
+        """
+        Store a transposition table entry as the most recent one, dropping the older half of the
+        table if it is full (in one go, so the cost per entry stays constant).
+        """
+        self.table.pop(key, None)
+        self.table[key] = entry
+        if len(self.table) > TABLE_SIZE:
+            entries = list(self.table.items())
+            self.table = dict(entries[len(entries) // 2:])
+
+    def order_moves(self, game, moves):
+        """
+        Put the transposition table move first, then captures, then everything else.
+        """
+        entry = self.table.get(position_key(game))
+        hash_move = entry[3] if entry is not None else None
+
+        def priority(move):
+            if move == hash_move:
+                return 0
+            return 1 if game.board[move[3]][move[2]] is not None else 2
+        return sorted(moves, key=priority)
+
+    def principal_variation(self, game, depth):
+        """
+        Follow best moves stored in the transposition table, up to depth plies.
+        """
+        pv = []
+        game = game.copy()
+        seen = set()
+        while len(pv) < depth:
+            key = position_key(game)
+            entry = self.table.get(key)
+            if entry is None or entry[3] is None or key in seen:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+            game.make_move(entry[3])
+        return pv
+
+
+def position_key(game):
+    """
+    Hashable key for the transposition table (placement, side to move, castling rights and en passant square).
+    """
+    return game.to_fen()
+
+
+def score_to_table(score, ply):
+    """
+    Convert a mate score counted from the root into one counted from the current node (ply plies
+    below it), so it stays right when the position is reached again at another ply.
+    """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Convert a mate score stored by score_to_table back into one counted from the root.
+    """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def mate_distance(score):
+    """
+    Convert a mate score (positive favours white) into moves until mate, or None if it is not a mate score.
+    """
+    if abs(score) < MATE_THRESHOLD:
+        return None
+    moves = (MATE_SCORE - abs(score) + 1) // 2
+    return moves if score > 0 else -moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-PV analysis of a chess position, printed as JSON.")
+    parser.add_argument('--fen', required=True, help="position to analyse")
+    parser.add_argument('--lines', type=int, default=DEFAULT_LINES, help=f"number of lines (default: {DEFAULT_LINES})")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help=f"search depth in plies (default: {DEFAULT_DEPTH})")
+    args = parser.parse_args()
+
+    game = ChessGame(2)
+    game.load_fen(args.fen)
+    analyzer = Analyzer()
+    lines = analyzer.analyse(game, args.lines, args.depth)
+    print(json.dumps({'fen': args.fen, 'depth': args.depth, 'nodes': analyzer.nodes, 'lines': lines}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Shared Asset Atlas for the Pygame Chess Games
+---------------------------------------------
+Board and piece images packed into one pre-scaled surface, used by both
+chess.py and chess/chess.py so the bundle format is defined in one place.
+
+The board fills the top board_size x board_size area and the pieces sit below
+it, one row per color. The surface is saved as atlas_<board>_<piece>.png next
+to the source images, so later runs skip decoding and scaling the 13 sources.
+It is rebuilt whenever a source image is newer than the bundle, and written to
+a temporary file first, so a run that is interrupted (or two running at once)
+never leaves a half-written bundle behind.
+"""
+
+import os
+import pygame
+
+PIECE_COLORS = ['white', 'black']
+PIECE_TYPES = ['king', 'queen', 'rook', 'bishop', 'knight', 'pawn']
+
+# Atlases keyed by (assets directory, board size, piece size), shared by every game in the process.
+_atlas_cache = {}
+
+class AssetAtlas:
+    def __init__(self, assets_dir, board_size, piece_size):
+        """
+        Load the atlas for a directory of images, building and saving the bundle if needed.
+        :param assets_dir: directory containing board.png and the white/ and black/ piece folders
+        :param board_size: width and height of the board image, in pixels
+        :param piece_size: width and height of each piece image, in pixels
+        """
+        bundle_path = os.path.join(assets_dir, f"atlas_{board_size}_{piece_size}.png")
+        sources = [os.path.join(assets_dir, "board.png")]
+        for color in PIECE_COLORS:
+            for piece in PIECE_TYPES:
+                # Note: using 'w' for white and 'b' for black
+                sources.append(os.path.join(assets_dir, color, f"{'w' if color == 'white' else 'b'}{piece}.png"))
+        if bundle_is_fresh(bundle_path, sources):
+            self.surface = pygame.image.load(bundle_path)
+        else:
+            self.surface = build_atlas_surface(sources, board_size, piece_size)
+            save_bundle(self.surface, bundle_path)
+        # Subsurfaces share the atlas pixels, so no per-game copies are made.
+        self.board_img = self.surface.subsurface((0, 0, board_size, board_size))
+        self.images = {}
+        for row, color in enumerate(PIECE_COLORS):
+            for col, piece in enumerate(PIECE_TYPES):
+                rect = (col * piece_size, board_size + row * piece_size, piece_size, piece_size)
+                self.images[(color, piece)] = self.surface.subsurface(rect)
+
+def bundle_is_fresh(bundle_path, sources):
+    """
+    Return True if the saved atlas bundle exists and is newer than every source image.
+    """
+    if not os.path.exists(bundle_path):
+        return False
+    bundle_time = os.path.getmtime(bundle_path)
+    return all(os.path.getmtime(path) <= bundle_time for path in sources)
+
+def build_atlas_surface(sources, board_size, piece_size):
+    """
+    Load and scale the board image and the 12 piece images into a single surface.
+    :param sources: board image path followed by the piece paths in PIECE_COLORS x PIECE_TYPES order
+    """
+    width = max(board_size, len(PIECE_TYPES) * piece_size)
+    height = board_size + len(PIECE_COLORS) * piece_size
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    board_img = pygame.image.load(sources[0])
+    surface.blit(pygame.transform.scale(board_img, (board_size, board_size)), (0, 0))
+    for index, path in enumerate(sources[1:]):
+        row, col = divmod(index, len(PIECE_TYPES))
+        img = pygame.transform.scale(pygame.image.load(path), (piece_size, piece_size))
+        surface.blit(img, (col * piece_size, board_size + row * piece_size))
+    return surface
+
+def save_bundle(surface, bundle_path):
+    """
+    Save the atlas to a temporary file and move it into place, so the bundle is either complete or absent.
+    """
+    # pygame picks the image format from the extension, so the temporary name keeps .png
+    temp_path = f"{bundle_path[:-len('.png')]}.{os.getpid()}.tmp.png"
+    try:
+        pygame.image.save(surface, temp_path)
+        os.replace(temp_path, bundle_path)
+    except (pygame.error, OSError):
+        # A read-only assets directory only means the bundle is rebuilt next run.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def get_asset_atlas(assets_dir, board_size, piece_size):
+    """
+    Return the shared atlas for assets_dir at the given sizes, loading it on first use.
+    """
+    key = (assets_dir, board_size, piece_size)
+    if key not in _atlas_cache:
+        _atlas_cache[key] = AssetAtlas(assets_dir, board_size, piece_size)
+    return _atlas_cache[key]
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Mate Solver for the Pygame Chess Game
+-------------------------------------
+Proves (or refutes) forced mates using proof-number search on top of ChessGame's
+move generator. Intended for validating puzzles, where plain alpha-beta over
+get_all_moves() wastes most of its time on lines that cannot lead to mate.
+
+Features:
+ • "Mate in N or not" for a FEN, together with the mating line in UCI notation
+ • Node budget (number of expansions) and memory cap (number of stored tree nodes)
+ • Bulk mode that verifies a file of puzzles across worker processes
+
+Usage:
+    python chess_mate.py --fen "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1" --mate-in 1
+    python chess_mate.py --bulk puzzles.txt --workers 4
+
+Each line of a puzzle file is "<FEN> ; <N>". Blank lines and lines starting with '#' are ignored.
+"""
+
+import argparse
+import multiprocessing
+import sys
+
+from chess import ChessGame, move_to_uci
+
+INFINITY = 10 ** 9               # Proof/disproof number of a solved node
+DEFAULT_NODE_BUDGET = 200000     # Maximum number of node expansions per puzzle
+DEFAULT_MAX_TREE_NODES = 500000  # Maximum number of nodes kept in memory
+
+
+# ------------------------------
+# Proof-number search tree
+# ------------------------------
+class PNSNode:
+    __slots__ = ('move', 'parent', 'children', 'proof', 'disproof', 'attacker', 'depth')
+
+    def __init__(self, move, parent, attacker, depth):
+        """
+        A node of the proof-number search tree.
+        Positions are not stored; they are rebuilt by replaying moves from the root.
+        :param move: move tuple leading to this node (None for the root)
+        :param attacker: True if the side trying to mate is to move (an OR node)
+        :param depth: plies from the root
+        """
+        self.move = move
+        self.parent = parent
+        self.children = None  # None until expanded
+        self.proof = 1
+        self.disproof = 1
+        self.attacker = attacker
+        self.depth = depth
+
+    def set_numbers(self):
+        """
+        Recompute proof and disproof numbers from the children.
+        """
+        if self.attacker:
+            self.proof = min(child.proof for child in self.children)
+            self.disproof = min(INFINITY, sum(child.disproof for child in self.children))
+        else:
+            self.proof = min(INFINITY, sum(child.proof for child in self.children))
+            self.disproof = min(child.disproof for child in self.children)
+
+
+class MateSolver:
+    def __init__(self, node_budget=DEFAULT_NODE_BUDGET, max_tree_nodes=DEFAULT_MAX_TREE_NODES):
+        """
+        Proof-number search for forced mates.
+        :param node_budget: maximum number of expansions across a whole solve() call
+        :param max_tree_nodes: memory cap; the search gives up once more nodes than this are stored
+        """
+        self.node_budget = node_budget
+        self.max_tree_nodes = max_tree_nodes
+        self.expansions = 0
+        self.tree_nodes = 0
+
+    def solve(self, fen, max_mate_in):
+        """
+        Look for the shortest forced mate of at most max_mate_in moves for the side to move.
+        Returns a dictionary with keys:
+          status:  'mate', 'no_mate' (proved there is none within the limit) or 'unknown' (budget exhausted)
+          mate_in: number of moves of the mate (None unless status is 'mate')
+          line:    mating line as a list of UCI moves
+          nodes:   number of expansions used
+        """
+        root_game = ChessGame(2)
+        root_game.load_fen(fen)
+        self.expansions = 0
+        result = {'fen': fen, 'status': 'no_mate', 'mate_in': None, 'line': [], 'nodes': 0}
+        # Iterating on N keeps the first proof the shortest one.
+        for mate_in in range(1, max_mate_in + 1):
+            root = self.search(root_game, 2 * mate_in - 1)
+            if root.proof == 0:
+                result['status'] = 'mate'
+                result['mate_in'] = mate_in
+                result['line'] = [move_to_uci(move) for move in self.principal_line(root)]
+                break
+            if root.disproof != 0:
+                result['status'] = 'unknown'
+                break
+        result['nodes'] = self.expansions
+        return result
+
+    def search(self, root_game, max_plies):
+        """
+        Run proof-number search from root_game, allowing the attacker to mate within max_plies plies.
+        Returns the root node; it is proved, disproved, or neither if a limit was hit.
+        """
+        root = PNSNode(None, None, True, 0)
+        self.tree_nodes = 1
+        while root.proof != 0 and root.disproof != 0:
+            if self.expansions >= self.node_budget or self.tree_nodes > self.max_tree_nodes:
+                break
+            node, game = self.select_most_proving(root, root_game)
+            self.expand(node, game, max_plies)
+            self.update_ancestors(node)
+        return root
+
+    def select_most_proving(self, root, root_game):
+        """
+        Walk down from the root to the most-proving leaf, replaying moves on a copy of the root position.
+        """
+        node = root
+        game = root_game.copy()
+        while node.children is not None:
+            if node.attacker:
+                node = min(node.children, key=lambda child: child.proof)
+            else:
+                node = min(node.children, key=lambda child: child.disproof)
+            game.make_move(node.move)
+        return node, game
+
+    def expand(self, node, game, max_plies):
+        """
+        Generate the children of a leaf, or mark it solved if it is terminal or at the depth limit.
+        """
+        self.expansions += 1
+        moves = game.get_all_moves(game.turn)
+        if not moves:
+            # Checkmate is a win for the side that just moved; stalemate is a refutation.
+            mated = game.is_in_check(game.board, game.turn)
+            if mated and not node.attacker:
+                node.proof, node.disproof = 0, INFINITY
+            else:
+                node.proof, node.disproof = INFINITY, 0
+            return
+        if node.depth >= max_plies:
+            # The attacker's last move has been played without giving mate.
+            node.proof, node.disproof = INFINITY, 0
+            return
+        node.children = [PNSNode(move, node, not node.attacker, node.depth + 1) for move in moves]
+        self.tree_nodes += len(node.children)
+        node.set_numbers()
+
+    def update_ancestors(self, node):
+        """
+        Propagate proof and disproof numbers from node back up to the root.
+        Subtrees that can no longer affect the result are released to respect the memory cap.
+        """
+        while node is not None:
+            if node.children is not None:
+                node.set_numbers()
+                if node.proof == 0 or node.disproof == 0:
+                    self.prune_solved(node)
+            node = node.parent
+
+    def prune_solved(self, node):
+        """
+        Drop subtrees of a solved node that are not needed to extract the mating line.
+        A disproved node needs no children; a proved attacker node only needs its proving children.
+        """
+        if node.disproof == 0:
+            keep = []
+        elif node.attacker:
+            keep = [child for child in node.children if child.proof == 0]
+        else:
+            return  # Every defence must be kept to report the longest resistance.
+        for child in node.children:
+            if child not in keep:
+                self.tree_nodes -= count_nodes(child)
+        node.children = keep or None
+
+    def principal_line(self, root):
+        """
+        Return the mating line from a proved root: the attacker takes the fastest mate,
+        the defender the longest resistance.
+        """
+        line = []
+        node = root
+        while node.children:
+            if node.attacker:
+                node = min(node.children, key=mate_length)
+            else:
+                node = max(node.children, key=mate_length)
+            line.append(node.move)
+        return line
+
+
+def count_nodes(node):
+    """
+    Count the nodes in the subtree rooted at node.
+    """
+    total = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        total += 1
+        if current.children:
+            stack.extend(current.children)
+    return total
+
+
+def mate_length(node):
+    """
+    Number of plies until mate from a proved node (INFINITY if the node is not proved).
+    """
+    if node.proof != 0:
+        return INFINITY
+    if not node.children:
+        return 0
+    if node.attacker:
+        return 1 + min(mate_length(child) for child in node.children)
+    return 1 + max(mate_length(child) for child in node.children)
+
+
+# ------------------------------
+# Bulk puzzle verification
+# ------------------------------
+def read_puzzles(path):
+    """
+    Read a puzzle file. Returns a list of (fen, mate_in) tuples.
+    """
+    puzzles = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fen, _, mate_in = line.partition(';')
+            if not mate_in.strip():
+                raise ValueError(f"Puzzle line has no '; N' mate length: {line}")
+            puzzles.append((fen.strip(), int(mate_in)))
+    return puzzles
+
+
+def verify_puzzle(args):
+    """
+    Worker function for bulk mode. A puzzle passes if its shortest mate has exactly the stated length.
+    """
+    fen, mate_in, node_budget, max_tree_nodes = args
+    solver = MateSolver(node_budget, max_tree_nodes)
+    result = solver.solve(fen, mate_in)
+    result['expected'] = mate_in
+    result['ok'] = result['status'] == 'mate' and result['mate_in'] == mate_in
+    return result
+
+
+def verify_puzzles(puzzles, workers, node_budget=DEFAULT_NODE_BUDGET, max_tree_nodes=DEFAULT_MAX_TREE_NODES):
+    """
+    Verify puzzles across a pool of worker processes, yielding results in input order.
+    """
+    jobs = [(fen, mate_in, node_budget, max_tree_nodes) for fen, mate_in in puzzles]
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap(verify_puzzle, jobs):
+            yield result
+
+
+def format_result(result):
+    """
+    One-line summary of a solve() result.
+    """
+    if result['status'] == 'mate':
+        summary = f"mate in {result['mate_in']}: {' '.join(result['line'])}"
+    elif result['status'] == 'no_mate':
+        summary = "no mate"
+    else:
+        summary = "unknown (budget exhausted)"
+    return f"{summary} [{result['nodes']} nodes]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prove forced mates with proof-number search.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--fen', help="position to solve (the side to move is the attacker)")
+    group.add_argument('--bulk', metavar='FILE', help="file of '<FEN> ; <N>' puzzles to verify")
+    parser.add_argument('--mate-in', type=int, default=3, help="longest mate to look for (default: 3)")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help="worker processes for bulk mode (default: CPU count)")
+    parser.add_argument('--node-budget', type=int, default=DEFAULT_NODE_BUDGET,
+                        help="maximum expansions per puzzle")
+    parser.add_argument('--max-tree-nodes', type=int, default=DEFAULT_MAX_TREE_NODES,
+                        help="maximum tree nodes kept in memory per puzzle")
+    args = parser.parse_args()
+
+    if args.fen:
+        result = MateSolver(args.node_budget, args.max_tree_nodes).solve(args.fen, args.mate_in)
+        print(format_result(result))
+        return 0 if result['status'] != 'unknown' else 2
+
+    puzzles = read_puzzles(args.bulk)
+    failures = 0
+    for number, result in enumerate(verify_puzzles(puzzles, args.workers, args.node_budget, args.max_tree_nodes), 1):
+        if not result['ok']:
+            failures += 1
+        status = "ok  " if result['ok'] else "FAIL"
+        print(f"{status} #{number} (expected mate in {result['expected']}) {format_result(result)}")
+    print(f"{len(puzzles) - failures}/{len(puzzles)} puzzles verified.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+# m,n,k Game Engine
+# Tic Tac Toe generalised to any board up to 19x19 where k in a row wins
+# (Tic Tac Toe is 3,3,3 and Gomoku is 15,15,5), with a computer player.
+#
+# The board never needs a full scan:
+#   win checks   - only the four lines through the last move can have been completed
+#   candidates   - only empty cells within CANDIDATE_RADIUS of a stone are considered,
+#                  and that set is updated as stones are placed and taken back
+#   hashing      - a Zobrist hash is updated with each move for the transposition table
+#
+# The computer player
+#   1. wins at once if it can, and otherwise blocks an immediate win,
+#   2. looks for a threat-space win: a chain of fours (k - 1 in a row with an open
+#      end) that each force a block, ending in a double threat,
+#   3. otherwise runs an iterative-deepening alpha-beta search over the most
+#      threatening candidate moves.
+# Threats are measured on unbroken runs of stones, so split shapes like X.XXX
+# are seen as weaker than they are.
+#
+# Example (play Gomoku against the computer):
+#   python3 mnk_engine.py --width 15 --height 15 -k 5
+# Works with Python 2 and Python 3.
+
+from __future__ import print_function
+
+import random
+import sys
+from datetime import datetime
+
+EMPTY = 0
+MAX_SIZE = 19
+CANDIDATE_RADIUS = 2
+MAX_BRANCH = 10  # Candidate moves searched at each node, most threatening first
+WIN_SCORE = 1000000
+MAX_EVALUATION = WIN_SCORE // 10  # Heuristic scores stay well clear of won and lost positions
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+CLOCK_EPOCH = datetime(1970, 1, 1)
+
+
+def clock():
+    # Returns the current time in seconds, for timing searches.
+    # The time module is not used: under Python 2 the repo's own time.py is imported in its place.
+    return (datetime.utcnow() - CLOCK_EPOCH).total_seconds()
+
+
+def isWinningMove(grid, row, col, k):
+    # Returns True if the piece at grid[row][col] is part of k or more in a row.
+    # grid is a list of rows; only the lines through (row, col) are checked.
+    piece = grid[row][col]
+    height = len(grid)
+    width = len(grid[0])
+    for dx, dy in DIRECTIONS:
+        count = 1
+        for sign in (1, -1):
+            x, y = col + sign * dx, row + sign * dy
+            while 0 <= x < width and 0 <= y < height and grid[y][x] == piece:
+                count += 1
+                x += sign * dx
+                y += sign * dy
+        if count >= k:
+            return True
+    return False
+
+
+class SearchTimeout(Exception):
+    # Raised inside the search when the time budget is used up.
+    pass
+
+
+class MNKBoard(object):
+    # A width x height board where k in a row wins. Players are 1 (moves first) and 2.
+
+    def __init__(self, width=15, height=15, k=5):
+        if not (1 <= width <= MAX_SIZE and 1 <= height <= MAX_SIZE):
+            raise ValueError('Boards can be at most %sx%s.' % (MAX_SIZE, MAX_SIZE))
+        if not 1 <= k <= max(width, height):
+            raise ValueError('k must be between 1 and the longest side of the board.')
+        self.width = width
+        self.height = height
+        self.k = k
+        self.cells = [EMPTY] * (width * height)
+        self.moves = []
+        self.winner = EMPTY
+        self.nearby = [0] * (width * height)  # Stones within CANDIDATE_RADIUS of each cell
+        self.candidates = set()
+        self.hash = 0
+        rng = random.Random(width * 10000 + height * 100 + k)
+        self.zobrist = [None] + [[rng.getrandbits(64) for cell in self.cells] for player in (1, 2)]
+        # Cells within CANDIDATE_RADIUS of each cell (including itself).
+        self.neighbourhoods = []
+        for cell in range(width * height):
+            x, y = cell % width, cell // width
+            self.neighbourhoods.append([nx + ny * width
+                                        for ny in range(max(0, y - CANDIDATE_RADIUS), min(height, y + CANDIDATE_RADIUS + 1))
+                                        for nx in range(max(0, x - CANDIDATE_RADIUS), min(width, x + CANDIDATE_RADIUS + 1))])
+
+    def toMove(self):
+        # Returns the player whose turn it is.
+        return 1 if len(self.moves) % 2 == 0 else 2
+
+    def isFull(self):
+        return len(self.moves) == len(self.cells)
+
+    def isOver(self):
+        return self.winner != EMPTY or self.isFull()
+
+    def play(self, cell):
+        # Places the next stone on an empty cell and records a win if it completes k in a row.
+        player = self.toMove()
+        self.cells[cell] = player
+        self.moves.append(cell)
+        self.hash ^= self.zobrist[player][cell]
+        self.candidates.discard(cell)
+        for neighbour in self.neighbourhoods[cell]:
+            self.nearby[neighbour] += 1
+            if self.cells[neighbour] == EMPTY:
+                self.candidates.add(neighbour)
+        if self.lineLength(cell, player) >= self.k:
+            self.winner = player
+
+    def undo(self):
+        # Takes back the last stone.
+        cell = self.moves.pop()
+        player = self.cells[cell]
+        self.cells[cell] = EMPTY
+        self.hash ^= self.zobrist[player][cell]
+        self.winner = EMPTY  # Play stops at a win, so only the last move can have won.
+        for neighbour in self.neighbourhoods[cell]:
+            self.nearby[neighbour] -= 1
+            if self.nearby[neighbour] == 0:
+                self.candidates.discard(neighbour)
+        if self.nearby[cell] > 0:
+            self.candidates.add(cell)
+
+    def run(self, cell, player, dx, dy):
+        # Returns (stones, open) for the unbroken run of player's stones next to cell in direction (dx, dy):
+        # open is True if the run ends in an empty cell rather than the edge or an opponent stone.
+        width = self.width
+        x, y = cell % width + dx, cell // width + dy
+        stones = 0
+        while 0 <= x < width and 0 <= y < self.height:
+            value = self.cells[x + y * width]
+            if value != player:
+                return stones, value == EMPTY
+            stones += 1
+            x += dx
+            y += dy
+        return stones, False
+
+    def lineLength(self, cell, player):
+        # Returns the longest line of player's stones through cell, counting cell itself.
+        longest = 0
+        for dx, dy in DIRECTIONS:
+            length = 1 + self.run(cell, player, dx, dy)[0] + self.run(cell, player, -dx, -dy)[0]
+            longest = max(longest, length)
+        return longest
+
+    def threatScore(self, cell, player):
+        # Returns how much player would gain by playing on the empty cell.
+        score = 0
+        for dx, dy in DIRECTIONS:
+            forward, forwardOpen = self.run(cell, player, dx, dy)
+            backward, backwardOpen = self.run(cell, player, -dx, -dy)
+            length = 1 + forward + backward
+            if length >= self.k:
+                return WIN_SCORE
+            ends = forwardOpen + backwardOpen
+            if ends:
+                if length == self.k - 1:
+                    score += 10000 if ends == 2 else 1000  # An open four cannot be blocked
+                else:
+                    score += ends * 4 ** length
+        return score
+
+    def winningCells(self, player):
+        # Returns the cells where player would complete k in a row.
+        return [cell for cell in self.candidates if self.lineLength(cell, player) >= self.k]
+
+
+class MNKSearcher(object):
+    # Threat-space search followed by iterative-deepening alpha-beta.
+
+    def __init__(self, board):
+        self.board = board
+        self.table = {}  # hash -> (depth, score, bound, best cell)
+        self.nodes = 0
+        self.deadline = None
+
+    def orderedMoves(self, limit=MAX_BRANCH):
+        # Returns the candidate cells most worth searching, best first.
+        board = self.board
+        if not board.moves:
+            return [board.width // 2 + (board.height // 2) * board.width]
+        player = board.toMove()
+        opponent = 3 - player
+        scored = []
+        for cell in board.candidates:
+            attack = board.threatScore(cell, player)
+            if attack >= WIN_SCORE:
+                return [cell]  # Win at once.
+            scored.append((attack + board.threatScore(cell, opponent) * 9 // 10, cell))
+        scored.sort(reverse=True)
+        # If the opponent threatens to win next move, only the blocking cells are worth trying.
+        blocks = [cell for score, cell in scored if board.threatScore(cell, opponent) >= WIN_SCORE]
+        if blocks:
+            return blocks
+        return [cell for score, cell in scored[:limit]]
+
+    def evaluate(self, ply):
+        # Returns the value of the position for the side to move, ply moves below the root.
+        # Wins that cannot be stopped are scored like the wins found by the search.
+        board = self.board
+        player = board.toMove()
+        mine = theirs = 0
+        theirWins = 0
+        for cell in board.candidates:
+            score = board.threatScore(cell, player)
+            if score >= WIN_SCORE:
+                return WIN_SCORE - ply - 1  # Win next move.
+            mine += score
+            score = board.threatScore(cell, 3 - player)
+            if score >= WIN_SCORE:
+                theirWins += 1
+            else:
+                theirs += score
+        if theirWins >= 2:
+            return -(WIN_SCORE - ply - 2)  # Only one of them can be blocked.
+        return max(-MAX_EVALUATION, min(MAX_EVALUATION, mine - theirs))
+
+    def threatSpaceWin(self, depth):
+        # Returns a winning first move for the side to move built only from fours, each forcing the
+        # opponent to block, or None. depth limits how many fours are tried in a row.
+        board = self.board
+        player = board.toMove()
+        opponent = 3 - player
+        winning = board.winningCells(player)
+        if winning:
+            return winning[0]
+        if depth == 0 or board.winningCells(opponent):
+            return None  # A four that ignores the opponent's own four would lose.
+        for cell in list(board.candidates):
+            if board.threatScore(cell, player) < 1000:
+                continue  # Not a four.
+            board.play(cell)
+            threats = board.winningCells(player)
+            found = False
+            if len(threats) >= 2:
+                found = True  # Two ways to win: the opponent can only block one.
+            elif len(threats) == 1:
+                board.play(threats[0])  # The forced block
+                if board.winner == EMPTY and self.threatSpaceWin(depth - 1) is not None:
+                    found = True
+                board.undo()
+            board.undo()
+            if found:
+                return cell
+        return None
+
+    def search(self, timeLimit=None, maxDepth=20, threatDepth=8):
+        # Returns (cell, score, depth) for the side to move.
+        board = self.board
+        self.nodes = 0
+        cell = self.threatSpaceWin(threatDepth)
+        if cell is not None:
+            return cell, WIN_SCORE, 0
+        self.deadline = clock() + timeLimit if timeLimit is not None else None
+        moves = self.orderedMoves()
+        best = (moves[0], 0, 0)
+        for depth in range(1, min(maxDepth, len(board.cells) - len(board.moves)) + 1):
+            try:
+                score = self.negamax(depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+            except SearchTimeout:
+                break  # Keep the result of the last completed depth.
+            best = (self.table[board.hash][3], score, depth)
+            if abs(score) >= WIN_SCORE - 100:
+                break  # The result is already certain.
+        return best
+
+    def negamax(self, depth, alpha, beta, ply):
+        # Alpha-beta search returning the value of the position for the side to move.
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 255 == 0 and clock() > self.deadline:
+            raise SearchTimeout()
+        board = self.board
+        if board.winner != EMPTY:
+            return -(WIN_SCORE - ply)  # The last move won.
+        if board.isFull():
+            return 0
+        if depth == 0:
+            return self.evaluate(ply)
+        entry = self.table.get(board.hash)
+        hashMove = None
+        if entry is not None:
+            hashMove = entry[3]
+            if entry[0] >= depth:
+                score, bound = entry[1], entry[2]
+                if bound == 0 or (bound == 1 and score >= beta) or (bound == 2 and score <= alpha):
+                    return score
+        moves = self.orderedMoves()
+        if hashMove in moves:
+            moves.remove(hashMove)
+            moves.insert(0, hashMove)
+        originalAlpha = alpha
+        bestScore = -WIN_SCORE - 1
+        bestCell = moves[0]
+        for cell in moves:
+            board.play(cell)
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.undo()
+            if score > bestScore:
+                bestScore = score
+                bestCell = cell
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        bound = 2 if bestScore <= originalAlpha else 1 if bestScore >= beta else 0  # upper, lower, exact
+        self.table[board.hash] = (depth, bestScore, bound, bestCell)
+        return bestScore
+
+
+def getComputerMove(board, timeLimit=2.0):
+    # Returns the cell the computer chooses for the side to move.
+    return MNKSearcher(board).search(timeLimit)[0]
+
+
+def drawBoard(board):
+    # Prints the board with 1-based column and row numbers.
+    marks = {EMPTY: '.', 1: 'X', 2: 'O'}
+    print('    ' + ' '.join('%2d' % (x + 1) for x in range(board.width)))
+    for y in range(board.height):
+        print('%2d  ' % (y + 1) + ' '.join(' ' + marks[board.cells[x + y * board.width]] for x in range(board.width)))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Play an m,n,k game (k in a row wins) against the computer.')
+    parser.add_argument('--width', type=int, default=15, help='board width, up to 19 (default: 15)')
+    parser.add_argument('--height', type=int, default=15, help='board height, up to 19 (default: 15)')
+    parser.add_argument('-k', type=int, default=5, help='stones in a row needed to win (default: 5)')
+    parser.add_argument('--time', type=float, default=2.0, help='computer thinking time in seconds (default: 2)')
+    parser.add_argument('--computer-first', action='store_true', help='let the computer play X')
+    args = parser.parse_args()
+    try:
+        ask = raw_input  # Python 2
+    except NameError:
+        ask = input
+
+    board = MNKBoard(args.width, args.height, args.k)
+    computer = 1 if args.computer_first else 2
+    while not board.isOver():
+        drawBoard(board)
+        if board.toMove() == computer:
+            start = clock()
+            cell = getComputerMove(board, args.time)
+            print('The computer plays %s %s (%.1fs).' % (cell % board.width + 1, cell // board.width + 1,
+                                                        clock() - start))
+        else:
+            while True:
+                parts = ask('Your move (column row): ').split()
+                if len(parts) == 2 and all(part.isdigit() for part in parts):
+                    x, y = int(parts[0]) - 1, int(parts[1]) - 1
+                    if 0 <= x < board.width and 0 <= y < board.height and board.cells[x + y * board.width] == EMPTY:
+                        cell = x + y * board.width
+                        break
+                print('Type a free column and row, for example: 8 8')
+        board.play(cell)
+    drawBoard(board)
+    if board.winner == EMPTY:
+        print('It is a tie!')
+    elif board.winner == computer:
+        print('The computer wins!')
+    else:
+        print('You win!')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
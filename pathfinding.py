@@ -0,0 +1,304 @@
+"""
+Headless pathfinding: A* on grids and graphs, with no pygame or global state.
+
+astarfun.py (grids) and astargraphfun.py (graphs) draw the searches run here,
+and pathfinding_bench.py times them. A search runs on any map object with:
+    neighbors(node) -> list of (neighbor, cost)
+    position(node)  -> (x, y), used by the heuristic
+    default_heuristic, used when no heuristic is given
+GridMap and Graph below are the two kinds of map the visualisers use. A map
+may also define successors(node, parent), used instead of neighbors when the
+moves worth trying depend on how the node was reached (as in
+pathfinding_jps.py).
+
+astar_steps is a generator so the visualisers can draw each step; astar runs
+the same search to the end.
+"""
+import heapq
+import math
+from types import MappingProxyType
+
+SQRT2 = math.sqrt(2)
+ORTHOGONAL_MOVES = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIAGONAL_MOVES = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+
+# --------------------------
+# Heuristics
+# --------------------------
+def manhattan(p1, p2):
+    """Manhattan distance: exact on an open 4-connected grid."""
+    return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
+
+
+def octile(p1, p2):
+    """Octile distance: exact on an open 8-connected grid where diagonal moves cost sqrt(2)."""
+    dx = abs(p1[0] - p2[0])
+    dy = abs(p1[1] - p2[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def euclidean(p1, p2):
+    """Straight-line distance: admissible whenever every move costs at least its length."""
+    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+
+def zero(p1, p2):
+    """No estimate at all, which turns A* into Dijkstra's algorithm."""
+    return 0
+
+
+HEURISTICS = {"manhattan": manhattan, "octile": octile, "euclidean": euclidean, "zero": zero}
+
+
+# --------------------------
+# Maps
+# --------------------------
+class GridMap:
+    """
+    A grid given as a list of rows, where 1 is a wall and anything else is open (as in astarfun.py).
+    Moves are up, down, left and right at cost 1, plus diagonal moves at cost sqrt(2) if diagonal is True.
+    A diagonal move may not cut the corner of a wall.
+    """
+
+    def __init__(self, grid, diagonal=False):
+        self.grid = grid
+        self.width = len(grid[0])
+        self.height = len(grid)
+        self.diagonal = diagonal
+        self.default_heuristic = octile if diagonal else manhattan
+
+    def passable(self, x, y):
+        """Return True if (x, y) is on the grid and not a wall."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.grid[y][x] != 1
+
+    def neighbors(self, pos):
+        """Return a list of (neighbor position, move cost) for the open cells next to pos."""
+        x, y = pos
+        passable = self.passable
+        result = [((x + dx, y + dy), 1) for dx, dy in ORTHOGONAL_MOVES if passable(x + dx, y + dy)]
+        if self.diagonal:
+            for dx, dy in DIAGONAL_MOVES:
+                if passable(x + dx, y + dy) and passable(x + dx, y) and passable(x, y + dy):
+                    result.append(((x + dx, y + dy), SQRT2))
+        return result
+
+    def position(self, pos):
+        return pos
+
+
+class Edge:
+    """An undirected edge. Change its cost with Graph.set_cost so the graph knows it was edited."""
+
+    def __init__(self, node1, node2, cost):
+        self.node1 = node1
+        self.node2 = node2
+        self.cost = cost
+
+    def other(self, node):
+        """Return the node at the other end of the edge from node."""
+        return self.node2 if node is self.node1 else self.node1
+
+
+class Graph:
+    """
+    An undirected graph of nodes (any hashable objects) with (x, y) positions.
+    adjacency maps each node to {neighbor: Edge}, so neighbors take O(degree) and finding an edge O(1).
+    version goes up with every edit, so anything computed from the graph can tell when it is out of date.
+    """
+
+    def __init__(self):
+        self.positions = {}  # Node -> (x, y); iterating over it gives the nodes
+        self.adjacency = {}  # Node -> {neighbor: Edge}
+        self.edges = set()
+        self.version = 0
+        self.default_heuristic = euclidean
+
+    def add_node(self, node, pos):
+        self.positions[node] = pos
+        self.adjacency[node] = {}
+        self.version += 1
+
+    def move_node(self, node, pos):
+        self.positions[node] = pos
+        self.version += 1
+
+    def remove_node(self, node):
+        """Remove a node and the edges touching it."""
+        for edge in list(self.adjacency[node].values()):
+            self.remove_edge(edge)
+        del self.adjacency[node]
+        del self.positions[node]
+        self.version += 1
+
+    def add_edge(self, edge):
+        """Add an Edge (or subclass) and return it, or return None if its nodes are already connected."""
+        if edge.node2 in self.adjacency[edge.node1]:
+            return None
+        self.edges.add(edge)
+        self.adjacency[edge.node1][edge.node2] = edge
+        self.adjacency[edge.node2][edge.node1] = edge
+        self.version += 1
+        return edge
+
+    def find_edge(self, node1, node2):
+        """Return the edge between two nodes, or None if they are not connected."""
+        return self.adjacency.get(node1, {}).get(node2)
+
+    def remove_edge(self, edge):
+        self.edges.discard(edge)
+        del self.adjacency[edge.node1][edge.node2]
+        del self.adjacency[edge.node2][edge.node1]
+        self.version += 1
+
+    def set_cost(self, edge, cost):
+        if edge.cost != cost:
+            edge.cost = cost
+            self.version += 1
+
+    def clear(self):
+        """Remove every node and edge (in place, so references to positions and edges stay valid)."""
+        self.positions.clear()
+        self.adjacency.clear()
+        self.edges.clear()
+        self.version += 1
+
+    def neighbors(self, node):
+        return [(neighbor, edge.cost) for neighbor, edge in self.adjacency[node].items()]
+
+    def position(self, node):
+        return self.positions[node]
+
+
+# --------------------------
+# A*
+# --------------------------
+class SearchResult:
+    """The outcome of a search: the path (None if there is none), its cost and the number of nodes expanded."""
+
+    def __init__(self, path, cost, expanded):
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+
+
+def build_path(parent, node):
+    """Follow parent links back from node and return the path from the start to node."""
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    return path[::-1]
+
+
+def astar_steps(problem, start, goal, heuristic=None, tie_break=False, log=None):
+    """
+    Run A* from start to goal on a map as a generator.
+    Yields (current, open_nodes, closed, g) each time a node is taken from the open list, where
+    open_nodes maps each open node to its f-cost and g maps each node reached to its best cost so far.
+    open_nodes and g are read-only views, and all three change as the search goes on.
+    Returns (as StopIteration.value) a SearchResult; finish() collects it.
+    tie_break prefers the deeper of two nodes with equal f, which expands fewer nodes on open grids.
+    log, if given, is called with a message describing each decision.
+    """
+    if heuristic is None:
+        heuristic = problem.default_heuristic
+    position = problem.position
+    neighbors = problem.neighbors
+    successors = getattr(problem, "successors", None)
+    goal_pos = position(goal)
+
+    g = {start: 0}
+    parent = {start: None}
+    open_nodes = {}  # Node -> f for each node in the open list
+    closed = set()
+    g_view = MappingProxyType(g)
+    open_view = MappingProxyType(open_nodes)
+    open_list = []  # Heap of (f, tie, count, node); entries made stale by a cheaper path are skipped when popped
+    count = 0
+    expanded = 0
+
+    open_nodes[start] = heuristic(position(start), goal_pos)
+    heapq.heappush(open_list, (open_nodes[start], 0, count, start))
+    if log:
+        log(f"Starting A* from {start} to {goal}")
+
+    while open_list:
+        f, _, _, current = heapq.heappop(open_list)
+        if current in closed or f > open_nodes[current]:
+            continue
+        del open_nodes[current]
+        closed.add(current)
+        expanded += 1
+        if log:
+            log(f"Processing node {current} (f={f}, g={g[current]}, h={f - g[current]})")
+        yield (current, open_view, closed, g_view)
+
+        if current == goal:
+            if log:
+                log(f"Goal reached at {current}. Reconstructing path...")
+            return SearchResult(build_path(parent, goal), g[goal], expanded)
+
+        current_g = g[current]
+        moves = successors(current, parent[current]) if successors else neighbors(current)
+        for neighbor, cost in moves:
+            if neighbor in closed:
+                if log:
+                    log(f"Skipping neighbor {neighbor}: already evaluated")
+                continue
+            new_g = current_g + cost
+            if new_g >= g.get(neighbor, math.inf):
+                if log:
+                    log(f"Skipping neighbor {neighbor}: already in open list with lower cost (g={g[neighbor]})")
+                continue
+            g[neighbor] = new_g
+            parent[neighbor] = current
+            h = heuristic(position(neighbor), goal_pos)
+            open_nodes[neighbor] = new_g + h
+            count += 1
+            heapq.heappush(open_list, (new_g + h, -new_g if tie_break else 0, count, neighbor))
+            if log:
+                log(f"Adding neighbor {neighbor} to open list (f={new_g + h}, g={new_g}, h={h})")
+
+    if log:
+        log("No path found")
+    return SearchResult(None, math.inf, expanded)
+
+
+def finish(steps):
+    """Run a step generator such as astar_steps to the end and return its SearchResult."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def astar(problem, start, goal, heuristic=None, tie_break=False):
+    """Return the SearchResult of an A* search (see astar_steps)."""
+    return finish(astar_steps(problem, start, goal, heuristic, tie_break))
+
+
+# --------------------------
+# Moving AI benchmark files (https://movingai.com/benchmarks/)
+# --------------------------
+def load_map(path):
+    """Read a Moving AI .map file and return its grid (1 for walls, 0 for open cells)."""
+    with open(path) as f:
+        lines = f.read().splitlines()
+    start = lines.index("map") + 1
+    return [[0 if c in ".GS" else 1 for c in line] for line in lines[start:] if line]
+
+
+def load_scenarios(path):
+    """Read a Moving AI .scen file and return a list of (map name, start, goal, optimal cost)."""
+    scenarios = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == "version":
+                continue
+            start = (int(fields[4]), int(fields[5]))
+            goal = (int(fields[6]), int(fields[7]))
+            scenarios.append((fields[1], start, goal, float(fields[8])))
+    return scenarios
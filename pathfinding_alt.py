@@ -0,0 +1,138 @@
+"""
+A* with landmarks and the triangle inequality (ALT) on pathfinding.Graph.
+
+Straight-line and Manhattan distance only bound the cost of a path when every
+edge costs at least its length, which stops being true as soon as edges get
+costs of their own, and they badly underestimate on graphs with detours.
+ALT bounds it with real shortest-path distances instead. A few nodes are
+chosen as landmarks and Dijkstra's algorithm finds the distance d(L, v) from
+each landmark L to every node. For any nodes v and goal the triangle
+inequality gives
+    dist(v, goal) >= |d(L, goal) - d(L, v)|
+and the largest of these over the landmarks is the heuristic. It is
+admissible and consistent for any non-negative edge costs.
+
+Landmarks are chosen far apart ("farthest" selection): each one is the node
+farthest from the landmarks already chosen, so they end up around the edge of
+the graph, behind the nodes searches travel between.
+
+The tables cost a Dijkstra search per landmark to build, which pays off over
+many queries. landmark_tables caches them for each Graph and rebuilds them
+the first time they are asked for after the graph has been edited (its
+version has changed).
+"""
+import heapq
+import math
+from weakref import WeakKeyDictionary
+
+from pathfinding import finish, astar_steps
+
+DEFAULT_LANDMARKS = 8
+
+
+def dijkstra_distances(graph, source):
+    """Return a dict of the shortest-path distance from source to every node it can reach."""
+    distances = {source: 0}
+    done = set()
+    heap = [(0, 0, source)]
+    count = 0
+    while heap:
+        distance, _, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+        for neighbor, cost in graph.neighbors(node):
+            new_distance = distance + cost
+            if new_distance < distances.get(neighbor, math.inf):
+                distances[neighbor] = new_distance
+                count += 1
+                heapq.heappush(heap, (new_distance, count, neighbor))
+    return distances
+
+
+class LandmarkTables:
+    """
+    The distances from each of count landmarks to every node of a Graph, as of its current version.
+    distances maps each node to a list of its distance from each landmark (math.inf if unreachable).
+    """
+
+    def __init__(self, graph, count=DEFAULT_LANDMARKS):
+        self.version = graph.version
+        self.count = count
+        self.landmarks = []
+        self.distances = {node: [] for node in graph.positions}
+        if not self.distances:
+            return
+        # Start from the node farthest from an arbitrary one, then keep taking the node farthest from all
+        # the landmarks so far (unreachable nodes count as farthest, so every part of the graph gets one)
+        from_first = dijkstra_distances(graph, next(iter(self.distances)))
+        nearest = {node: from_first.get(node, math.inf) for node in self.distances}  # Node -> distance to a landmark
+        for _ in range(min(count, len(self.distances))):
+            landmark = max(nearest, key=nearest.get)
+            from_landmark = dijkstra_distances(graph, landmark)
+            for node, row in self.distances.items():
+                distance = from_landmark.get(node, math.inf)
+                row.append(distance)
+                nearest[node] = distance if not self.landmarks else min(nearest[node], distance)
+            self.landmarks.append(landmark)
+
+    def heuristic(self, node, goal):
+        """Return the landmark lower bound on the distance between two nodes."""
+        best = 0
+        for from_node, from_goal in zip(self.distances[node], self.distances[goal]):
+            if from_node != from_goal:
+                # One landmark reaching just one of the nodes means they are not connected (math.inf)
+                difference = abs(from_goal - from_node)
+                if difference > best:
+                    best = difference
+        return best
+
+
+_tables = WeakKeyDictionary()  # Graph -> LandmarkTables
+
+
+def landmark_tables(graph, count=DEFAULT_LANDMARKS):
+    """Return the LandmarkTables for a Graph, building them again if the graph has changed since."""
+    tables = _tables.get(graph)
+    if tables is None or tables.version != graph.version or tables.count != count:
+        tables = _tables[graph] = LandmarkTables(graph, count)
+    return tables
+
+
+class LandmarkGraph:
+    """
+    A Graph seen through its landmark tables: the position of a node is the node itself, so the heuristic
+    (the ALT bound, or the larger of it and a position heuristic if one is given) can look up its distances.
+    """
+
+    def __init__(self, graph, tables, heuristic=None):
+        self.graph = graph
+        self.tables = tables
+        self.neighbors = graph.neighbors
+        if heuristic is None:
+            self.default_heuristic = tables.heuristic
+        else:
+            position = graph.position
+
+            def combined(node, goal):
+                return max(tables.heuristic(node, goal), heuristic(position(node), position(goal)))
+            self.default_heuristic = combined
+
+    def position(self, node):
+        return node
+
+
+def alt_steps(graph, start, goal, heuristic=None, tie_break=False, log=None, landmarks=DEFAULT_LANDMARKS):
+    """
+    Run A* with the ALT heuristic on a Graph as a generator, with the same yields as
+    pathfinding.astar_steps. heuristic, if given, is a position heuristic known to be admissible for
+    this graph, and the larger of it and the ALT bound is used. The landmark tables are built first if
+    the graph has no up-to-date ones.
+    """
+    search_map = LandmarkGraph(graph, landmark_tables(graph, landmarks), heuristic)
+    return astar_steps(search_map, start, goal, tie_break=tie_break, log=log)
+
+
+def alt(graph, start, goal, heuristic=None, tie_break=False):
+    """Return the SearchResult of A* with the ALT heuristic (see alt_steps)."""
+    return finish(alt_steps(graph, start, goal, heuristic, tie_break))
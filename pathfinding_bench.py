@@ -0,0 +1,226 @@
+"""
+Benchmarks for pathfinding.py: expansions per second and path optimality.
+
+Maps:
+    random  - random grids with a given wall density
+    scen    - a Moving AI scenario file (https://movingai.com/benchmarks/),
+              whose optimal costs are checked against (8-connected, no corner cutting)
+    graph   - a road-like graph: a jittered lattice with some roads missing
+
+Every query is also solved by Dijkstra's algorithm (outside the timing) unless
+the scenario file gives the optimal cost, so a row reports how many paths were
+optimal. Algorithms that preprocess the map (alt's landmark tables and ch's
+contraction hierarchy) do so before the queries are timed, and report that
+time separately, along with the memory their tables take. The peak memory of
+a query is measured with tracemalloc on the first few queries, outside the
+timing.
+
+Examples:
+    python3 pathfinding_bench.py random --size 256 --density 0.3 --heuristic manhattan zero --tie-break
+    python3 pathfinding_bench.py random --size 512 --density 0.05 --diagonal --algorithm astar jps
+    python3 pathfinding_bench.py scen maps/arena.map.scen
+    python3 pathfinding_bench.py graph --size 150 --heuristic euclidean manhattan
+    python3 pathfinding_bench.py graph --size 150 --algorithm astar bidirectional --heuristic euclidean zero
+    python3 pathfinding_bench.py graph --size 150 --algorithm astar alt --heuristic zero
+    python3 pathfinding_bench.py graph --size 300 --algorithm astar ch --ch-file road300.ch
+"""
+import argparse
+import functools
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from pathfinding import GridMap, Graph, Edge, HEURISTICS, astar, load_map, load_scenarios
+from pathfinding_alt import alt, landmark_tables
+from pathfinding_bidirectional import bidirectional
+from pathfinding_ch import ch, contraction_hierarchy
+from pathfinding_jps import jps
+
+# Name -> function(problem, start, goal, heuristic, tie_break) returning a SearchResult
+ALGORITHMS = {
+    "astar": astar,
+    "jps": jps,
+    "bidirectional": bidirectional,
+    "alt": alt,
+    "ch": ch,
+}
+GRID_ONLY = {"jps"}  # Algorithms that only search GridMaps
+GRAPH_ONLY = {"alt", "ch"}  # Algorithms that only search Graphs
+# Name -> function(problem) that prepares (and returns) an algorithm's tables for a map ahead of its queries
+PREPROCESS = {
+    "alt": landmark_tables,
+    "ch": contraction_hierarchy,
+}
+MEMORY_QUERIES = 10  # Queries whose peak memory is measured
+
+
+def random_grid(width, height, density, rng):
+    """Return a grid where each cell is a wall with the given probability."""
+    return [[1 if rng.random() < density else 0 for _ in range(width)] for _ in range(height)]
+
+
+def random_cell(grid_map, rng):
+    """Return a random open cell."""
+    while True:
+        x = rng.randrange(grid_map.width)
+        y = rng.randrange(grid_map.height)
+        if grid_map.passable(x, y):
+            return (x, y)
+
+
+def road_graph(size, rng, spacing=10, missing=0.2):
+    """
+    Return a size x size lattice Graph whose nodes are jittered from their lattice points and whose
+    edges (to the right and below, each missing with the given probability) cost their length.
+    """
+    graph = Graph()
+    for y in range(size):
+        for x in range(size):
+            graph.add_node((x, y), (x * spacing + rng.uniform(-3, 3), y * spacing + rng.uniform(-3, 3)))
+    for y in range(size):
+        for x in range(size):
+            for neighbor in ((x + 1, y), (x, y + 1)):
+                if neighbor in graph.positions and rng.random() >= missing:
+                    p1 = graph.positions[(x, y)]
+                    p2 = graph.positions[neighbor]
+                    graph.add_edge(Edge((x, y), neighbor, math.hypot(p1[0] - p2[0], p1[1] - p2[1])))
+    return graph
+
+
+def deep_size(obj, skip=()):
+    """Return the bytes taken by obj and everything it refers to, not counting the objects in skip."""
+    seen = {id(other) for other in skip}
+    stack = [obj]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
+
+
+def reference_costs(problem, queries):
+    """Return the optimal cost of each (start, goal) query, found by Dijkstra's algorithm."""
+    return [astar(problem, start, goal, HEURISTICS["zero"]).cost for start, goal in queries]
+
+
+def run_benchmark(problem, queries, optimal, algorithm, heuristic, tie_break=False):
+    """Run every query and return a dict of totals for one algorithm and heuristic."""
+    search = ALGORITHMS[algorithm]
+    start_time = time.perf_counter()
+    tables = PREPROCESS[algorithm](problem) if algorithm in PREPROCESS else None
+    preprocess_seconds = time.perf_counter() - start_time
+    # The tables' own memory, not counting the nodes they share with the map
+    preprocess_bytes = deep_size(tables, getattr(problem, "positions", ())) if tables is not None else 0
+
+    query_bytes = 0
+    tracemalloc.start()
+    for start, goal in queries[:MEMORY_QUERIES]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        search(problem, start, goal, HEURISTICS[heuristic], tie_break)
+        query_bytes = max(query_bytes, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    expanded = 0
+    optimal_paths = 0
+    found = 0
+    start_time = time.perf_counter()
+    for (start, goal), best in zip(queries, optimal):
+        result = search(problem, start, goal, HEURISTICS[heuristic], tie_break)
+        expanded += result.expanded
+        if result.path is not None:
+            found += 1
+        if abs(result.cost - best) <= 1e-6 * max(1.0, best) or result.cost == best:
+            optimal_paths += 1
+    seconds = time.perf_counter() - start_time
+    return {"algorithm": algorithm, "heuristic": heuristic, "queries": len(queries), "found": found,
+            "optimal": optimal_paths, "expanded": expanded, "seconds": seconds, "preprocess": preprocess_seconds,
+            "preprocess_bytes": preprocess_bytes, "query_bytes": query_bytes}
+
+
+def print_row(row):
+    queries = row["queries"]
+    print(f"{row['algorithm']:<14} {row['heuristic']:<10} {row['found']:>5}/{queries:<5} "
+          f"{row['optimal']:>5}/{queries:<5} {row['expanded'] / queries:>12.1f} "
+          f"{row['expanded'] / row['seconds']:>12.0f} {1000 * row['seconds'] / queries:>10.2f} "
+          f"{row['preprocess']:>10.2f} {row['preprocess_bytes'] / 2 ** 20:>10.2f} {row['query_bytes'] / 2 ** 10:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinding searches.")
+    parser.add_argument("kind", choices=["random", "scen", "graph"], help="what to search")
+    parser.add_argument("scen", nargs="?", help="Moving AI .scen file (for kind scen)")
+    parser.add_argument("--size", type=int, default=256, help="grid or lattice side length (default: %(default)s)")
+    parser.add_argument("--density", type=float, default=0.25, help="wall probability for random grids (default: %(default)s)")
+    parser.add_argument("--diagonal", action="store_true", help="allow diagonal moves on random grids")
+    parser.add_argument("--queries", type=int, default=100, help="random queries to run (default: %(default)s)")
+    parser.add_argument("--limit", type=int, default=None, help="use only the first LIMIT scenarios")
+    parser.add_argument("--algorithm", nargs="+", default=["astar"], choices=sorted(ALGORITHMS))
+    parser.add_argument("--heuristic", nargs="+", default=None, choices=sorted(HEURISTICS),
+                        help="heuristics to compare (default: the map's own)")
+    parser.add_argument("--tie-break", action="store_true", help="prefer deeper nodes among equal f")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ch-file", help="read ch's contraction hierarchy from this file if it was made for the same "
+                                          "map, or else build it and save it there")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    if args.ch_file:
+        PREPROCESS["ch"] = functools.partial(contraction_hierarchy, path=args.ch_file)
+
+    if args.kind == "scen":
+        if args.scen is None:
+            parser.error("kind scen needs a .scen file")
+        scenarios = load_scenarios(args.scen)[:args.limit]
+        map_name = scenarios[0][0]
+        map_path = os.path.join(os.path.dirname(args.scen), os.path.basename(map_name))
+        problem = GridMap(load_map(map_path), diagonal=True)
+        queries = [(start, goal) for _, start, goal, _ in scenarios]
+        optimal = [cost for _, _, _, cost in scenarios]
+        print(f"{map_name}: {problem.width}x{problem.height}, {len(queries)} scenarios")
+    else:
+        if args.kind == "random":
+            problem = GridMap(random_grid(args.size, args.size, args.density, rng), diagonal=args.diagonal)
+            queries = [(random_cell(problem, rng), random_cell(problem, rng)) for _ in range(args.queries)]
+            print(f"Random {args.size}x{args.size} grid, {args.density:.0%} walls, "
+                  f"{'8' if args.diagonal else '4'}-connected, {len(queries)} queries")
+        else:
+            problem = road_graph(args.size, rng)
+            nodes = list(problem.positions)
+            queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.queries)]
+            print(f"Road graph: {len(problem.positions)} nodes, {len(problem.edges)} edges, {len(queries)} queries")
+        optimal = reference_costs(problem, queries)
+    print(f"Map memory: {deep_size(problem) / 2 ** 20:.2f} MB")
+
+    heuristics = args.heuristic
+    if heuristics is None:
+        heuristics = [name for name, function in HEURISTICS.items() if function is problem.default_heuristic]
+    print(f"{'algorithm':<14} {'heuristic':<10} {'found':>11} {'optimal':>11} {'expanded/q':>12} "
+          f"{'expanded/s':>12} {'ms/query':>10} {'prep s':>10} "
+          f"{'prep MB':>10} {'query KB':>10}")
+    for algorithm in args.algorithm:
+        if algorithm in GRID_ONLY and not isinstance(problem, GridMap):
+            print(f"{algorithm:<14} (grids only)")
+            continue
+        if algorithm in GRAPH_ONLY and not isinstance(problem, Graph):
+            print(f"{algorithm:<14} (graphs only)")
+            continue
+        for heuristic in heuristics:
+            print_row(run_benchmark(problem, queries, optimal, algorithm, heuristic, args.tie_break))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
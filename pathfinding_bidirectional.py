@@ -0,0 +1,130 @@
+"""
+Bidirectional A* (and bidirectional Dijkstra) on pathfinding.py maps.
+
+Two searches grow at once, one from the start and one from the goal, and the
+path is joined where they meet. On road-like graphs each search only has to
+cover about half the distance, so together they explore far less than one
+search covering all of it.
+
+Stopping is the subtle part: the first node both searches reach is not always
+on the shortest path. Both searches use the "average potential" of Ikeda et
+al. and Goldberg & Harrelson:
+    forward key  = g_forward(v)  + (h(v, goal) - h(v, start)) / 2
+    backward key = g_backward(v) + (h(v, start) - h(v, goal)) / 2
+Both are consistent whenever h is, and the search can stop as soon as the
+smallest forward key plus the smallest backward key reaches the cost of the
+best path joined so far: no path through the unexplored part can be
+shorter. With the zero heuristic this is bidirectional Dijkstra.
+
+Maps must be undirected (GridMap and Graph are), since the backward search
+follows the same neighbors.
+"""
+import heapq
+import math
+from types import MappingProxyType
+
+from pathfinding import SearchResult, build_path, finish
+
+FORWARD = 0
+BACKWARD = 1
+
+
+def bidirectional_steps(problem, start, goal, heuristic=None, tie_break=False, log=None):
+    """
+    Run bidirectional A* from start to goal on a map as a generator.
+    Yields (current, open_nodes, closed, g) each time a node is taken from either open list, where
+    open_nodes, closed and g are pairs (forward, backward) of the live views astar_steps yields, and
+    current is in the forward or backward closed set depending on which search took it.
+    Returns (as StopIteration.value) a SearchResult; finish() collects it.
+    """
+    if heuristic is None:
+        heuristic = problem.default_heuristic
+    position = problem.position
+    neighbors = problem.neighbors
+    start_pos = position(start)
+    goal_pos = position(goal)
+
+    def potential(node, side):
+        """The average potential of a node for one search (the other search's is its negative)."""
+        pos = position(node)
+        value = (heuristic(pos, goal_pos) - heuristic(pos, start_pos)) / 2
+        return value if side == FORWARD else -value
+
+    g = ({start: 0}, {goal: 0})
+    parent = ({start: None}, {goal: None})
+    open_nodes = ({}, {})  # Node -> key for each node in each open list
+    closed = (set(), set())
+    open_lists = ([], [])  # Heaps of (key, tie, count, node), with stale entries skipped when popped
+    views = tuple(MappingProxyType(nodes) for nodes in open_nodes), closed, tuple(MappingProxyType(d) for d in g)
+    count = 0
+    expanded = 0
+    best_cost = math.inf  # Cost of the best path joined so far
+    meeting = None  # (forward node, backward node) joined by that path
+    if start == goal:
+        best_cost, meeting = 0, (start, goal)
+
+    for side, node in ((FORWARD, start), (BACKWARD, goal)):
+        open_nodes[side][node] = potential(node, side)
+        heapq.heappush(open_lists[side], (open_nodes[side][node], 0, 0, node))
+    if log:
+        log(f"Starting bidirectional search from {start} and {goal}")
+
+    while True:
+        # Drop stale entries from the tops of the heaps
+        for side in (FORWARD, BACKWARD):
+            heap = open_lists[side]
+            while heap and (heap[0][3] in closed[side] or heap[0][0] > open_nodes[side][heap[0][3]]):
+                heapq.heappop(heap)
+        if not open_lists[FORWARD] or not open_lists[BACKWARD]:
+            break
+        top_forward = open_lists[FORWARD][0][0]
+        top_backward = open_lists[BACKWARD][0][0]
+        if top_forward + top_backward >= best_cost:
+            if log:
+                log(f"Stopping: smallest keys {top_forward} + {top_backward} >= best path cost {best_cost}")
+            break
+
+        side = FORWARD if top_forward <= top_backward else BACKWARD
+        other = 1 - side
+        key, _, _, current = heapq.heappop(open_lists[side])
+        del open_nodes[side][current]
+        closed[side].add(current)
+        expanded += 1
+        if log:
+            direction = "forward" if side == FORWARD else "backward"
+            log(f"Processing node {current} {direction} (key={key}, g={g[side][current]})")
+        yield (current,) + views
+
+        current_g = g[side][current]
+        other_g = g[other]
+        for neighbor, cost in neighbors(current):
+            new_g = current_g + cost
+            # A path through this edge joins the two searches
+            if neighbor in other_g and new_g + other_g[neighbor] < best_cost:
+                best_cost = new_g + other_g[neighbor]
+                meeting = (current, neighbor) if side == FORWARD else (neighbor, current)
+                if log:
+                    log(f"Searches meet between {current} and {neighbor}: path cost {best_cost}")
+            if neighbor in closed[side] or new_g >= g[side].get(neighbor, math.inf):
+                continue
+            g[side][neighbor] = new_g
+            parent[side][neighbor] = current
+            key = new_g + potential(neighbor, side)
+            open_nodes[side][neighbor] = key
+            count += 1
+            heapq.heappush(open_lists[side], (key, -new_g if tie_break else 0, count, neighbor))
+
+    if meeting is None:
+        if log:
+            log("No path found")
+        return SearchResult(None, math.inf, expanded)
+    path = build_path(parent[FORWARD], meeting[0])
+    path += build_path(parent[BACKWARD], meeting[1])[::-1][1 if meeting[0] == meeting[1] else 0:]
+    if log:
+        log(f"Path found through {meeting[0]} and {meeting[1]} with cost {best_cost}")
+    return SearchResult(path, best_cost, expanded)
+
+
+def bidirectional(problem, start, goal, heuristic=None, tie_break=False):
+    """Return the SearchResult of a bidirectional A* search (bidirectional Dijkstra with the zero heuristic)."""
+    return finish(bidirectional_steps(problem, start, goal, heuristic, tie_break))
@@ -0,0 +1,313 @@
+"""
+Contraction hierarchies (CH) on pathfinding.Graph, for many shortest-path
+queries on a large graph that does not change.
+
+Preprocessing puts the nodes in order of importance and "contracts" them one
+at a time, least important first. Contracting a node removes it from the
+graph, adding a shortcut edge between two of its neighbors wherever the path
+through it was the only shortest path between them (a short "witness" search
+looks for another). Each shortcut remembers the node it skips, so it can be
+unpacked into the original edges.
+
+A node's importance is twice its edge difference (shortcuts added minus
+edges removed) plus the number of its neighbors already contracted, which
+keeps the contraction spread evenly over the graph. Importances change as the graph
+shrinks, so they are updated lazily: a node taken from the queue has its
+importance computed again and goes back if it is no longer the smallest.
+
+A query runs Dijkstra's algorithm from the start and from the goal, each
+following only edges (and shortcuts) to more important nodes, and the
+shortest path is the best meeting point of the two. Both searches stay near
+the top of the hierarchy, so a query settles a few hundred nodes however big
+the graph is. Nodes reached more cheaply from above are "stalled" and not
+expanded further.
+
+The hierarchy is kept in flat arrays (the upward edges of each node in
+turn), which save() writes to a compact binary file and load() reads back
+for the same graph. The file holds a fingerprint of the graph's edges and
+costs, so a file made for another graph is refused rather than answering
+with edges that are not there.
+"""
+import hashlib
+import heapq
+import math
+import os
+import struct
+import sys
+from array import array
+from weakref import WeakKeyDictionary
+
+from pathfinding import SearchResult
+
+WITNESS_SETTLE_LIMIT = 60  # Nodes a witness search may settle before giving up (and adding the shortcut)
+FILE_MAGIC = b"PFCH"
+FILE_VERSION = 2
+FILE_HEADER = struct.Struct("<4sIII16s")  # Magic, file version, node count, upward edge count, graph fingerprint
+EDGE_RECORD = struct.Struct("<IId")  # Node numbers and cost of an edge, as hashed by graph_fingerprint
+
+
+class StaleHierarchyError(ValueError):
+    """Raised by load() when a file is a hierarchy for a different graph."""
+    pass
+
+
+def graph_fingerprint(graph, index):
+    """
+    Return a 16-byte digest of a Graph's node count and its edges (their node numbers, from index,
+    and costs), which changes whenever the graph does in a way that matters to a hierarchy.
+    """
+    digest = hashlib.blake2b(struct.pack("<I", len(index)), digest_size=16)
+    records = sorted((min(index[edge.node1], index[edge.node2]), max(index[edge.node1], index[edge.node2]),
+                      edge.cost) for edge in graph.edges)
+    for record in records:
+        digest.update(EDGE_RECORD.pack(*record))
+    return digest.digest()
+
+
+class ContractionHierarchy:
+    """
+    A contraction hierarchy for a Graph, built with build() or read with load().
+    nodes lists the graph's nodes (their index is their number in the arrays) and rank gives each node's
+    place in the contraction order. The upward edges of node number v are entries first[v] up to
+    first[v + 1] of target, cost and middle, where middle is the node a shortcut skips, or -1 for an
+    original edge.
+    """
+
+    def __init__(self, nodes, rank, first, target, cost, middle, fingerprint, version=None):
+        self.nodes = nodes
+        self.index = {node: number for number, node in enumerate(nodes)}
+        self.fingerprint = fingerprint  # graph_fingerprint of the graph it was built for
+        self.rank = rank
+        self.first = first
+        self.target = target
+        self.cost = cost
+        self.middle = middle
+        self.version = version  # Graph.version the hierarchy was made for
+
+    # --------------------------
+    # Preprocessing
+    # --------------------------
+    @classmethod
+    def build(cls, graph, witness_limit=WITNESS_SETTLE_LIMIT):
+        """Contract every node of a Graph and return the hierarchy."""
+        nodes = list(graph.positions)
+        index = {node: number for number, node in enumerate(nodes)}
+        # The remaining graph: node number -> {neighbor number: (cost, middle)}
+        remaining = [{} for _ in nodes]
+        for edge in graph.edges:
+            u, w = index[edge.node1], index[edge.node2]
+            if u != w and edge.cost < remaining[u].get(w, (math.inf,))[0]:
+                remaining[u][w] = remaining[w][u] = (edge.cost, -1)
+
+        contracted_neighbors = [0] * len(nodes)
+        queue = [(2 * cls.shortcuts_needed(remaining, v, witness_limit)[1], v) for v in range(len(nodes))]
+        heapq.heapify(queue)
+        rank = array("i", [0] * len(nodes))
+        up = [None] * len(nodes)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            shortcuts, edge_difference = cls.shortcuts_needed(remaining, v, witness_limit)
+            importance = 2 * edge_difference + contracted_neighbors[v]
+            if queue and importance > queue[0][0]:
+                heapq.heappush(queue, (importance, v))  # No longer the least important: try again later
+                continue
+            rank[v] = order
+            order += 1
+            # Contract v: its remaining edges all lead to more important nodes
+            up[v] = remaining[v]
+            for neighbor in remaining[v]:
+                del remaining[neighbor][v]
+                contracted_neighbors[neighbor] += 1
+            for u, w, shortcut_cost in shortcuts:
+                if shortcut_cost < remaining[u].get(w, (math.inf,))[0]:
+                    remaining[u][w] = remaining[w][u] = (shortcut_cost, v)
+            remaining[v] = None
+
+        first = array("i", [0])
+        target = array("i")
+        cost = array("d")
+        middle = array("i")
+        for v in range(len(nodes)):
+            for w, (edge_cost, skipped) in up[v].items():
+                target.append(w)
+                cost.append(edge_cost)
+                middle.append(skipped)
+            first.append(len(target))
+        return cls(nodes, rank, first, target, cost, middle, graph_fingerprint(graph, index), graph.version)
+
+    @staticmethod
+    def shortcuts_needed(remaining, v, witness_limit):
+        """
+        Return (shortcuts, edge difference) for contracting node v now, where shortcuts is a list of
+        (u, w, cost) for each pair of neighbors with no witness path as short as the path through v.
+        """
+        neighbors = remaining[v]
+        shortcuts = []
+        others = list(neighbors.items())
+        for i, (u, (cost_u, _)) in enumerate(others):
+            targets = {w: cost_u + cost_w for w, (cost_w, _) in others[i + 1:]}
+            if not targets:
+                continue
+            # Dijkstra from u, not through v, until every target is settled or further than the path through v
+            limit = max(targets.values())
+            unsettled = set(targets)
+            distances = {u: 0}
+            heap = [(0, u)]
+            settled = 0
+            while heap and unsettled and settled < witness_limit:
+                distance, node = heapq.heappop(heap)
+                if distance > distances[node]:
+                    continue
+                settled += 1
+                unsettled.discard(node)
+                for neighbor, (edge_cost, _) in remaining[node].items():
+                    new_distance = distance + edge_cost
+                    if new_distance <= limit and neighbor != v and new_distance < distances.get(neighbor, math.inf):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(heap, (new_distance, neighbor))
+            for w, through_v in targets.items():
+                if distances.get(w, math.inf) > through_v:
+                    shortcuts.append((u, w, through_v))
+        return shortcuts, len(shortcuts) - len(neighbors)
+
+    # --------------------------
+    # Files
+    # --------------------------
+    def save(self, path):
+        """Write the hierarchy (without the nodes themselves) to a binary file."""
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, len(self.nodes), len(self.target), self.fingerprint))
+            for values in (self.rank, self.first, self.target, self.cost, self.middle):
+                if sys.byteorder == "big":
+                    values = array(values.typecode, values)
+                    values.byteswap()  # The file is little-endian
+                values.tofile(f)
+
+    @classmethod
+    def load(cls, path, graph):
+        """
+        Read a hierarchy saved by save() for a Graph with the same nodes (added in the same order), edges
+        and costs. Raises ValueError if the file is not a hierarchy, or StaleHierarchyError if it was
+        made for a different graph.
+        """
+        nodes = list(graph.positions)
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size:
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            magic, file_version, node_count, edge_count, fingerprint = FILE_HEADER.unpack(header)
+            if magic != FILE_MAGIC or file_version != FILE_VERSION:
+                raise ValueError(f"{path} is not a contraction hierarchy file")
+            if fingerprint != graph_fingerprint(graph, {node: number for number, node in enumerate(nodes)}):
+                raise StaleHierarchyError(f"{path} is a contraction hierarchy for a different graph")
+            arrays = []
+            for typecode, length in (("i", node_count), ("i", node_count + 1), ("i", edge_count),
+                                     ("d", edge_count), ("i", edge_count)):
+                values = array(typecode)
+                values.fromfile(f, length)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                arrays.append(values)
+        return cls(nodes, *arrays, fingerprint, version=graph.version)
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def query(self, start, goal):
+        """Return the SearchResult for the shortest path from start to goal."""
+        first, target, cost = self.first, self.target, self.cost
+        source, sink = self.index[start], self.index[goal]
+        distances = ({source: 0}, {sink: 0})
+        parent = ({source: None}, {sink: None})  # Node number -> (previous node number, edge number)
+        heaps = ([(0, source)], [(0, sink)])
+        settled = (set(), set())
+        best_cost = 0 if source == sink else math.inf
+        meeting = source if source == sink else None
+        expanded = 0
+
+        while heaps[0] or heaps[1]:
+            # Take the side whose next node is nearer; a side is done once that reaches the best cost
+            side = 0 if not heaps[1] or (heaps[0] and heaps[0][0][0] <= heaps[1][0][0]) else 1
+            distance, v = heapq.heappop(heaps[side])
+            if distance >= best_cost:
+                heaps[side].clear()
+                continue
+            if v in settled[side] or distance > distances[side][v]:
+                continue
+            settled[side].add(v)
+            expanded += 1
+            reached = distances[side]
+            other = distances[1 - side]
+            if v in other and distance + other[v] < best_cost:
+                best_cost = distance + other[v]
+                meeting = v
+            # Stall v if a more important node reaches it more cheaply: no shortest path goes up through it
+            if any(target[i] in reached and reached[target[i]] + cost[i] < distance
+                   for i in range(first[v], first[v + 1])):
+                continue
+            for i in range(first[v], first[v + 1]):
+                w = target[i]
+                new_distance = distance + cost[i]
+                if new_distance < reached.get(w, math.inf):
+                    reached[w] = new_distance
+                    parent[side][w] = (v, i)
+                    heapq.heappush(heaps[side], (new_distance, w))
+
+        if meeting is None:
+            return SearchResult(None, math.inf, expanded)
+        path = self.unpack_path(parent[0], meeting)
+        path += self.unpack_path(parent[1], meeting)[::-1][1:]
+        return SearchResult([self.nodes[v] for v in path], best_cost, expanded)
+
+    def unpack_path(self, parent, node):
+        """Follow one search's parent links back from node and return its path in original edges."""
+        path = [node]
+        while parent[node] is not None:
+            previous, edge = parent[node]
+            path.extend(self.unpack_edge(node, previous, edge)[1:])
+            node = previous
+        return path[::-1]
+
+    def unpack_edge(self, u, w, edge):
+        """Return the nodes from u to w along edge (u or w's upward edge to the other), shortcuts unpacked."""
+        skipped = self.middle[edge]
+        if skipped == -1:
+            return [u, w]
+        # Both halves of a shortcut are upward edges of the node it skips
+        first, target = self.first, self.target
+        halves = {target[i]: i for i in range(first[skipped], first[skipped + 1]) if target[i] in (u, w)}
+        return self.unpack_edge(u, skipped, halves[u])[:-1] + self.unpack_edge(skipped, w, halves[w])
+
+
+_hierarchies = WeakKeyDictionary()  # Graph -> ContractionHierarchy
+
+
+def contraction_hierarchy(graph, path=None):
+    """
+    Return the ContractionHierarchy for a Graph, building it again if the graph has changed since.
+    If path is given, a hierarchy that needs building is read from that file if it exists and was
+    made for this graph, or else built and saved there.
+    """
+    hierarchy = _hierarchies.get(graph)
+    if hierarchy is None or hierarchy.version != graph.version:
+        hierarchy = None
+        if path is not None and os.path.exists(path):
+            try:
+                hierarchy = ContractionHierarchy.load(path, graph)
+            except StaleHierarchyError:
+                pass  # Made for another graph: build it again and replace the file
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.build(graph)
+            if path is not None:
+                hierarchy.save(path)
+        _hierarchies[graph] = hierarchy
+    return hierarchy
+
+
+def ch(graph, start, goal, heuristic=None, tie_break=False):
+    """
+    Return the SearchResult of a contraction hierarchy query, building the hierarchy first if the graph
+    has no up-to-date one. The heuristic and tie_break are ignored (for the same signature as astar).
+    """
+    return contraction_hierarchy(graph).query(start, goal)
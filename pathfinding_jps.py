@@ -0,0 +1,244 @@
+"""
+Jump Point Search (JPS) on pathfinding.GridMap grids, 4- or 8-connected.
+
+On a uniform-cost grid many paths have the same cost and differ only in the
+order of their moves. JPS keeps going in a straight line (or diagonal) until
+it reaches a "jump point": the goal, or a cell next to a wall where a path
+could turn that no other equally short path could take. Only jump points go
+on the open list, so an open area that A* would fill cell by cell is crossed
+in a single step. The paths cost the same as A*'s.
+
+The moves follow GridMap's rules: diagonal moves (if allowed) cost sqrt(2) and
+may not cut the corner of a wall. The pruning rules are those for that kind of
+grid (Harabor and Grastien's rules adapted to no corner cutting, and the
+"never move diagonally" variant for 4-connected grids).
+
+jps_steps yields the same states as pathfinding.astar_steps, with jump points
+as the nodes, so astarfun.py can draw them.
+
+Straight jumps use tables of each row's and column's walls and forced
+neighbors (built once per GridMap, so change the grid only between searches),
+which replace a cell-by-cell walk with binary searches.
+"""
+from bisect import bisect_left, bisect_right
+from weakref import WeakKeyDictionary
+
+from pathfinding import GridMap, SQRT2, ORTHOGONAL_MOVES, DIAGONAL_MOVES, SearchResult, astar_steps, finish
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+class JumpPointGrid:
+    """A GridMap seen as a map whose moves are jumps between jump points, for one goal."""
+
+    def __init__(self, grid_map, goal):
+        self.grid_map = grid_map
+        self.goal = goal
+        self.passable = grid_map.passable
+        self.diagonal = grid_map.diagonal
+        self.default_heuristic = grid_map.default_heuristic
+        self.tables = jump_tables(grid_map)
+
+    def position(self, pos):
+        return pos
+
+    def neighbors(self, pos):
+        return self.successors(pos, None)
+
+    def successors(self, pos, parent):
+        """Return a list of (jump point, cost) reachable from pos, given the node it was reached from."""
+        x, y = pos
+        result = []
+        for dx, dy in self.directions(pos, parent):
+            point = self.jump(x, y, dx, dy)
+            if point is not None:
+                distance_x = abs(point[0] - x)
+                distance_y = abs(point[1] - y)
+                # Each jump is a straight or a diagonal line
+                cost = distance_x * SQRT2 if distance_x and distance_y else distance_x + distance_y
+                result.append((point, cost))
+        return result
+
+    def directions(self, pos, parent):
+        """Return the directions worth searching from pos: all of them at the start, otherwise the
+        natural directions of travel plus any forced by walls."""
+        x, y = pos
+        passable = self.passable
+        if parent is None:
+            directions = [move for move in ORTHOGONAL_MOVES if passable(x + move[0], y + move[1])]
+            if self.diagonal:
+                directions += [(dx, dy) for dx, dy in DIAGONAL_MOVES
+                               if passable(x + dx, y) and passable(x, y + dy) and passable(x + dx, y + dy)]
+            return directions
+
+        dx = sign(x - parent[0])
+        dy = sign(y - parent[1])
+        if not self.diagonal:
+            # Turning left or right may always be needed: a vertical jump stops wherever a horizontal one would
+            if dx:
+                return [(dx, 0), (0, -1), (0, 1)]
+            return [(0, dy), (-1, 0), (1, 0)]
+
+        directions = []
+        if dx and dy:
+            if passable(x, y + dy):
+                directions.append((0, dy))
+            if passable(x + dx, y):
+                directions.append((dx, 0))
+            if passable(x, y + dy) and passable(x + dx, y):
+                directions.append((dx, dy))
+        elif dx:
+            ahead = passable(x + dx, y)
+            for side in (-1, 1):
+                if passable(x, y + side):
+                    directions.append((0, side))
+                    if ahead:
+                        directions.append((dx, side))
+            if ahead:
+                directions.append((dx, 0))
+        else:
+            ahead = passable(x, y + dy)
+            for side in (-1, 1):
+                if passable(x + side, y):
+                    directions.append((side, 0))
+                    if ahead:
+                        directions.append((side, dy))
+            if ahead:
+                directions.append((0, dy))
+        return directions
+
+    def jump(self, x, y, dx, dy):
+        """Return the first jump point from (x, y) in direction (dx, dy), or None if there is none."""
+        if not (dx and dy):
+            return self.jump_straight(x, y, dx, dy)
+        passable = self.passable
+        goal = self.goal
+        while passable(x + dx, y) and passable(x, y + dy):
+            x += dx
+            y += dy
+            if not passable(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            # A diagonal jump stops where either of its straight parts would find a jump point
+            if self.jump_straight(x, y, dx, 0) is not None or self.jump_straight(x, y, 0, dy) is not None:
+                return (x, y)
+        return None
+
+    def jump_straight(self, x, y, dx, dy):
+        """Return the first jump point from (x, y) going straight in direction (dx, dy), or None."""
+        tables = self.tables
+        goal = self.goal
+        if dx:
+            walls, turns, along, step = tables.row_walls[y], tables.row_turns[dx][y], x, dx
+            goal_along = goal[0] if goal[1] == y else None
+        else:
+            walls, turns, along, step = tables.column_walls[x], tables.column_turns[dy][x], y, dy
+            goal_along = goal[1] if goal[0] == x else None
+
+        # The first wall, forced neighbor and goal ahead; a forced neighbor is a wall behind us to one
+        # side with open space beside us, so a path turning there could not have turned earlier
+        if step > 0:
+            wall = walls[bisect_right(walls, along)]
+            index = bisect_right(turns, along)
+            stop = min(turns[index], wall) if index < len(turns) else wall
+            if goal_along is not None and along < goal_along < stop:
+                stop = goal_along
+        else:
+            wall = walls[bisect_left(walls, along) - 1]
+            index = bisect_left(turns, along)
+            stop = max(turns[index - 1], wall) if index else wall
+            if goal_along is not None and stop < goal_along < along:
+                stop = goal_along
+
+        if dy and not self.diagonal:
+            # Without diagonal moves, a vertical jump must stop where a horizontal one would find a jump point
+            for cell in range(along + step, stop if stop != wall else wall, step):
+                if self.jump_straight(x, cell, 1, 0) is not None or self.jump_straight(x, cell, -1, 0) is not None:
+                    return (x, cell)
+        if stop == wall:
+            return None
+        return (stop, y) if dx else (x, stop)
+
+
+class JumpTables:
+    """
+    The walls and forced-neighbor cells of every row and column of a GridMap as sorted lists, so a
+    straight jump is a few binary searches instead of a walk along the cells.
+    Walls include the edges of the grid (-1 and the width or height).
+    """
+
+    def __init__(self, grid_map):
+        width, height = grid_map.width, grid_map.height
+        rows = [[value != 1 for value in row] for row in grid_map.grid]
+        columns = [list(column) for column in zip(*rows)]
+        self.row_walls, self.row_turns = self.line_tables(rows, width)
+        self.column_walls, self.column_turns = self.line_tables(columns, height)
+
+    @staticmethod
+    def line_tables(lines, length):
+        """Return (walls, {1: forward turns, -1: backward turns}) lists for each of a list of lines."""
+        blocked = [False] * length
+        walls = []
+        turns = {1: [], -1: []}
+        for index, line in enumerate(lines):
+            walls.append([-1] + [cell for cell in range(length) if not line[cell]] + [length])
+            forward = set()
+            backward = set()
+            for side in (lines[index - 1] if index > 0 else blocked,
+                         lines[index + 1] if index + 1 < len(lines) else blocked):
+                for cell in range(length):
+                    if side[cell]:
+                        if cell == 0 or not side[cell - 1]:
+                            forward.add(cell)
+                        if cell == length - 1 or not side[cell + 1]:
+                            backward.add(cell)
+            turns[1].append(sorted(forward))
+            turns[-1].append(sorted(backward))
+        return walls, turns
+
+
+_tables = WeakKeyDictionary()  # GridMap -> JumpTables
+
+
+def jump_tables(grid_map):
+    """Return the JumpTables for a GridMap, building them the first time."""
+    tables = _tables.get(grid_map)
+    if tables is None:
+        tables = _tables[grid_map] = JumpTables(grid_map)
+    return tables
+
+
+def expand_path(points):
+    """Return the full cell-by-cell path through a list of jump points."""
+    path = points[:1]
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        dx = sign(x2 - x1)
+        dy = sign(y2 - y1)
+        x, y = x1, y1
+        while (x, y) != (x2, y2):
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+
+def jps_steps(grid_map, start, goal, heuristic=None, tie_break=False, log=None):
+    """
+    Run Jump Point Search on a GridMap as a generator, with the same yields as pathfinding.astar_steps
+    but with jump points as the nodes. The SearchResult path is the jump points, in order;
+    expand_path turns it into cells.
+    """
+    return astar_steps(JumpPointGrid(grid_map, goal), start, goal, heuristic, tie_break, log)
+
+
+def jps(grid_map, start, goal, heuristic=None, tie_break=False):
+    """Return the SearchResult of Jump Point Search, with the path given cell by cell like astar's."""
+    if not isinstance(grid_map, GridMap):
+        raise TypeError("Jump Point Search only works on a GridMap")
+    result = finish(jps_steps(grid_map, start, goal, heuristic, tie_break))
+    if result.path is None:
+        return result
+    return SearchResult(expand_path(result.path), result.cost, result.expanded)
@@ -0,0 +1,162 @@
+"""
+Lifelong Planning A* (LPA*) on pathfinding.Graph, for a path that stays up to
+date while the graph is edited.
+
+A* starts from nothing every time. LPA* keeps its g-costs between searches,
+together with rhs, the one-step lookahead cost of each node:
+    rhs(start) = 0,  rhs(v) = min over neighbors u of g(u) + cost(u, v)
+A node whose g and rhs differ is "inconsistent" and waits in the priority
+queue. An edit only makes the nodes next to it inconsistent, so the next
+search repairs just the region whose costs changed.
+
+Tell the planner about every edit after making it in the graph:
+    edge_changed(node1, node2)   an edge was added, removed or given a new cost
+    node_moved(node)             a node has a new position (and its edges may have new costs)
+    node_removed(node, neighbors)  a node and its edges were removed
+then call compute() for the new path.
+
+Moving the goal changes the heuristic of every node. Like D* Lite, the planner
+adds the distance the goal moved to km, a term in every key, so the keys
+already queued stay lower bounds and are corrected one at a time as they come
+off the queue. This needs a heuristic that obeys the triangle inequality
+(Manhattan and Euclidean distance do).
+"""
+import heapq
+import math
+from types import MappingProxyType
+
+from pathfinding import SearchResult, finish
+
+
+class LPAStar:
+    """An LPA* planner for one start and goal on a Graph."""
+
+    def __init__(self, graph, start, goal, heuristic=None):
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic if heuristic is not None else graph.default_heuristic
+        self.goal_pos = graph.position(goal)
+        self.km = 0  # Total distance the goal has moved
+        self.g = {}
+        self.rhs = {start: 0}
+        self.queue = []  # Heap of (key, count, node); entries whose key is no longer queued[node] are stale
+        self.queued = {}  # Node -> key for each inconsistent node
+        self.count = 0
+        self.changed = set()  # Nodes whose g changed in the last compute
+        self.push(start)
+
+    def key(self, node):
+        best = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        return (best + self.heuristic(self.graph.position(node), self.goal_pos) + self.km, best)
+
+    def push(self, node):
+        key = self.key(node)
+        self.queued[node] = key
+        self.count += 1
+        heapq.heappush(self.queue, (key, self.count, node))
+
+    def top(self):
+        """Return the smallest valid queue entry, or None if the queue is empty."""
+        queue = self.queue
+        while queue and self.queued.get(queue[0][2]) != queue[0][0]:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def update_vertex(self, node):
+        """Recompute rhs for a node and queue it if it is inconsistent."""
+        if node != self.start:
+            g = self.g
+            self.rhs[node] = min((g.get(neighbor, math.inf) + edge.cost
+                                  for neighbor, edge in self.graph.adjacency[node].items()), default=math.inf)
+        self.queued.pop(node, None)
+        if self.g.get(node, math.inf) != self.rhs.get(node, math.inf):
+            self.push(node)
+
+    # --------------------------
+    # Edits
+    # --------------------------
+    def edge_changed(self, node1, node2):
+        """Call after adding or removing the edge between two nodes, or changing its cost."""
+        for node in (node1, node2):
+            if node in self.graph.adjacency:
+                self.update_vertex(node)
+
+    def node_moved(self, node):
+        """Call after moving a node (and updating the costs of its edges)."""
+        if node == self.goal:
+            new_pos = self.graph.position(node)
+            self.km += self.heuristic(self.goal_pos, new_pos)
+            self.goal_pos = new_pos
+        self.update_vertex(node)
+        for neighbor in self.graph.adjacency[node]:
+            self.update_vertex(neighbor)
+
+    def node_removed(self, node, neighbors):
+        """Call after removing a node (not the start or goal) and its edges; neighbors were its neighbors."""
+        self.g.pop(node, None)
+        self.rhs.pop(node, None)
+        self.queued.pop(node, None)
+        for neighbor in neighbors:
+            self.update_vertex(neighbor)
+
+    # --------------------------
+    # Search
+    # --------------------------
+    def compute_steps(self, log=None):
+        """
+        Repair the shortest path as a generator, yielding (current, queued) each time a node is
+        taken from the queue, where queued is a live read-only view of the inconsistent nodes.
+        Returns (as StopIteration.value) a SearchResult counting the nodes expanded by this repair.
+        """
+        g, rhs, goal = self.g, self.rhs, self.goal
+        queued_view = MappingProxyType(self.queued)
+        expanded = 0
+        self.changed = set()
+        while True:
+            top = self.top()
+            if top is None or (top[0] >= self.key(goal) and rhs.get(goal, math.inf) == g.get(goal, math.inf)):
+                break
+            old_key, _, node = heapq.heappop(self.queue)
+            del self.queued[node]
+            new_key = self.key(node)
+            if old_key < new_key:
+                self.push(node)  # The key was out of date (the goal moved): queue it again
+                continue
+            expanded += 1
+            self.changed.add(node)
+            if g.get(node, math.inf) > rhs[node]:
+                g[node] = rhs[node]  # Cheaper than before: settle it
+                if log:
+                    log(f"Node {node} settled at g = {g[node]}")
+            else:
+                g[node] = math.inf  # Dearer than before: reopen it and everything that relied on it
+                self.update_vertex(node)
+                if log:
+                    log(f"Node {node} got dearer (rhs = {rhs[node]}): reopening it")
+            for neighbor in self.graph.adjacency[node]:
+                self.update_vertex(neighbor)
+            yield (node, queued_view)
+        return SearchResult(self.path(), g.get(goal, math.inf), expanded)
+
+    def compute(self):
+        """Repair the shortest path and return its SearchResult."""
+        return finish(self.compute_steps())
+
+    def path(self):
+        """Return the current shortest path from start to goal, or None if there is none."""
+        g = self.g
+        if g.get(self.goal, math.inf) == math.inf:
+            return None
+        path = [self.goal]
+        seen = {self.goal}
+        node = self.goal
+        while node != self.start:
+            # Step back to the neighbor the node's cost came through
+            node = min(self.graph.adjacency[node].items(),
+                       key=lambda item: g.get(item[0], math.inf) + item[1].cost)[0]
+            if node in seen:
+                return None  # Only possible with zero-cost cycles
+            seen.add(node)
+            path.append(node)
+        return path[::-1]
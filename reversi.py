@@ -3,6 +3,13 @@
 import random
 import sys
 
+from reversi_engine import getNewBoard, resetBoard, getBoardCopy, getTile, isOnBoard, isOnCorner, \
+    isValidMove, getValidMoves, getBoardWithValidMoves, getScoreOfBoard, makeMove
+from reversi_ai import getSearchMove
+
+# Seconds the computer may think per move on hard difficulty, unless the player picks another budget.
+HARD_TIME_LIMIT = 2.0
+
 def drawBoard(board):
     # This function prints out the board that it was passed. Returns None.
     HLINE = '  +---+---+---+---+---+---+---+---+'
@@ -14,118 +21,12 @@ def drawBoard(board):
             print VLINE
             print y+1,
             for x in range(8):
-                print '| %s' % (board[x][y]),
+                print '| %s' % (getTile(board, x, y)),
             print '|'
             print VLINE
             print HLINE
 
 
-def resetBoard(board):
-    # Blanks out the board it is passed, except for the orginal starting position.
-    for x in range(8):
-        for y in range(8):
-            board[x][y] = ' '
-
-    # Starting pieces:
-    board[3][3] = 'X'
-    board[3][4] = 'O'
-    board[4][3] = 'O'
-    board[4][4] = 'X'
-
-
-def getNewBoard():
-    # Creates a brand new, blank board data structure.
-    board = []
-    for i in range(8):
-        board.append([' ']*8)
-
-    return board
-
-
-def isValidMove(board, tile, xstart, ystart):
-    # Returns False if the player's move on xstart, ystart is invalid.
-    # If it is a valid move, returns a list of spaces that would become the player's if the made a move here.
-    if board[xstart][ystart] != ' ' or not isOnBoard(xstart, ystart):
-        return False
-    
-    board[xstart][ystart] = tile #temporarily set the tile on the board.
-    
-    if tile == 'X':
-        otherTile= 'O'
-    else:
-        otherTile = 'X'
-        
-    tilesToFlip = []
-    for xdirection, ydirection in[[0, 1], [1, 1], [1, 0], [1, -1], [0, -1], [-1, -1], [-1, 0], [-1, 1]]:
-        x, y = xstart, ystart
-        x += xdirection # first step in the direction
-        y += ydirection # first step in the direction
-        if isOnBoard(x, y) and board[x][y] == otherTile:
-            # The is a piece belonging to the other player next to our piece.
-            x += xdirection
-            y += ydirection
-            if not isOnBoard(x, y):
-                continue
-            while board[x][y] == otherTile:
-                x += xdirection
-                y += ydirection
-                if not isOnBoard(x, y): #Break out of while loop, then continue in for loop
-                    break
-            if not isOnBoard(x, y):
-                continue
-            if board[x][y] == tile:
-                # There are pieces to flip over. Go in the reverse direction untill we reach the original space, noting all the tiles along the way.
-                while True:
-                    x -= xdirection
-                    y -= ydirection
-                    if x == xstart and y == ystart:
-                        break
-                    tilesToFlip.append([x, y])
-        
-    board[xstart][ystart] = ' ' # restore the empty space
-    if len(tilesToFlip) ==0: # if no tiles were flipped, this is not a valid move.
-        return False
-    return tilesToFlip
-        
-        
-def isOnBoard(x, y):
-    # Returns True if the coordinates are located on the board.
-    return x >=0 and x <= 7 and y >= 0 and y <= 7
-    
-    
-def getBoardWithValidMoves(board, tile):
-    # Returns a new board with . marking the valid moves the given player can make.
-    dupeBoard = getBoardCopy(board)
-    
-    for x, y in getValidMoves (dupeBoard, tile):
-        dupeBoard[x][y] = '.'
-    return dupeBoard
-
-
-def getValidMoves(board, tile):
-    # Returns a list of [x, y] lists of valid moves for the given player on the given board.
-    validMoves = []
-    
-    for x in range(8):
-        for y in range(8):
-            if isValidMove(board, tile, x, y) !=False:
-                validMoves.append([x, y])
-    return validMoves
-    
-    
-def getScoreOfBoard(board):
-    # Determine the score. Returns a dictionary with keys 'X' and 'O'.
-    xscore = 0
-    oscore = 0
-    for x in range(8):
-        for y in range(8):
-            if board[x][y] == 'X':
-                xscore += 1
-            if board[x][y] == 'O':
-                oscore += 1
-    return {'X':xscore, 'O':oscore}
-    
-    
 def enterPlayerTile():
     # Let the player type which tile they want to be.
     # Returns a list with the player's tile as the first item and the computer's as the second.
@@ -141,6 +42,29 @@ def enterPlayerTile():
         return ['O', 'X']
 
 
+def enterDifficulty():
+    # Let the player choose how strong the computer is.
+    # Returns None for easy, or the computer's thinking time in seconds for hard.
+    difficulty = ''
+    while not (difficulty == 'easy' or difficulty == 'hard'):
+        print 'Do you want to play on easy or hard?'
+        difficulty = raw_input().lower()
+    if difficulty == 'easy':
+        return None
+
+    print 'How many seconds may the computer think per move? (press Enter for %s)' % (HARD_TIME_LIMIT)
+    while True:
+        seconds = raw_input()
+        if seconds == '':
+            return HARD_TIME_LIMIT
+        try:
+            if float(seconds) > 0:
+                return float(seconds)
+        except ValueError:
+            pass
+        print 'Type a number of seconds, such as 0.5 or 3.'
+
+
 def whoGoesFirst():
     # Randomly choose the player who goes first.
     if random.randint(0, 1) == 0:
@@ -155,36 +79,6 @@ def playAgain():
     return raw_input().lower().startswith('y')
     
     
-def makeMove(board, tile, xstart, ystart):
-    # Place the tile on the board at xstart, ystart, and flip and of the opponent's pieces.
-    # Returns Flase if this is an invalid move, True if it is valid.
-    tilesToFlip = isValidMove(board, tile, xstart, ystart)
-    
-    if tilesToFlip == False:
-        return False
-        
-    board[xstart][ystart] = tile
-    for x, y in tilesToFlip:
-        board[x][y] = tile
-    return True
-    
-    
-def getBoardCopy(board):
-    # Make a duplicate of the board list and return the duplicate.
-    dupeBoard = getNewBoard()
-    
-    for x in range(8):
-        for y in range(8):
-            dupeBoard[x][y] = board[x][y]
-            
-    return dupeBoard
-    
-    
-def isOnCorner(x, y):
-    # Returns True if the position is in one of the four corners.
-    return (x==0 and y==0) or (x==7 and y==0) or (x==0 and y==7) or (x==7 and y==7)
-    
-    
 def getPlayerMove(board, playerTile):
     # Let the player type in their move.
     # Returns the move as [x, y] (or returns the strings 'hints' or quit)
@@ -250,6 +144,7 @@ while True:
     mainBoard = getNewBoard()
     resetBoard(mainBoard)
     playerTile, computerTile = enterPlayerTile()
+    timeLimit = enterDifficulty()
     showHints = False
     turn = whoGoesFirst()
     print 'The ' + turn + ' will fo first.'
@@ -283,7 +178,10 @@ while True:
             drawBoard(mainBoard)
             showPoints(playerTile, computerTile)
             raw_input('Press Enter to see the computer\'s move.')
-            x, y = getComputerMove(mainBoard, computerTile)
+            if timeLimit is None:
+                x, y = getComputerMove(mainBoard, computerTile)
+            else:
+                x, y = getSearchMove(mainBoard, computerTile, timeLimit)
             makeMove(mainBoard, computerTile, x, y)
             
             if getValidMoves(mainBoard, playerTile) == []:
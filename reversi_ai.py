@@ -0,0 +1,226 @@
+# Reversi Search AI
+# An alpha-beta player for the "hard" difficulty in reversi.py.
+#
+# It searches with iterative deepening until its time budget runs out, reusing
+# a transposition table between iterations so each deeper search tries the
+# previous best move first. Positions are the bitboard pairs from
+# reversi_engine.py: making a move is two XORs and undoing it is the same two
+# XORs, so no board is ever copied.
+#
+# The evaluation combines:
+#   mobility        - how many moves each side has
+#   corners         - corner discs, which can never be flipped
+#   edge stability  - edge discs in an unbroken line from an owned corner
+#   parity          - whether the side to move is due to make the last move
+# Learned pattern weights (see reversi_patterns.py) replace this evaluation
+# only when asked for, by setting the environment variable REVERSI_PATTERNS to
+# the weights file: so far they search worse than the handcrafted evaluation.
+# An opening book (see reversi_book.py) is also only used when asked for, by
+# setting REVERSI_BOOK to the book file. Its best-scoring move is then played
+# for the first BOOK_PLIES moves of the game whenever the position is in the
+# book, except by the fixed-depth 'alphabeta' strategy, which never uses it.
+#
+# With ENDGAME_EMPTIES or fewer empty squares left it stops guessing and plays
+# the exact result from the endgame solver in reversi_endgame.py, as long as
+# the solver finishes in time: the heuristic search runs first for a share of
+# the time budget, and its move is played if the solver runs out of time.
+# Works with Python 2 and Python 3.
+
+import os
+
+from reversi_engine import getMoveBits, getFlipBits, countBits, squaresOf, squareToXY, clock, CORNERS, OTHER_TILE
+from reversi_endgame import EndgameSolver, SearchTimeout, ENDGAME_EMPTIES
+from reversi_patterns import PatternEvaluator
+from reversi_book import loadBook, BOOK_PLIES
+
+MOBILITY_WEIGHT = 10
+CORNER_WEIGHT = 100
+STABILITY_WEIGHT = 30
+PARITY_WEIGHT = 20
+WIN_SCORE = 10000  # Final positions score WIN_SCORE per disc of difference
+FALLBACK_SHARE = 0.25  # Share of the time budget the heuristic search gets before an endgame solve
+
+# Squares searched first when nothing better is known: corners, then edges, then the rest.
+# The squares diagonally next to a corner (which give the corner away) come last.
+X_SQUARES = (1 << 9) | (1 << 14) | (1 << 49) | (1 << 54)
+EDGES = 0xFF818181818181FF
+
+# Each edge as a list of squares from one corner to the other.
+EDGE_LINES = [[x for x in range(8)],                # top
+              [x + 56 for x in range(8)],           # bottom
+              [8 * y for y in range(8)],            # left
+              [8 * y + 7 for y in range(8)]]        # right
+
+# The learned pattern evaluation, or None (the default) to use the handcrafted one.
+PATTERN_EVALUATOR = PatternEvaluator(os.environ['REVERSI_PATTERNS']) if os.environ.get('REVERSI_PATTERNS') else None
+# The opening book, or None (the default) to search from the first move.
+OPENING_BOOK = loadBook(os.environ['REVERSI_BOOK']) if os.environ.get('REVERSI_BOOK') else None
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def stableEdgeDiscs(player):
+    # Returns a bitboard of player's edge discs that are joined to an owned corner along the edge.
+    # Such discs can never be flipped.
+    stable = 0
+    for line in EDGE_LINES:
+        for squares in (line, line[::-1]):
+            for square in squares:
+                if not player & (1 << square):
+                    break
+                stable |= 1 << square
+    return stable
+
+
+def evaluate(player, opponent):
+    # Returns the heuristic value of the position for player, who is to move.
+    if PATTERN_EVALUATOR is not None:
+        # The patterns predict the final disc difference, so scale it like finalScore.
+        return int(WIN_SCORE * PATTERN_EVALUATOR.evaluate(player, opponent))
+    myMobility = countBits(getMoveBits(player, opponent))
+    theirMobility = countBits(getMoveBits(opponent, player))
+    corners = countBits(player & CORNERS) - countBits(opponent & CORNERS)
+    stability = countBits(stableEdgeDiscs(player)) - countBits(stableEdgeDiscs(opponent))
+    empties = 64 - countBits(player | opponent)
+    # With an odd number of empty squares the side to move expects to get the last move.
+    parity = 1 if empties % 2 == 1 else -1
+    return (MOBILITY_WEIGHT * (myMobility - theirMobility) + CORNER_WEIGHT * corners +
+            STABILITY_WEIGHT * stability + PARITY_WEIGHT * parity)
+
+
+def finalScore(player, opponent):
+    # Returns the value of a finished game for player.
+    return WIN_SCORE * (countBits(player) - countBits(opponent))
+
+
+class Searcher(object):
+    # Iterative-deepening alpha-beta search over bitboards.
+
+    def __init__(self):
+        self.table = {}  # (player, opponent) -> (depth, score, bound, best square)
+        self.nodes = 0
+        self.deadline = None
+
+    def search(self, player, opponent, timeLimit=None, maxDepth=60, endgameEmpties=ENDGAME_EMPTIES):
+        # Returns (square, score, depth) for the best move of player, searching until timeLimit seconds
+        # have passed or maxDepth is reached. Returns (None, score, 0) if player has no move.
+        # With endgameEmpties or fewer empty squares the position is solved exactly instead, if the
+        # solver finishes within timeLimit.
+        moves = getMoveBits(player, opponent)
+        if not moves:
+            return None, evaluate(player, opponent), 0
+        empties = 64 - countBits(player | opponent)
+        start = clock()
+        deadline = start + timeLimit if timeLimit is not None else None
+        if empties > endgameEmpties:
+            return self.deepen(player, opponent, moves, maxDepth, deadline)
+        self.nodes = 0
+        best = None
+        if deadline is not None:
+            # A move to fall back on if the solver cannot finish in time
+            best = self.deepen(player, opponent, moves, maxDepth, start + FALLBACK_SHARE * timeLimit)
+        solver = EndgameSolver()
+        try:
+            square, score = solver.solve(player, opponent, deadline)
+        except SearchTimeout:
+            return best
+        finally:
+            self.nodes += solver.nodes
+        return square, WIN_SCORE * score, empties
+
+    def deepen(self, player, opponent, moves, maxDepth, deadline):
+        # Iterative deepening until deadline (None for no limit) or maxDepth; returns (square, score, depth).
+        self.nodes = 0
+        self.deadline = deadline
+        empties = 64 - countBits(player | opponent)
+        best = (squaresOf(moves)[0], 0, 0)
+        for depth in range(1, min(maxDepth, empties) + 1):
+            try:
+                score = self.negamax(player, opponent, depth, -WIN_SCORE * 64 - 1, WIN_SCORE * 64 + 1, False)
+            except SearchTimeout:
+                break  # Keep the result of the last completed depth.
+            best = (self.table[(player, opponent)][3], score, depth)
+        return best
+
+    def negamax(self, player, opponent, depth, alpha, beta, passed):
+        # Alpha-beta search returning the value of the position for player, who is to move.
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 1023 == 0 and clock() > self.deadline:
+            raise SearchTimeout()
+        key = (player, opponent)
+        entry = self.table.get(key)
+        hashMove = None
+        if entry is not None:
+            hashMove = entry[3]
+            if entry[0] >= depth:
+                score, bound = entry[1], entry[2]
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score
+        moves = getMoveBits(player, opponent)
+        if not moves:
+            if passed:
+                return finalScore(player, opponent)
+            # Pass: the opponent moves from the same position without using up depth.
+            return -self.negamax(opponent, player, depth, -beta, -alpha, True)
+        if depth == 0:
+            return evaluate(player, opponent)
+
+        originalAlpha = alpha
+        bestScore = -WIN_SCORE * 64 - 1
+        bestSquare = None
+        for square in orderMoves(moves, hashMove):
+            move = 1 << square
+            flips = getFlipBits(player, opponent, square)
+            # Make the move...
+            player ^= flips | move
+            opponent ^= flips
+            score = -self.negamax(opponent, player, depth - 1, -beta, -alpha, False)
+            # ...and unmake it.
+            player ^= flips | move
+            opponent ^= flips
+            if score > bestScore:
+                bestScore = score
+                bestSquare = square
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        if bestScore <= originalAlpha:
+            bound = UPPER
+        elif bestScore >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table[key] = (depth, bestScore, bound, bestSquare)
+        return bestScore
+
+
+def orderMoves(moves, hashMove):
+    # Returns the squares of a move bitboard in search order.
+    ordered = []
+    if hashMove is not None and moves & (1 << hashMove):
+        ordered.append(hashMove)
+        moves &= ~(1 << hashMove)
+    for group in (moves & CORNERS, moves & EDGES & ~CORNERS, moves & ~EDGES & ~X_SQUARES, moves & X_SQUARES):
+        ordered.extend(squaresOf(group))
+    return ordered
+
+
+def getSearchMove(board, tile, timeLimit=2.0, maxDepth=60, endgameEmpties=ENDGAME_EMPTIES, useBook=True):
+    # Given a board and the computer's tile, search for the best move and return it as a [x, y] list.
+    # With useBook, a move from the opening book (if one was loaded) is played instead when there is one.
+    player, opponent = board.discs[tile], board.discs[OTHER_TILE[tile]]
+    if useBook and OPENING_BOOK is not None and countBits(player | opponent) - 4 < BOOK_PLIES:
+        square = OPENING_BOOK.bestMove(player, opponent)
+        if square is not None:
+            return squareToXY(square)
+    square, score, depth = Searcher().search(player, opponent, timeLimit, maxDepth, endgameEmpties)
+    return squareToXY(square)
+
+
+def getAlphaBetaMove(board, tile):
+    # A fixed-depth version of getSearchMove, so simulations are repeatable.
+    # It never calls the endgame solver, which would make it much slower than a depth-3 search,
+    # or the opening book, so building a book does not change its moves.
+    return getSearchMove(board, tile, timeLimit=None, maxDepth=3, endgameEmpties=0, useBook=False)
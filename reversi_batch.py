@@ -0,0 +1,225 @@
+# Reversi Batch Simulator
+# Advances thousands of independent Reversi games in lockstep with NumPy.
+# Each game is a pair of packed uint64 bitboards (the same layout as
+# reversi_engine.py: square (x, y) is bit x + 8 * y), and legal-move masks,
+# flips and strategy decisions are computed for the whole batch at once.
+#
+# The strategies from reversi_strategies.py are reimplemented here as batched
+# policies under the same names, so results can be compared with reversi_sim.py.
+#
+# Example:
+#   python3 reversi_batch.py random corner-side-best --games 100000 --batch-size 20000
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+FULL = np.uint64(0xFFFFFFFFFFFFFFFF)
+NOT_LEFT = np.uint64(0xFEFEFEFEFEFEFEFE)
+NOT_RIGHT = np.uint64(0x7F7F7F7F7F7F7F7F)
+DIRECTIONS = [(1, NOT_LEFT), (9, NOT_LEFT), (8, FULL), (7, NOT_RIGHT),
+              (-1, NOT_RIGHT), (-9, NOT_RIGHT), (-8, FULL), (-7, NOT_LEFT)]
+SQUARE_BITS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+START_X = np.uint64((1 << 27) | (1 << 36))
+START_O = np.uint64((1 << 35) | (1 << 28))
+
+SQUARE_X = np.arange(64) & 7
+SQUARE_Y = np.arange(64) >> 3
+IS_CORNER = ((SQUARE_X == 0) | (SQUARE_X == 7)) & ((SQUARE_Y == 0) | (SQUARE_Y == 7))
+IS_SIDE = (SQUARE_X == 0) | (SQUARE_X == 7) | (SQUARE_Y == 0) | (SQUARE_Y == 7)
+
+
+def shiftBits(bits, shift, mask):
+    # Move every disc in a bitboard array one square in a direction.
+    if shift > 0:
+        return (bits << np.uint64(shift)) & mask
+    return (bits >> np.uint64(-shift)) & mask
+
+
+def popcount(bits):
+    # Returns the number of set bits in each element of a uint64 array.
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).astype(np.int64)
+    return np.unpackbits(bits.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+def getMoveBits(player, opponent):
+    # Returns an array of legal-move bitboards, one per game.
+    empty = ~(player | opponent)
+    moves = np.zeros_like(player)
+    for shift, mask in DIRECTIONS:
+        run = shiftBits(player, shift, mask) & opponent
+        for _ in range(5):
+            run |= shiftBits(run, shift, mask) & opponent
+        moves |= shiftBits(run, shift, mask) & empty
+    return moves
+
+
+def getFlipBits(player, opponent, move):
+    # Returns the discs flipped by playing the single-bit move in each game (0 where the move is illegal).
+    flips = np.zeros_like(player)
+    for shift, mask in DIRECTIONS:
+        run = shiftBits(move, shift, mask) & opponent
+        for _ in range(5):
+            run |= shiftBits(run, shift, mask) & opponent
+        # The run only flips if the square after it holds one of the player's discs.
+        bracketed = (shiftBits(run, shift, mask) & player) != 0
+        flips |= np.where(bracketed, run, np.uint64(0))
+    return flips
+
+
+def legalSquares(moves):
+    # Returns an (N, 64) boolean array of the legal squares in each game.
+    return (moves[:, None] & SQUARE_BITS) != 0
+
+
+def flipCounts(player, opponent, legal):
+    # Returns an (N, 64) array of how many discs each legal move flips (0 for illegal squares).
+    counts = np.zeros(legal.shape, dtype=np.int64)
+    for square in range(64):
+        rows = np.nonzero(legal[:, square])[0]
+        if len(rows):
+            flips = getFlipBits(player[rows], opponent[rows], SQUARE_BITS[square])
+            counts[rows, square] = popcount(flips)
+    return counts
+
+
+# ------------------------------
+# Batched policies
+# ------------------------------
+# A policy takes (player, opponent, moves, rng) for the games where it is to move and
+# returns the chosen square for each game. Every game passed in has at least one legal move.
+# Random noise below the priority keys breaks ties uniformly, like the shuffles in the scripts.
+
+def chooseByKey(legal, key, rng):
+    # Returns the legal square with the highest key in each game, breaking ties at random.
+    noise = rng.random(legal.shape)
+    return np.argmax(np.where(legal, key * 2.0 + noise, -1.0), axis=1)
+
+
+def randomPolicy(player, opponent, moves, rng):
+    # A uniformly random legal move.
+    legal = legalSquares(moves)
+    return chooseByKey(legal, np.zeros(legal.shape), rng)
+
+
+def greedyPolicy(player, opponent, moves, rng):
+    # Corner if available, else the move that flips the most discs.
+    legal = legalSquares(moves)
+    flips = flipCounts(player, opponent, legal)
+    return chooseByKey(legal, np.where(IS_CORNER, 100, flips), rng)
+
+
+def cornerSideBestPolicy(player, opponent, moves, rng):
+    # Corner, else a side, else the greedy move.
+    legal = legalSquares(moves)
+    flips = flipCounts(player, opponent, legal)
+    return chooseByKey(legal, np.where(IS_CORNER, 200, np.where(IS_SIDE, 100, flips)), rng)
+
+
+def sideBestPolicy(player, opponent, moves, rng):
+    # A side (corners count as sides), else the move that flips the most discs.
+    legal = legalSquares(moves)
+    flips = flipCounts(player, opponent, legal)
+    return chooseByKey(legal, np.where(IS_SIDE, 100, flips), rng)
+
+
+def worstPolicy(player, opponent, moves, rng):
+    # The move that flips the fewest discs.
+    legal = legalSquares(moves)
+    flips = flipCounts(player, opponent, legal)
+    return chooseByKey(legal, 64 - flips, rng)
+
+
+def cornerWorstPolicy(player, opponent, moves, rng):
+    # Corner if available, else the move that flips the fewest discs.
+    legal = legalSquares(moves)
+    flips = flipCounts(player, opponent, legal)
+    return chooseByKey(legal, np.where(IS_CORNER, 100, 64 - flips), rng)
+
+
+BATCH_POLICIES = {
+    'random': randomPolicy,
+    'greedy': greedyPolicy,
+    'corner-side-best': cornerSideBestPolicy,
+    'side-best': sideBestPolicy,
+    'worst': worstPolicy,
+    'corner-worst': cornerWorstPolicy,
+}
+
+
+def simulateBatch(xPolicy, oPolicy, numGames, rng):
+    # Play numGames games in lockstep. Returns the final (xDiscs, oDiscs) arrays.
+    # A player with no legal move passes; a game ends when neither player can move.
+    discs = np.empty((2, numGames), dtype=np.uint64)
+    discs[0] = START_X
+    discs[1] = START_O
+    turn = rng.integers(0, 2, size=numGames)  # 0: X to move, 1: O to move
+    active = np.ones(numGames, dtype=bool)
+    policies = [xPolicy, oPolicy]
+    games = np.arange(numGames)
+    while active.any():
+        rows = games[active]
+        side = turn[rows]
+        player = discs[side, rows]
+        opponent = discs[1 - side, rows]
+        moves = getMoveBits(player, opponent)
+        stuck = moves == 0
+        if stuck.any():
+            # Pass if the opponent can move, otherwise the game is over.
+            stuckRows = rows[stuck]
+            replies = getMoveBits(opponent[stuck], player[stuck])
+            active[stuckRows[replies == 0]] = False
+            turn[stuckRows[replies != 0]] ^= 1
+        for tile in (0, 1):
+            mover = (~stuck) & (side == tile)
+            if not mover.any():
+                continue
+            moverRows = rows[mover]
+            squares = policies[tile](player[mover], opponent[mover], moves[mover], rng)
+            move = SQUARE_BITS[squares]
+            flips = getFlipBits(player[mover], opponent[mover], move)
+            discs[tile, moverRows] = player[mover] | flips | move
+            discs[1 - tile, moverRows] = opponent[mover] ^ flips
+            turn[moverRows] ^= 1
+    return discs[0], discs[1]
+
+
+def simulate(xName, oName, numGames, batchSize, seed=0):
+    # Play numGames games in batches. Returns a dictionary of X wins, O wins and ties.
+    rng = np.random.default_rng(seed)
+    counts = {'X': 0, 'O': 0, 'tie': 0}
+    for first in range(0, numGames, batchSize):
+        xDiscs, oDiscs = simulateBatch(BATCH_POLICIES[xName], BATCH_POLICIES[oName],
+                                       min(batchSize, numGames - first), rng)
+        xScore = popcount(xDiscs)
+        oScore = popcount(oDiscs)
+        counts['X'] += int((xScore > oScore).sum())
+        counts['O'] += int((xScore < oScore).sum())
+        counts['tie'] += int((xScore == oScore).sum())
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Reversi games in lockstep batches with NumPy.')
+    parser.add_argument('x', choices=sorted(BATCH_POLICIES), help='policy playing X')
+    parser.add_argument('o', choices=sorted(BATCH_POLICIES), help='policy playing O')
+    parser.add_argument('--games', type=int, default=100000, help='number of games to play (default: 100000)')
+    parser.add_argument('--batch-size', type=int, default=20000, help='games advanced together (default: 20000)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    args = parser.parse_args()
+
+    start = time.time()
+    counts = simulate(args.x, args.o, args.games, args.batch_size, args.seed)
+    seconds = max(time.time() - start, 1e-9)
+    print('%s games of X = %s vs O = %s in %.1f seconds (%.0f games/hour).'
+          % (args.games, args.x, args.o, seconds, args.games * 3600 / seconds))
+    for label, key in [('X wins', 'X'), ('O wins', 'O'), ('Ties', 'tie')]:
+        print('%-7s %8s  %6.2f%%' % (label, counts[key], 100.0 * counts[key] / max(args.games, 1)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
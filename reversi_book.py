@@ -0,0 +1,202 @@
+# Reversi Opening Book
+# Win statistics for the moves played from early positions, gathered from
+# recorded games (see reversi_records.py), so the AI can play the opening
+# from experience instead of searching.
+#
+# Positions are stored in canonical form: of the eight rotations and
+# reflections of a position, the one with the smallest (player, opponent)
+# bitboards. Symmetric positions therefore share one set of statistics, and
+# so do moves that are mirror images of each other in a symmetric position
+# (like the four opening moves).
+#
+# The book is a sorted table of fixed-size entries:
+#   player bitboard, opponent bitboard, move square   (canonical orientation)
+#   games the move was played, points (2 per win, 1 per tie) for the mover
+# OpeningBook memory-maps the file and finds a position by binary search, so
+# there is nothing to load before the first lookup.
+#
+# Example (build a book from the first 20 moves of recorded games):
+#   python3 reversi_book.py games.rvr --plies 20
+# reversi_ai.py only probes a book when the environment variable REVERSI_BOOK
+# names it, so building one changes no moves until it is asked for:
+#   REVERSI_BOOK=reversi_book.bin python reversi.py
+# Works with Python 2 and Python 3.
+
+from __future__ import print_function
+
+import mmap
+import os
+import struct
+import sys
+
+from reversi_engine import getFlipBits, START_X, START_O, SYMMETRIES
+
+DEFAULT_BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reversi_book.bin')
+MAGIC = b'RBOK'
+HEADER = struct.Struct('<4sI')  # magic, number of entries
+ENTRY = struct.Struct('<QQB3xII')  # player, opponent, square, games, points
+BOOK_PLIES = 20  # Moves stored per game when building, and probed by the AI
+BOOK_MIN_GAMES = 10  # Moves played fewer times than this are not trusted
+
+# SQUARE_MAPS[n][square] is where square goes under SYMMETRIES[n].
+SQUARE_MAPS = [[symmetry(1 << square).bit_length() - 1 for square in range(64)] for symmetry in SYMMETRIES]
+
+
+def canonicalPosition(player, opponent):
+    # Returns (player, opponent, symmetry numbers) for the canonical form of a position, listing
+    # every symmetry that turns the position into it (more than one if the position is symmetric).
+    best = None
+    numbers = []
+    for number, symmetry in enumerate(SYMMETRIES):
+        candidate = (symmetry(player), symmetry(opponent))
+        if best is None or candidate < best:
+            best = candidate
+            numbers = [number]
+        elif candidate == best:
+            numbers.append(number)
+    return best[0], best[1], numbers
+
+
+def canonicalSquare(square, numbers):
+    # Returns the canonical form of a move, given the symmetries from canonicalPosition.
+    return min(SQUARE_MAPS[number][square] for number in numbers)
+
+
+def buildBook(records, plies=BOOK_PLIES):
+    # Returns {(player, opponent, square): [games, points]} for the first plies moves of every recorded game.
+    stats = {}
+    for firstTile, moves, difference in records:
+        player, opponent = (START_X, START_O) if firstTile == 'X' else (START_O, START_X)
+        sign = 1 if firstTile == 'X' else -1  # +1 while X is to move
+        for move in moves[:plies]:
+            if move is not None:
+                square = move[0] + 8 * move[1]
+                canonicalPlayer, canonicalOpponent, numbers = canonicalPosition(player, opponent)
+                key = (canonicalPlayer, canonicalOpponent, canonicalSquare(square, numbers))
+                entry = stats.setdefault(key, [0, 0])
+                entry[0] += 1
+                result = sign * difference
+                entry[1] += 2 if result > 0 else 1 if result == 0 else 0
+                flips = getFlipBits(player, opponent, square)
+                player, opponent = player | flips | (1 << square), opponent ^ flips
+            player, opponent = opponent, player
+            sign = -sign
+    return stats
+
+
+def saveBook(path, stats, minGames=1):
+    # Writes the statistics as a sorted table, leaving out moves played fewer than minGames times.
+    keys = sorted(key for key, (games, points) in stats.items() if games >= minGames)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(keys)))
+        for key in keys:
+            games, points = stats[key]
+            f.write(ENTRY.pack(key[0], key[1], key[2], games, points))
+    return len(keys)
+
+
+class OpeningBook(object):
+    # Binary-search lookups in a memory-mapped book file.
+
+    def __init__(self, path=DEFAULT_BOOK):
+        with open(path, 'rb') as f:
+            magic, self.count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError('%s is not a Reversi opening book.' % path)
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b''
+
+    def entry(self, number):
+        # Returns (player, opponent, square, games, points) for an entry.
+        return ENTRY.unpack_from(self.data, HEADER.size + number * ENTRY.size)
+
+    def lookup(self, player, opponent):
+        # Returns a list of (square, games, points) for the moves recorded from the position.
+        # Moves that are mirror images of each other in a symmetric position share their statistics.
+        canonicalPlayer, canonicalOpponent, numbers = canonicalPosition(player, opponent)
+        key = (canonicalPlayer, canonicalOpponent)
+        # Find the first entry for the position.
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[:2] < key:
+                low = middle + 1
+            else:
+                high = middle
+        stored = {}
+        while low < self.count:
+            entryPlayer, entryOpponent, square, games, points = self.entry(low)
+            if (entryPlayer, entryOpponent) != key:
+                break
+            stored[square] = (games, points)
+            low += 1
+        moves = []
+        if stored:
+            for square in range(64):
+                canonical = canonicalSquare(square, numbers)
+                if canonical in stored:
+                    moves.append((square,) + stored[canonical])
+        return moves
+
+    def bestMove(self, player, opponent, minGames=BOOK_MIN_GAMES):
+        # Returns the square with the best score among moves played at least minGames times, or None.
+        moves = [move for move in self.lookup(player, opponent) if move[1] >= minGames]
+        if not moves:
+            return None
+        return max(moves, key=lambda move: (move[2] / (2.0 * move[1]), move[1]))[0]
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+def loadBook(path=DEFAULT_BOOK):
+    # Returns an OpeningBook for the file, or None if there is no such file.
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def main():
+    import argparse
+    import time
+    from reversi_records import GameRecords
+
+    parser = argparse.ArgumentParser(description='Build a Reversi opening book from recorded games.')
+    parser.add_argument('records', nargs='+', help='record files written by reversi_sim.py --records')
+    parser.add_argument('--output', default=DEFAULT_BOOK, help='book file (default: %(default)s)')
+    parser.add_argument('--plies', type=int, default=BOOK_PLIES,
+                        help='moves of each game to store (default: %(default)s)')
+    parser.add_argument('--min-games', type=int, default=BOOK_MIN_GAMES,
+                        help='leave out moves played fewer times than this (default: %(default)s)')
+    args = parser.parse_args()
+
+    start = time.time()
+    stats = {}
+    games = 0
+    for path in args.records:
+        records = GameRecords(path)
+        try:
+            games += len(records)
+            for key, (played, points) in buildBook(records, args.plies).items():
+                entry = stats.setdefault(key, [0, 0])
+                entry[0] += played
+                entry[1] += points
+        finally:
+            records.close()
+    count = saveBook(args.output, stats, args.min_games)
+    print('%s games gave %s moves; %s were played at least %s times and saved to %s (%s bytes) in %.1fs.'
+          % (games, len(stats), count, args.min_games, args.output, HEADER.size + count * ENTRY.size,
+             time.time() - start))
+
+    book = OpeningBook(args.output)
+    try:
+        for square, played, points in sorted(book.lookup(START_X, START_O)):
+            print('Opening move %s%s: %s games, %.1f%% score'
+                  % ((square & 7) + 1, (square >> 3) + 1, played, 50.0 * points / played))
+    finally:
+        book.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
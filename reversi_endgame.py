@@ -0,0 +1,237 @@
+# Reversi Endgame Solver
+# Plays the last empty squares perfectly by searching every line to the end of
+# the game. Scores are exact final disc differences (the side to move's discs
+# minus the opponent's), as counted by getScoreOfBoard.
+#
+# What keeps the search small:
+#   fastest-first  - with many empties, try the moves that leave the opponent the fewest replies
+#   parity         - near the end, try moves in quadrants with an odd number of empties first
+#   hash table     - transpositions reuse earlier bounds and try the stored best move first
+#   bitboards      - moves and flips come from reversi_engine's shift-and-mask kernel
+#
+# reversi_ai.py hands over to this solver once ENDGAME_EMPTIES or fewer squares
+# are empty, with a deadline: if the solve runs past it, SearchTimeout is
+# raised and the AI plays the move from its heuristic search instead.
+# Run this file with --benchmark to time the solver on a fixed set of
+# positions, or with --position to solve one position.
+# Works with Python 2 and Python 3.
+
+import sys
+
+from reversi_engine import getMoveBits, getFlipBits, countBits, squaresOf, clock
+
+# Empty squares at which the AI switches from its heuristic search to this solver.
+# Pure Python usually solves 12 empties in under a second; each extra empty costs roughly 3x.
+ENDGAME_EMPTIES = 12
+FASTEST_FIRST_EMPTIES = 7   # Below this many empties, order by parity only (cheaper)
+HASH_MIN_EMPTIES = 6        # Positions with fewer empties are not stored in the hash table
+HASH_MAX_ENTRIES = 1000000  # The table is cleared when it grows past this size
+
+class SearchTimeout(Exception):
+    # Raised inside a search when its deadline has passed.
+    pass
+
+
+QUADRANTS = [0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000]
+
+# Benchmark positions: 64 squares row by row (X, O or -), the side to move, and the exact score.
+# They were produced by seeded random play, one for each count from 8 to 14 empties.
+BENCHMARK_POSITIONS = [
+    ('-OXXXXXXO-OXXXX--XXOXXXXXXXXOXO-OXXOXOOXOXOX-OO-XOOOXOXXOOOOO-OX', 'X', 10),
+    ('XXXXXXXXXXXOXOXOOOXOOXOOXOXOXXOO-OXOOXXOOOXOX-O--OXXOO--O-XXO-X-', 'O', -24),
+    ('---XXXXXXXXOOOXXOXOOOXO-OOXOXX-O-OXXX-OOXXXXXOO-XXXOOXOXO-XOXX-O', 'X', -8),
+    ('OOO-O---XXXOOX--XXOOOX-OXXXXXXO-XXXOOOOO-XOOXOXOXXXOOXOOOOOO--XO', 'O', 36),
+    ('OOOOOO--OOXOOO--OXOOOO--OXXOOO--OXXXOXX-OXOOXX--OOOXXXXOOXXXXX-X', 'X', -30),
+    ('--OX--X-XXXXXXXXO-XOXXXXOXXXOOXXOXXOXOX-OXOOO-XO-OX-XXXOOXXXX---', 'O', 44),
+    ('---XXXXO---X-XXX-XXXXOX-OXXXXXXXOOOXXXX--OOXOOXX-XOOOOOO-X-OOOOO', 'X', -46),
+]
+
+
+class EndgameSolver(object):
+    # Exact alpha-beta solver for the last few empty squares.
+
+    def __init__(self):
+        self.table = {}  # (player, opponent) -> (lower bound, upper bound, best square)
+        self.nodes = 0
+        self.seconds = 0.0
+        self.deadline = None
+
+    def solve(self, player, opponent, deadline=None):
+        # Returns (best square, exact score) for player, who is to move. The square is None if player must pass.
+        # Raises SearchTimeout if clock() passes deadline before the position is solved.
+        self.nodes = 0
+        self.deadline = deadline
+        start = clock()
+        moves = getMoveBits(player, opponent)
+        if not moves:
+            score = self.negamax(player, opponent, -64, 64, False)
+            self.seconds = clock() - start
+            return None, score
+        bestSquare = None
+        alpha = -65
+        empties = 64 - countBits(player | opponent)
+        for square in self.orderMoves(player, opponent, moves, empties, None):
+            move = 1 << square
+            flips = getFlipBits(player, opponent, square)
+            score = -self.negamax(opponent ^ flips, player | flips | move, -64, -alpha, False)
+            if score > alpha:
+                alpha = score
+                bestSquare = square
+        self.seconds = clock() - start
+        return bestSquare, alpha
+
+    def nodesPerSecond(self):
+        # Returns the speed of the last solve.
+        return self.nodes / max(self.seconds, 1e-9)
+
+    def negamax(self, player, opponent, alpha, beta, passed):
+        # Returns the exact final disc difference for player within the (alpha, beta) window.
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 1023 == 0 and clock() > self.deadline:
+            raise SearchTimeout()
+        empty = ~(player | opponent) & 0xFFFFFFFFFFFFFFFF
+        if empty & (empty - 1) == 0:
+            return self.lastSquare(player, opponent, empty)
+        empties = countBits(empty)
+
+        key = None
+        hashMove = None
+        if empties >= HASH_MIN_EMPTIES:
+            key = (player, opponent)
+            entry = self.table.get(key)
+            if entry is not None:
+                lower, upper, hashMove = entry
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                if lower == upper:
+                    return lower
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+
+        moves = getMoveBits(player, opponent)
+        if not moves:
+            if passed or empty == 0:
+                return countBits(player) - countBits(opponent)
+            return -self.negamax(opponent, player, -beta, -alpha, True)
+
+        originalAlpha, originalBeta = alpha, beta
+        bestScore = -65
+        bestSquare = None
+        for square in self.orderMoves(player, opponent, moves, empties, hashMove):
+            move = 1 << square
+            flips = getFlipBits(player, opponent, square)
+            score = -self.negamax(opponent ^ flips, player | flips | move, -beta, -alpha, False)
+            if score > bestScore:
+                bestScore = score
+                bestSquare = square
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if key is not None:
+            if len(self.table) >= HASH_MAX_ENTRIES:
+                self.table.clear()
+            lower, upper = -64, 64
+            if bestScore > originalAlpha:
+                lower = bestScore
+            if bestScore < originalBeta:
+                upper = bestScore
+            self.table[key] = (lower, upper, bestSquare)
+        return bestScore
+
+    def lastSquare(self, player, opponent, empty):
+        # Returns the final score when a single square is left (or the board is full).
+        if empty == 0:
+            return countBits(player) - countBits(opponent)
+        square = empty.bit_length() - 1
+        flips = getFlipBits(player, opponent, square)
+        if flips:
+            return countBits(player | flips | empty) - countBits(opponent ^ flips)
+        flips = getFlipBits(opponent, player, square)
+        if flips:
+            return countBits(player ^ flips) - countBits(opponent | flips | empty)
+        return countBits(player) - countBits(opponent)
+
+    def orderMoves(self, player, opponent, moves, empties, hashMove):
+        # Returns the squares of a move bitboard in search order.
+        squares = squaresOf(moves)
+        empty = ~(player | opponent)
+
+        def parityKey(square):
+            # Moves in a quadrant with an odd number of empties come first.
+            for quadrant in QUADRANTS:
+                if quadrant >> square & 1:
+                    return 0 if countBits(empty & quadrant) % 2 == 1 else 1
+
+        if empties >= FASTEST_FIRST_EMPTIES:
+            def fastestFirstKey(square):
+                flips = getFlipBits(player, opponent, square)
+                replies = countBits(getMoveBits(opponent ^ flips, player | flips | (1 << square)))
+                return (replies, parityKey(square))
+            squares.sort(key=fastestFirstKey)
+        else:
+            squares.sort(key=parityKey)
+        if hashMove is not None and hashMove in squares:
+            squares.remove(hashMove)
+            squares.insert(0, hashMove)
+        return squares
+
+
+def parsePosition(text, toMove):
+    # Returns (player, opponent) bitboards for a 64-character position string and the tile to move.
+    if len(text) != 64:
+        raise ValueError('A position needs 64 squares, got %s.' % len(text))
+    discs = {'X': 0, 'O': 0}
+    for square, char in enumerate(text):
+        if char in discs:
+            discs[char] |= 1 << square
+    other = 'O' if toMove == 'X' else 'X'
+    return discs[toMove], discs[other]
+
+
+def runBenchmark():
+    # Solve every benchmark position, checking the score and reporting time and speed.
+    totalNodes = 0
+    totalSeconds = 0.0
+    failures = 0
+    for number, (text, toMove, expected) in enumerate(BENCHMARK_POSITIONS, 1):
+        player, opponent = parsePosition(text, toMove)
+        solver = EndgameSolver()
+        square, score = solver.solve(player, opponent)
+        totalNodes += solver.nodes
+        totalSeconds += solver.seconds
+        status = 'ok  ' if score == expected else 'FAIL'
+        if score != expected:
+            failures += 1
+        print('%s #%s  %2s empties  score %+3d (expected %+3d)  %8s nodes  %6.2fs  %7.0f nodes/sec'
+              % (status, number, 64 - countBits(player | opponent), score, expected,
+                 solver.nodes, solver.seconds, solver.nodesPerSecond()))
+    print('Total: %s nodes in %.2fs (%.0f nodes/sec)' % (totalNodes, totalSeconds, totalNodes / max(totalSeconds, 1e-9)))
+    return 1 if failures else 0
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Exact Reversi endgame solver.')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--benchmark', action='store_true', help='solve the built-in benchmark positions')
+    group.add_argument('--position', help='64 characters (X, O or -) listed row by row')
+    parser.add_argument('--to-move', choices=['X', 'O'], default='X', help='tile to move (default: X)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return runBenchmark()
+    player, opponent = parsePosition(args.position, args.to_move)
+    solver = EndgameSolver()
+    square, score = solver.solve(player, opponent)
+    move = 'pass' if square is None else '%s%s' % ((square & 7) + 1, (square >> 3) + 1)
+    print('Best move %s, final disc difference %+d for %s' % (move, score, args.to_move))
+    print('%s nodes in %.2fs (%.0f nodes/sec)' % (solver.nodes, solver.seconds, solver.nodesPerSecond()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
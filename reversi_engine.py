@@ -0,0 +1,278 @@
+# Reversi Engine
+# Bitboard move generation shared by reversi.py and the AI reversi scripts.
+#
+# A position is two 64-bit integers, one per tile, with square (x, y) stored in
+# bit x + 8 * y. Legal moves and flipped discs are found by shifting whole
+# bitboards one step in each of the eight directions and masking off the
+# squares that wrapped around the edge of the board, instead of walking the
+# board one square at a time.
+#
+# The functions named like the old list-based ones (getNewBoard, getValidMoves,
+# makeMove, ...) keep the same arguments and return values, so the scripts only
+# had to stop defining their own copies. Works with Python 2 and Python 3.
+
+from datetime import datetime
+
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_LEFT = 0xFEFEFEFEFEFEFEFE   # every square except column x == 0
+NOT_RIGHT = 0x7F7F7F7F7F7F7F7F  # every square except column x == 7
+CORNERS = 0x8100000000000081
+EDGES = 0xFF818181818181FF
+
+# Shift amounts for moving one square, with the mask that removes wrapped squares.
+# Positive shifts move towards higher bits (x + 1 or y + 1), negative ones towards lower bits.
+DIRECTIONS = [(1, NOT_LEFT), (9, NOT_LEFT), (8, FULL), (7, NOT_RIGHT),
+              (-1, NOT_RIGHT), (-9, NOT_RIGHT), (-8, FULL), (-7, NOT_LEFT)]
+
+OTHER_TILE = {'X': 'O', 'O': 'X'}
+START_X = (1 << 27) | (1 << 36)  # (3, 3) and (4, 4)
+START_O = (1 << 35) | (1 << 28)  # (3, 4) and (4, 3)
+CLOCK_EPOCH = datetime(1970, 1, 1)
+
+
+def getMoveBits(player, opponent, candidates=None):
+    # Returns a bitboard of the squares where player may move.
+    # candidates, if given, limits the search to those empty squares (such as a board's frontier).
+    empty = ~(player | opponent) & FULL if candidates is None else candidates
+    moves = 0
+    for shift, mask in DIRECTIONS:
+        # Grow a run of opponent discs out from the player's discs, then step once more onto an empty square.
+        # An opponent run can be at most 6 discs long.
+        if shift > 0:
+            run = (player << shift) & mask & opponent
+            run |= (run << shift) & mask & opponent
+            run |= (run << shift) & mask & opponent
+            run |= (run << shift) & mask & opponent
+            run |= (run << shift) & mask & opponent
+            run |= (run << shift) & mask & opponent
+            moves |= (run << shift) & mask & empty
+        else:
+            shift = -shift
+            run = (player >> shift) & mask & opponent
+            run |= (run >> shift) & mask & opponent
+            run |= (run >> shift) & mask & opponent
+            run |= (run >> shift) & mask & opponent
+            run |= (run >> shift) & mask & opponent
+            run |= (run >> shift) & mask & opponent
+            moves |= (run >> shift) & mask & empty
+    return moves
+
+
+def getFlipBits(player, opponent, square):
+    # Returns a bitboard of the opponent discs flipped by player moving on square (0 if the move is illegal).
+    move = 1 << square
+    flips = 0
+    for shift, mask in DIRECTIONS:
+        run = 0
+        if shift > 0:
+            step = (move << shift) & mask
+            while step & opponent:
+                run |= step
+                step = (step << shift) & mask
+        else:
+            step = (move >> -shift) & mask
+            while step & opponent:
+                run |= step
+                step = (step >> -shift) & mask
+        if step & player:
+            flips |= run
+    return flips
+
+
+def neighbourBits(bits):
+    # Returns a bitboard of the squares next to (in any of the eight directions) the squares in bits.
+    neighbours = 0
+    for shift, mask in DIRECTIONS:
+        if shift > 0:
+            neighbours |= (bits << shift) & mask
+        else:
+            neighbours |= (bits >> -shift) & mask
+    return neighbours
+
+
+def countBits(bits):
+    # Returns the number of set bits (discs) in a bitboard.
+    return bin(bits).count('1')
+
+
+def squaresOf(bits):
+    # Returns the list of square numbers set in a bitboard, lowest first.
+    squares = []
+    while bits:
+        low = bits & -bits
+        squares.append(low.bit_length() - 1)
+        bits ^= low
+    return squares
+
+
+def squareToXY(square):
+    # Returns the [x, y] coordinates of a square number.
+    return [square & 7, square >> 3]
+
+
+def xyToSquare(x, y):
+    # Returns the square number of the x, y coordinates.
+    return x + 8 * y
+
+
+def clock():
+    # Returns the current time in seconds, for timing searches.
+    # The time module is not used: under Python 2 the repo's own time.py is imported in its place.
+    return (datetime.utcnow() - CLOCK_EPOCH).total_seconds()
+
+
+def flipVertical(bits):
+    # Returns the bitboard reflected top to bottom: (x, y) -> (x, 7 - y).
+    bits = ((bits >> 8) & 0x00FF00FF00FF00FF) | ((bits & 0x00FF00FF00FF00FF) << 8)
+    bits = ((bits >> 16) & 0x0000FFFF0000FFFF) | ((bits & 0x0000FFFF0000FFFF) << 16)
+    return (bits >> 32) | ((bits & 0xFFFFFFFF) << 32)
+
+
+def mirrorHorizontal(bits):
+    # Returns the bitboard reflected left to right: (x, y) -> (7 - x, y).
+    bits = ((bits >> 1) & 0x5555555555555555) | ((bits & 0x5555555555555555) << 1)
+    bits = ((bits >> 2) & 0x3333333333333333) | ((bits & 0x3333333333333333) << 2)
+    return ((bits >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bits & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def flipDiagonal(bits):
+    # Returns the bitboard reflected in the main diagonal: (x, y) -> (y, x).
+    t = 0x0F0F0F0F00000000 & (bits ^ (bits << 28))
+    bits ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (bits ^ (bits << 14))
+    bits ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (bits ^ (bits << 7))
+    return bits ^ t ^ (t >> 7)
+
+
+# The eight symmetries of the board, as functions on bitboards.
+SYMMETRIES = [
+    lambda bits: bits,
+    mirrorHorizontal,
+    flipVertical,
+    lambda bits: flipVertical(mirrorHorizontal(bits)),
+    flipDiagonal,
+    lambda bits: mirrorHorizontal(flipDiagonal(bits)),
+    lambda bits: flipVertical(flipDiagonal(bits)),
+    lambda bits: flipVertical(mirrorHorizontal(flipDiagonal(bits))),
+]
+
+
+class Board(object):
+    # A Reversi board: one bitboard per tile, plus squares to draw as '.' hints.
+    # frontier holds the empty squares next to a disc, the only squares where a move can ever be legal.
+    # makeMove keeps it up to date, so it never has to be rebuilt from the whole board.
+    # moves caches each tile's legal moves for the current position; makeMove clears it.
+    __slots__ = ('discs', 'hints', 'frontier', 'moves')
+
+    def __init__(self, xBits=0, oBits=0, hints=0, frontier=None, moves=None):
+        self.discs = {'X': xBits, 'O': oBits}
+        self.hints = hints
+        if frontier is None:
+            frontier = neighbourBits(xBits | oBits) & ~(xBits | oBits)
+        self.frontier = frontier
+        self.moves = {} if moves is None else moves
+
+
+def getNewBoard():
+    # Creates a brand new, blank board data structure.
+    return Board()
+
+
+def resetBoard(board):
+    # Blanks out the board it is passed, except for the original starting position.
+    board.discs['X'] = START_X
+    board.discs['O'] = START_O
+    board.hints = 0
+    board.frontier = neighbourBits(START_X | START_O) & ~(START_X | START_O)
+    board.moves = {}
+
+
+def getBoardCopy(board):
+    # Make a duplicate of the board and return the duplicate.
+    return Board(board.discs['X'], board.discs['O'], board.hints, board.frontier, dict(board.moves))
+
+
+def getBoardMoveBits(board, tile):
+    # Returns a bitboard of tile's legal moves, searching only the frontier and only once per position.
+    moves = board.moves.get(tile)
+    if moves is None:
+        moves = getMoveBits(board.discs[tile], board.discs[OTHER_TILE[tile]], board.frontier)
+        board.moves[tile] = moves
+    return moves
+
+
+def getTile(board, x, y):
+    # Returns 'X', 'O', '.' (a hint) or ' ' for the square at x, y.
+    bit = 1 << (x + 8 * y)
+    if board.discs['X'] & bit:
+        return 'X'
+    if board.discs['O'] & bit:
+        return 'O'
+    if board.hints & bit:
+        return '.'
+    return ' '
+
+
+def isOnBoard(x, y):
+    # Returns True if the coordinates are located on the board.
+    return x >= 0 and x <= 7 and y >= 0 and y <= 7
+
+
+def isOnCorner(x, y):
+    # Returns True if the position is in one of the four corners.
+    return (x == 0 or x == 7) and (y == 0 or y == 7)
+
+
+def isValidMove(board, tile, xstart, ystart):
+    # Returns False if the player's move on xstart, ystart is invalid.
+    # If it is a valid move, returns a list of spaces that would become the player's if they made a move here.
+    if not isOnBoard(xstart, ystart):
+        return False
+    square = xstart + 8 * ystart
+    if not board.frontier & (1 << square):
+        return False  # Occupied, or not next to any disc.
+    flips = getFlipBits(board.discs[tile], board.discs[OTHER_TILE[tile]], square)
+    if flips == 0:
+        return False
+    return [squareToXY(flipped) for flipped in squaresOf(flips)]
+
+
+def getValidMoves(board, tile):
+    # Returns a list of [x, y] lists of valid moves for the given player on the given board.
+    return [squareToXY(square) for square in squaresOf(getBoardMoveBits(board, tile))]
+
+
+def getBoardWithValidMoves(board, tile):
+    # Returns a new board with . marking the valid moves the given player can make.
+    dupeBoard = getBoardCopy(board)
+    dupeBoard.hints = getBoardMoveBits(dupeBoard, tile)
+    return dupeBoard
+
+
+def getScoreOfBoard(board):
+    # Determine the score. Returns a dictionary with keys 'X' and 'O'.
+    return {'X': countBits(board.discs['X']), 'O': countBits(board.discs['O'])}
+
+
+def makeMove(board, tile, xstart, ystart):
+    # Place the tile on the board at xstart, ystart, and flip any of the opponent's pieces.
+    # Returns False if this is an invalid move, True if it is valid.
+    if not isOnBoard(xstart, ystart):
+        return False
+    otherTile = OTHER_TILE[tile]
+    player = board.discs[tile]
+    opponent = board.discs[otherTile]
+    move = 1 << (xstart + 8 * ystart)
+    if not board.frontier & move:
+        return False
+    flips = getFlipBits(player, opponent, xstart + 8 * ystart)
+    if flips == 0:
+        return False
+    board.discs[tile] = player | flips | move
+    board.discs[otherTile] = opponent ^ flips
+    board.hints = 0
+    # Only the new disc changes which squares are empty: it leaves the frontier and its empty neighbours join.
+    board.frontier = (board.frontier | neighbourBits(move)) & ~(player | opponent | move)
+    board.moves = {}
+    return True
@@ -0,0 +1,272 @@
+# Reversi Monte Carlo Tree Search
+# A UCT player that needs no handcrafted evaluation: it plays random games
+# (playouts) from the current position and grows a search tree towards the
+# moves that win most often.
+#
+# The tree is kept between moves, so when the game reaches a position that is
+# already in the tree the search continues from the statistics gathered there.
+# With more than one worker the search is root-parallel: each worker process
+# grows its own tree from the same position and the root visit counts are
+# added together before choosing a move.
+#
+# Example (reports playouts/sec from the opening position):
+#   python3 reversi_mcts.py --playouts 20000 --workers 4
+# Works with Python 2 and Python 3. More than one worker needs Python 3: under
+# Python 2 the repo's own time.py stops multiprocessing from importing.
+
+import math
+import random
+import sys
+
+from reversi_engine import getMoveBits, getFlipBits, countBits, squaresOf, squareToXY, clock, \
+    START_X, START_O, OTHER_TILE
+
+PASS = 64  # The move used in the tree when the side to move has to pass
+EXPLORATION = 1.4  # The UCT exploration constant
+DEFAULT_PLAYOUTS = 1000
+
+
+def playout(player, opponent, rng=random):
+    # Plays random moves to the end of the game. Returns 1.0 if player (who is to move) wins,
+    # 0.0 if player loses and 0.5 for a tie.
+    toMove = True  # True while the original player is to move
+    passed = False
+    while True:
+        moves = getMoveBits(player, opponent)
+        if moves:
+            square = rng.choice(squaresOf(moves))
+            flips = getFlipBits(player, opponent, square)
+            player, opponent = opponent ^ flips, player | flips | (1 << square)
+            passed = False
+        elif passed:
+            break
+        else:
+            player, opponent = opponent, player
+            passed = True
+        toMove = not toMove
+    difference = countBits(player) - countBits(opponent)
+    if not toMove:
+        difference = -difference
+    if difference > 0:
+        return 1.0
+    if difference < 0:
+        return 0.0
+    return 0.5
+
+
+class Node(object):
+    # One position in the search tree. wins are counted for the player who made the move into this node.
+    __slots__ = ('player', 'opponent', 'square', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, player, opponent, square=None, parent=None):
+        self.player = player
+        self.opponent = opponent
+        self.square = square
+        self.parent = parent
+        self.children = []
+        moves = getMoveBits(player, opponent)
+        if moves:
+            self.untried = squaresOf(moves)
+        elif getMoveBits(opponent, player):
+            self.untried = [PASS]
+        else:
+            self.untried = []  # The game is over
+        self.visits = 0
+        self.wins = 0.0
+
+    def play(self, square):
+        # Returns the child reached by playing square (or PASS).
+        if square == PASS:
+            child = Node(self.opponent, self.player, square, self)
+        else:
+            flips = getFlipBits(self.player, self.opponent, square)
+            child = Node(self.opponent ^ flips, self.player | flips | (1 << square), square, self)
+        self.children.append(child)
+        return child
+
+    def selectChild(self, exploration):
+        # Returns the child with the highest UCT score.
+        logVisits = math.log(self.visits)
+        best = None
+        bestScore = -1.0
+        for child in self.children:
+            score = child.wins / child.visits + exploration * math.sqrt(logVisits / child.visits)
+            if score > bestScore:
+                best = child
+                bestScore = score
+        return best
+
+
+class MCTSPlayer(object):
+    # Upper Confidence bounds applied to Trees, with the tree reused between moves.
+
+    def __init__(self, exploration=EXPLORATION, seed=None, rng=None):
+        # rng, if given, is used instead of a new random.Random(seed).
+        self.exploration = exploration
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.root = None
+        self.playouts = 0
+        self.seconds = 0.0
+
+    def findRoot(self, player, opponent):
+        # Returns the tree node for the position, reusing the old tree if the position is a
+        # child or grandchild of the old root. Otherwise a new tree is started.
+        if self.root is not None:
+            candidates = [self.root]
+            for child in self.root.children:
+                candidates.append(child)
+                candidates.extend(child.children)
+            for node in candidates:
+                if node.player == player and node.opponent == opponent:
+                    node.parent = None  # Let the rest of the old tree be freed.
+                    return node
+        return Node(player, opponent)
+
+    def search(self, player, opponent, playouts=DEFAULT_PLAYOUTS):
+        # Runs playouts from the position and returns the root node.
+        self.root = self.findRoot(player, opponent)
+        rng = self.rng
+        exploration = self.exploration
+        start = clock()
+        for _ in range(playouts):
+            node = self.root
+            # Selection: walk down fully expanded nodes.
+            while not node.untried and node.children:
+                node = node.selectChild(exploration)
+            # Expansion: add one untried move.
+            if node.untried:
+                square = node.untried.pop(rng.randrange(len(node.untried)))
+                node = node.play(square)
+            # Simulation, from the view of the player who made the move into node.
+            result = 1.0 - playout(node.player, node.opponent, rng)
+            # Backpropagation: the result flips sides at every level.
+            while node is not None:
+                node.visits += 1
+                node.wins += result
+                result = 1.0 - result
+                node = node.parent
+        self.playouts = playouts
+        self.seconds = clock() - start
+        return self.root
+
+    def playoutsPerSecond(self):
+        # Returns the speed of the last search.
+        return self.playouts / max(self.seconds, 1e-9)
+
+
+def rootStatistics(root):
+    # Returns {square: (visits, wins)} for the children of a root node.
+    return dict((child.square, (child.visits, child.wins)) for child in root.children)
+
+
+def bestSquare(statistics):
+    # Returns the most visited square, or None if the only move is a pass.
+    square = max(statistics, key=lambda square: statistics[square][0])
+    return None if square == PASS else square
+
+
+# ------------------------------
+# Root parallelisation
+# ------------------------------
+_workerPlayer = None  # Each worker process keeps its own tree between moves.
+_workerReported = None  # (player, opponent, statistics) last returned by this worker
+
+
+def runWorkerSearch(task):
+    # Worker function: search the position with this process's own tree and return the root statistics.
+    # The pool may give one worker two tasks for the same move. Its tree then still holds the visits
+    # returned for the first, so only the visits added since are returned, and none are counted twice.
+    global _workerPlayer, _workerReported
+    player, opponent, playouts, seed = task
+    if _workerPlayer is None:
+        _workerPlayer = MCTSPlayer(seed=seed)
+    root = _workerPlayer.search(player, opponent, playouts)
+    statistics = rootStatistics(root)
+    reported = {}
+    if _workerReported is not None and _workerReported[:2] == (player, opponent):
+        reported = _workerReported[2]
+    _workerReported = (player, opponent, statistics)
+    added = {}
+    for square, (visits, wins) in statistics.items():
+        oldVisits, oldWins = reported.get(square, (0, 0.0))
+        added[square] = (visits - oldVisits, wins - oldWins)
+    return added, _workerPlayer.seconds
+
+
+class ParallelMCTSPlayer(object):
+    # Root-parallel MCTS over a pool of worker processes. Call close() when finished.
+
+    def __init__(self, workers, seed=0):
+        import multiprocessing
+        self.workers = workers
+        self.seed = seed
+        self.pool = multiprocessing.Pool(workers)
+        self.playouts = 0
+        self.seconds = 0.0
+
+    def search(self, player, opponent, playouts=DEFAULT_PLAYOUTS):
+        # Splits the playouts between the workers. Returns the combined {square: (visits, wins)}.
+        tasks = [(player, opponent, playouts // self.workers, self.seed * 1000 + worker)
+                 for worker in range(self.workers)]
+        start = clock()
+        combined = {}
+        for statistics, seconds in self.pool.map(runWorkerSearch, tasks, 1):
+            for square, (visits, wins) in statistics.items():
+                oldVisits, oldWins = combined.get(square, (0, 0.0))
+                combined[square] = (oldVisits + visits, oldWins + wins)
+        self.playouts = sum(task[2] for task in tasks)
+        self.seconds = clock() - start
+        return combined
+
+    def playoutsPerSecond(self):
+        # Returns the combined speed of the last search.
+        return self.playouts / max(self.seconds, 1e-9)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+# ------------------------------
+# Strategy interface
+# ------------------------------
+# The strategy draws from the random module, like the other strategies, so the per-game
+# random.seed() calls in reversi_sim.py and reversi_tournament.py make its games reproducible.
+# A new game never reuses the old tree: every move adds a disc, so its positions cannot be in it.
+_player = MCTSPlayer(rng=random)
+
+
+def getMCTSMove(board, tile, playouts=DEFAULT_PLAYOUTS):
+    # Given a board and the computer's tile, return the move chosen by MCTS as a [x, y] list.
+    root = _player.search(board.discs[tile], board.discs[OTHER_TILE[tile]], playouts)
+    return squareToXY(bestSquare(rootStatistics(root)))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Measure MCTS playouts/sec from the Reversi opening position.')
+    parser.add_argument('--playouts', type=int, default=10000, help='playouts to run (default: 10000)')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes for root parallelisation (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        player = ParallelMCTSPlayer(args.workers, args.seed)
+        try:
+            statistics = player.search(START_X, START_O, args.playouts)
+        finally:
+            player.close()
+    else:
+        player = MCTSPlayer(seed=args.seed)
+        statistics = rootStatistics(player.search(START_X, START_O, args.playouts))
+    square = bestSquare(statistics)
+    visits, wins = statistics[square]
+    x, y = squareToXY(square)
+    print('%s playouts on %s worker(s) in %.2fs (%.0f playouts/sec)'
+          % (player.playouts, args.workers, player.seconds, player.playoutsPerSecond()))
+    print('Best move %s%s: %s visits, %.1f%% wins' % (x + 1, y + 1, visits, 100.0 * wins / visits))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# Reversi Pattern Evaluation
+# A table-driven evaluation learned from recorded games (see reversi_records.py).
+#
+# The board is read through a fixed set of patterns: edges (with the two
+# X-squares), 3x3 and 2x5 corner blocks, and the diagonals of length 4 to 8.
+# Every pattern appears once per board symmetry, and all copies of a pattern
+# share one weight table. The squares of a pattern instance form a base-3
+# number (0 empty, 1 the side to move, 2 the opponent) that indexes its table,
+# so a position is scored with one lookup per pattern instance.
+#
+# Weights are fitted per game stage by least squares: they predict the final
+# disc difference for the side to move. Training needs NumPy, but evaluating
+# does not. Weights are saved as a flat float32 file that the evaluator reads
+# with the array module.
+#
+# Example (record self-play games, then train):
+#   python3 reversi_sim.py mcts alphabeta --games 20000 --records games.rvr
+#   python3 reversi_patterns.py games.rvr
+# The weights are only as good as the games: trained on greedy or random play
+# they mostly reward disc count and search worse than the handcrafted
+# evaluation, so reversi_ai.py only uses them when the environment variable
+# REVERSI_PATTERNS names a weights file:
+#   REVERSI_PATTERNS=reversi_patterns.dat python3 reversi_sim.py alphabeta greedy
+# Evaluation works with Python 2 and Python 3.
+
+from __future__ import print_function
+
+import array
+import os
+import struct
+import sys
+
+from reversi_engine import getFlipBits, getMoveBits, countBits, START_X, START_O
+
+DEFAULT_WEIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reversi_patterns.dat')
+MAGIC = b'RPAT'
+HEADER = struct.Struct('<4sII')  # magic, stages, weights per stage
+NUM_STAGES = 4
+STAGE_EMPTIES = 15  # Each stage covers this many empty-square counts
+
+# Each pattern as (name, squares) in the orientation of the top-left corner.
+PATTERNS = [
+    ('edge+2x', [(x, 0) for x in range(8)] + [(1, 1), (6, 1)]),
+    ('corner3x3', [(x, y) for y in range(3) for x in range(3)]),
+    ('corner2x5', [(x, y) for y in range(2) for x in range(5)]),
+    ('diagonal8', [(i, i) for i in range(8)]),
+    ('diagonal7', [(i, i + 1) for i in range(7)]),
+    ('diagonal6', [(i, i + 2) for i in range(6)]),
+    ('diagonal5', [(i, i + 3) for i in range(5)]),
+    ('diagonal4', [(i, i + 4) for i in range(4)]),
+]
+
+SYMMETRIES = [lambda x, y: (x, y), lambda x, y: (7 - x, y), lambda x, y: (x, 7 - y), lambda x, y: (7 - x, 7 - y),
+              lambda x, y: (y, x), lambda x, y: (7 - y, x), lambda x, y: (y, 7 - x), lambda x, y: (7 - y, 7 - x)]
+
+
+def patternInstances():
+    # Returns a list of (pattern number, squares) for every distinct placement of every pattern on the board.
+    instances = []
+    for number, (name, squares) in enumerate(PATTERNS):
+        seen = set()
+        for symmetry in SYMMETRIES:
+            placed = [x + 8 * y for x, y in (symmetry(x, y) for x, y in squares)]
+            if frozenset(placed) not in seen:
+                seen.add(frozenset(placed))
+                instances.append((number, placed))
+    return instances
+
+
+INSTANCES = patternInstances()
+
+# Where each pattern's table starts within a stage's weights. The last weight of a stage is its bias.
+PATTERN_OFFSETS = []
+_offset = 0
+for _name, _squares in PATTERNS:
+    PATTERN_OFFSETS.append(_offset)
+    _offset += 3 ** len(_squares)
+BIAS = _offset
+STAGE_SIZE = _offset + 1
+
+
+def getStage(player, opponent):
+    # Returns the game stage (0 near the end of the game) that the position's weights come from.
+    empties = 64 - countBits(player | opponent)
+    return min(NUM_STAGES - 1, max(empties - 1, 0) // STAGE_EMPTIES)
+
+
+class PatternEvaluator(object):
+    # Scores positions with a saved set of pattern weights.
+
+    def __init__(self, path=DEFAULT_WEIGHTS):
+        with open(path, 'rb') as f:
+            magic, stages, stageSize = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or stages != NUM_STAGES or stageSize != STAGE_SIZE:
+                raise ValueError('%s does not hold weights for these patterns.' % path)
+            weights = array.array('f')
+            weights.fromfile(f, stages * stageSize)
+        if sys.byteorder != 'little':
+            weights.byteswap()
+        self.weights = [weights[stage * STAGE_SIZE:(stage + 1) * STAGE_SIZE].tolist() for stage in range(NUM_STAGES)]
+
+        # For each instance: its table offset and, for each board row it touches, the row's shift and a
+        # 256-entry table giving the base-3 value of the row's discs within the instance.
+        self.instances = []
+        for number, squares in INSTANCES:
+            rows = {}
+            for digit, square in enumerate(squares):
+                rows.setdefault(square >> 3, []).append((square & 7, 3 ** digit))
+            rowTables = []
+            for row, columns in sorted(rows.items()):
+                table = [sum(value for column, value in columns if bits >> column & 1) for bits in range(256)]
+                rowTables.append((8 * row, table))
+            self.instances.append((PATTERN_OFFSETS[number], rowTables))
+
+    def evaluate(self, player, opponent):
+        # Returns the predicted final disc difference for player, who is to move.
+        weights = self.weights[getStage(player, opponent)]
+        total = weights[BIAS]
+        for offset, rowTables in self.instances:
+            index = offset
+            for shift, table in rowTables:
+                index += table[(player >> shift) & 255] + 2 * table[(opponent >> shift) & 255]
+            total += weights[index]
+        return total
+
+
+def loadEvaluator(path=DEFAULT_WEIGHTS):
+    # Returns a PatternEvaluator for the weights file, or None if there is no such file.
+    if not os.path.exists(path):
+        return None
+    return PatternEvaluator(path)
+
+
+def saveWeights(path, weights):
+    # Saves a (NUM_STAGES, STAGE_SIZE) array of weights.
+    data = array.array('f', [float(value) for value in weights.ravel()])
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, NUM_STAGES, STAGE_SIZE))
+        data.tofile(f)
+
+
+# ------------------------------
+# Training (needs NumPy)
+# ------------------------------
+
+def gamePositions(records, maxGames=None):
+    # Replays recorded games. Returns lists of (player, opponent) positions and the final
+    # disc difference for the side to move in each.
+    players = []
+    opponents = []
+    targets = []
+    for number, (firstTile, moves, difference) in enumerate(records):
+        if maxGames is not None and number >= maxGames:
+            break
+        player, opponent = (START_X, START_O) if firstTile == 'X' else (START_O, START_X)
+        sign = 1 if firstTile == 'X' else -1  # +1 while X is to move
+        for move in moves:
+            if move is not None:
+                square = move[0] + 8 * move[1]
+                flips = getFlipBits(player, opponent, square)
+                player, opponent = player | flips | (1 << square), opponent ^ flips
+            player, opponent = opponent, player
+            sign = -sign
+            # Only positions where the side to move has a move are ever evaluated.
+            if getMoveBits(player, opponent):
+                players.append(player)
+                opponents.append(opponent)
+                targets.append(sign * difference)
+    return players, opponents, targets
+
+
+def featureIndices(players, opponents):
+    # Returns an (N, instances + 1) array of weight indices within a stage, including the bias.
+    import numpy as np
+    players = np.array(players, dtype=np.uint64)
+    opponents = np.array(opponents, dtype=np.uint64)
+    features = np.empty((len(players), len(INSTANCES) + 1), dtype=np.int64)
+    for column, (number, squares) in enumerate(INSTANCES):
+        index = np.full(len(players), PATTERN_OFFSETS[number], dtype=np.int64)
+        for digit, square in enumerate(squares):
+            bit = np.uint64(square)
+            index += (3 ** digit) * (((players >> bit) & np.uint64(1)).astype(np.int64) +
+                                     2 * ((opponents >> bit) & np.uint64(1)).astype(np.int64))
+        features[:, column] = index
+    features[:, -1] = BIAS
+    return features
+
+
+def fitStage(features, targets, ridge=1.0, iterations=100):
+    # Least-squares fit of one stage's weights, solved by conjugate gradients on the ridge-regularised
+    # normal equations. Each row of features lists the weights that are added up for one position.
+    import numpy as np
+    perRow = features.shape[1]
+    flat = features.ravel()
+
+    def normalProduct(weights):
+        # Returns (A^T A + ridge I) weights, where A is the sparse 0/1 design matrix.
+        predictions = weights[features].sum(axis=1)
+        return np.bincount(flat, weights=np.repeat(predictions, perRow), minlength=STAGE_SIZE) + ridge * weights
+
+    weights = np.zeros(STAGE_SIZE)
+    residual = np.bincount(flat, weights=np.repeat(targets, perRow), minlength=STAGE_SIZE)
+    direction = residual.copy()
+    residualNorm = residual.dot(residual)
+    for _ in range(iterations):
+        if residualNorm < 1e-9:
+            break
+        product = normalProduct(direction)
+        step = residualNorm / direction.dot(product)
+        weights += step * direction
+        residual -= step * product
+        newNorm = residual.dot(residual)
+        direction = residual + (newNorm / residualNorm) * direction
+        residualNorm = newNorm
+    return weights
+
+
+def main():
+    import argparse
+    import time
+    import numpy as np
+    from reversi_records import GameRecords
+
+    parser = argparse.ArgumentParser(description='Fit Reversi pattern weights to recorded games.')
+    parser.add_argument('records', help='record file written by reversi_sim.py --records')
+    parser.add_argument('--output', default=DEFAULT_WEIGHTS, help='weights file (default: %(default)s)')
+    parser.add_argument('--max-games', type=int, help='use at most this many games')
+    parser.add_argument('--ridge', type=float, default=1.0, help='ridge regularisation (default: 1.0)')
+    parser.add_argument('--iterations', type=int, default=100, help='conjugate-gradient iterations (default: 100)')
+    args = parser.parse_args()
+
+    start = time.time()
+    records = GameRecords(args.records)
+    try:
+        players, opponents, targets = gamePositions(records, args.max_games)
+    finally:
+        records.close()
+    features = featureIndices(players, opponents)
+    targets = np.array(targets, dtype=np.float64)
+    stages = np.array([getStage(player, opponent) for player, opponent in zip(players, opponents)])
+    print('%s positions extracted in %.1fs.' % (len(targets), time.time() - start))
+
+    weights = np.zeros((NUM_STAGES, STAGE_SIZE))
+    for stage in range(NUM_STAGES):
+        rows = stages == stage
+        if not rows.any():
+            continue
+        weights[stage] = fitStage(features[rows], targets[rows], args.ridge, args.iterations)
+        predictions = weights[stage][features[rows]].sum(axis=1)
+        error = np.sqrt(np.mean((predictions - targets[rows]) ** 2))
+        print('Stage %s: %8s positions, RMS error %.2f discs' % (stage, rows.sum(), error))
+    saveWeights(args.output, weights)
+    print('Saved %s weights to %s in %.1fs.' % (weights.size, args.output, time.time() - start))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Reversi Computer Games
+# The game loop shared by the computer-vs-computer scripts ("AI reversi 1.py",
+# "AI reversi 2.py" and "AI reversi 3.py"), the simulation harness and the
+# tournament. Players are strategies from reversi_strategies.py, chosen by
+# name, so a new pairing needs a new name rather than a new script.
+# Works with Python 2 and Python 3.
+
+from __future__ import print_function
+
+import random
+
+from reversi_engine import getNewBoard, resetBoard, makeMove, getScoreOfBoard, getTile, getBoardMoveBits, OTHER_TILE
+from reversi_strategies import getStrategy
+
+try:
+    input = raw_input  # Python 2
+except NameError:
+    pass
+
+
+def drawBoard(board):
+    # This function prints out the board that it was passed. Returns None.
+    HLINE = '  +---+---+---+---+---+---+---+---+'
+    VLINE = '  |   |   |   |   |   |   |   |   |'
+
+    print('     1   2   3   4   5   6   7   8')
+    print(HLINE)
+    for y in range(8):
+        print(VLINE)
+        print(str(y + 1) + ' ' + ''.join('| %s ' % getTile(board, x, y) for x in range(8)) + '|')
+        print(VLINE)
+        print(HLINE)
+
+
+def hasValidMove(board, tile):
+    # Returns True if tile has at least one valid move.
+    return getBoardMoveBits(board, tile) != 0
+
+
+def playGame(xStrategy, oStrategy, firstTile, beforeMove=None, passes=True):
+    # Play one game and return (board, moves). moves lists the [x, y] moves in order, with None for a pass.
+    # A player with no valid move passes; the game ends when neither player can move.
+    # With passes=False the game instead ends as soon as the player to move has no valid move
+    # (the rule the original AI reversi scripts used).
+    # beforeMove, if given, is called with (board, tile) before every move.
+    board = getNewBoard()
+    resetBoard(board)
+    strategies = {'X': xStrategy, 'O': oStrategy}
+    tile = firstTile
+    moves = []
+    while True:
+        if not hasValidMove(board, tile):
+            if not passes or not hasValidMove(board, OTHER_TILE[tile]):
+                break
+            moves.append(None)
+            tile = OTHER_TILE[tile]
+        if beforeMove is not None:
+            beforeMove(board, tile)
+        x, y = strategies[tile](board, tile)
+        makeMove(board, tile, x, y)
+        moves.append([x, y])
+        tile = OTHER_TILE[tile]
+    return board, moves
+
+
+def randomFirstTile():
+    # Randomly choose the tile that goes first.
+    if random.randint(0, 1) == 0:
+        return 'X'
+    else:
+        return 'O'
+
+
+def watchGames(xName, oName, passes=True):
+    # Show games between two strategies one move at a time, forever. passes is as for playGame.
+    def showMove(board, tile):
+        drawBoard(board)
+        scores = getScoreOfBoard(board)
+        print('X has %s points. O has %s points' % (scores['X'], scores['O']))
+        input('Press Enter to continue.')
+
+    print('Welcome to Reversi!')
+    while True:
+        turn = randomFirstTile()
+        print('The ' + turn + ' will go first.')
+        board, moves = playGame(getStrategy(xName), getStrategy(oName), turn, showMove, passes)
+
+        # Display the final score.
+        drawBoard(board)
+        scores = getScoreOfBoard(board)
+        print('X scored %s points. O scored %s points.' % (scores['X'], scores['O']))
+
+
+def countGames(xName, oName, passes=True):
+    # Ask for a number of games, play them between two strategies and print how often each side won.
+    # passes is as for playGame.
+    print('Welcome to Reversi!')
+    # For large runs use reversi_sim.py or reversi_tournament.py, which use all CPU cores.
+    numGames = int(input('Enter number of games to run:'))
+    wins = {'X': 0, 'O': 0, 'tie': 0}
+    for game in range(numGames):
+        print('Game #%s:' % (game))
+        board, moves = playGame(getStrategy(xName), getStrategy(oName), randomFirstTile(), passes=passes)
+        scores = getScoreOfBoard(board)
+        print('X scored %s points. O scored %s points.' % (scores['X'], scores['O']))
+        if scores['X'] > scores['O']:
+            wins['X'] += 1
+        elif scores['X'] < scores['O']:
+            wins['O'] += 1
+        else:
+            wins['tie'] += 1
+
+    numGames = float(numGames)
+    print('X wins %s games (%s%%), O wins %s games (%s%%), ties for %s games (%s%%) of the %s games total.'
+          % (wins['X'], round(wins['X'] / numGames * 100, 2), wins['O'], round(wins['O'] / numGames * 100, 2),
+             wins['tie'], round(wins['tie'] / numGames * 100, 2), int(numGames)))
+    input()
@@ -0,0 +1,177 @@
+# Reversi Game Records
+# Stores finished games as compact byte strings so they can be replayed or
+# mined later (for opening books or evaluation learning) without replaying
+# the simulations that produced them.
+#
+# A record is:
+#   1 byte   the tile that moved first (0 for X, 1 for O)
+#   1 byte   per move: the square x + 8 * y, or PASS_BYTE for a pass
+#   1 byte   the result: X's discs minus O's discs, plus RESULT_OFFSET
+# so a typical game takes about 62 bytes.
+#
+# Records are appended to a data file, and the offset where each one ends is
+# appended to an index file next to it (the data path plus '.idx', 8 bytes per
+# game). The record is flushed to the data file before its offset goes into the
+# index, and opening a file for writing first drops anything an interrupted run
+# left behind: index entries past the end of the data, and data past the last
+# indexed game. So a half-written game never ends up glued to the next one.
+# GameRecords memory-maps both files, so any game can be read without loading
+# the rest.
+#
+# Example (summarise a file and show one game):
+#   python3 reversi_records.py games.rvr --show 0
+# Works with Python 2 and Python 3.
+
+from __future__ import print_function
+
+import mmap
+import os
+import struct
+import sys
+
+PASS_BYTE = 64
+RESULT_OFFSET = 64
+TILES = ['X', 'O']
+INDEX_SUFFIX = '.idx'
+OFFSET = struct.Struct('<Q')
+
+
+def encodeGame(firstTile, moves, xScore, oScore):
+    # Returns the record for a game. moves lists [x, y] moves, with None for a pass.
+    data = bytearray([TILES.index(firstTile)])
+    for move in moves:
+        data.append(PASS_BYTE if move is None else move[0] + 8 * move[1])
+    data.append(xScore - oScore + RESULT_OFFSET)
+    return bytes(data)
+
+
+def decodeGame(data):
+    # Returns (firstTile, moves, difference) for a record, where moves lists [x, y] moves
+    # (None for a pass) and difference is X's discs minus O's discs.
+    data = bytearray(data)
+    moves = [None if square == PASS_BYTE else [square & 7, square >> 3] for square in data[1:-1]]
+    return TILES[data[0]], moves, data[-1] - RESULT_OFFSET
+
+
+def fileSize(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def repairFiles(path):
+    # Cuts a data file and its index back to the last game that was completely written to both,
+    # and returns the size of the data file.
+    dataSize = fileSize(path)
+    indexPath = path + INDEX_SUFFIX
+    entries = fileSize(indexPath) // OFFSET.size
+    end = 0
+    if entries:
+        with open(indexPath, 'rb') as f:
+            offsets = struct.unpack('<%sQ' % entries, f.read(entries * OFFSET.size))
+        while entries and offsets[entries - 1] > dataSize:
+            entries -= 1  # The index reached the disk before the game it points to
+        end = offsets[entries - 1] if entries else 0
+    for filePath, size in ((indexPath, entries * OFFSET.size), (path, end)):
+        if fileSize(filePath) > size:
+            with open(filePath, 'r+b') as f:
+                f.truncate(size)
+    return end
+
+
+class GameRecordWriter(object):
+    # Appends records to a data file and their offsets to its index file.
+
+    def __init__(self, path):
+        self.offset = repairFiles(path)
+        self.data = open(path, 'ab')
+        self.index = open(path + INDEX_SUFFIX, 'ab')
+
+    def write(self, record):
+        # Append one encoded record. It reaches the data file before its offset reaches the index.
+        self.offset += len(record)
+        self.data.write(record)
+        self.data.flush()
+        self.index.write(OFFSET.pack(self.offset))
+
+    def writeGame(self, firstTile, moves, xScore, oScore):
+        self.write(encodeGame(firstTile, moves, xScore, oScore))
+
+    def close(self):
+        self.data.flush()
+        os.fsync(self.data.fileno())
+        self.data.close()
+        self.index.close()
+
+
+def mapFile(path):
+    # Returns a read-only memory map of a file, or an empty string for an empty file (which cannot be mapped).
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class GameRecords(object):
+    # Random access to the records in a data file through memory maps.
+
+    def __init__(self, path):
+        self.data = mapFile(path)
+        self.index = mapFile(path + INDEX_SUFFIX)
+
+    def __len__(self):
+        return len(self.index) // OFFSET.size
+
+    def record(self, number):
+        # Returns the raw bytes of one record.
+        if not 0 <= number < len(self):
+            raise IndexError('There is no game #%s in a file of %s games.' % (number, len(self)))
+        start = OFFSET.unpack_from(self.index, (number - 1) * OFFSET.size)[0] if number else 0
+        end = OFFSET.unpack_from(self.index, number * OFFSET.size)[0]
+        return self.data[start:end]
+
+    def __getitem__(self, number):
+        return decodeGame(self.record(number))
+
+    def __iter__(self):
+        for number in range(len(self)):
+            yield self[number]
+
+    def close(self):
+        for mapped in (self.data, self.index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+def main():
+    import argparse
+    from reversi_engine import getNewBoard, resetBoard, makeMove, OTHER_TILE
+    from reversi_play import drawBoard
+
+    parser = argparse.ArgumentParser(description='Summarise a file of Reversi game records.')
+    parser.add_argument('path', help='record file written by reversi_sim.py --records')
+    parser.add_argument('--show', type=int, help='replay this game number and draw the final board')
+    args = parser.parse_args()
+
+    records = GameRecords(args.path)
+    try:
+        size = len(records.data) + len(records.index)
+        print('%s games in %s bytes (%.1f bytes per game including the index).'
+              % (len(records), size, size / float(max(len(records), 1))))
+        if args.show is not None:
+            firstTile, moves, difference = records[args.show]
+            board = getNewBoard()
+            resetBoard(board)
+            tile = firstTile
+            for move in moves:
+                if move is not None:
+                    makeMove(board, tile, move[0], move[1])
+                tile = OTHER_TILE[tile]
+            drawBoard(board)
+            print('%s moved first. %s moves, %s passes. X finished %+d.'
+                  % (firstTile, sum(1 for move in moves if move is not None), moves.count(None), difference))
+    finally:
+        records.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# Reversi Simulation Harness
+# Plays many headless games between two registered strategies (see
+# reversi_strategies.py) across a pool of worker processes, streams every
+# result to a CSV or JSON-lines file, and prints win/loss/tie counts with 95%
+# confidence intervals.
+#
+# Example:
+#   python3 reversi_sim.py random corner-side-best --games 100000 --output results.jsonl
+#
+# Each game is seeded from --seed and its game number, so a run is reproducible
+# no matter how the games are split between workers. --records appends every
+# game's moves to a compact binary file (see reversi_records.py).
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+from reversi_engine import getScoreOfBoard
+from reversi_play import playGame
+from reversi_records import GameRecordWriter, encodeGame
+from reversi_strategies import STRATEGIES, getStrategy
+
+RESULT_FIELDS = ['game', 'seed', 'x', 'o', 'first', 'xScore', 'oScore', 'winner', 'moves']
+TASKS_PER_WORKER = 4  # Default chunks per worker, so workers finishing early can take another
+MAX_CHUNK_SIZE = 500  # Largest default chunk, so big runs still stream results steadily
+
+
+def gameSeed(baseSeed, gameNumber):
+    # Returns the random seed used for one game of a run.
+    return baseSeed * 1000003 + gameNumber
+
+
+def defaultChunkSize(numGames, workers):
+    # Returns the games per task that gives each worker about TASKS_PER_WORKER tasks.
+    return max(1, min(MAX_CHUNK_SIZE, int(math.ceil(numGames / float(workers * TASKS_PER_WORKER)))))
+
+
+def runGames(task):
+    # Worker function: play a block of games and return their results.
+    xName, oName, firstGame, count, baseSeed = task
+    xStrategy = getStrategy(xName)
+    oStrategy = getStrategy(oName)
+    results = []
+    for gameNumber in range(firstGame, firstGame + count):
+        seed = gameSeed(baseSeed, gameNumber)
+        random.seed(seed)
+        firstTile = 'X' if random.randint(0, 1) == 0 else 'O'
+        board, moves = playGame(xStrategy, oStrategy, firstTile)
+        scores = getScoreOfBoard(board)
+        if scores['X'] > scores['O']:
+            winner = 'X'
+        elif scores['X'] < scores['O']:
+            winner = 'O'
+        else:
+            winner = 'tie'
+        results.append({'game': gameNumber, 'seed': seed, 'x': xName, 'o': oName, 'first': firstTile,
+                        'xScore': scores['X'], 'oScore': scores['O'], 'winner': winner,
+                        'moves': sum(1 for move in moves if move is not None),
+                        'record': encodeGame(firstTile, moves, scores['X'], scores['O'])})
+    return results
+
+
+def wilsonInterval(successes, trials, z=1.96):
+    # Returns the (low, high) Wilson score interval for a proportion (95% by default).
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / float(trials)
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+class ResultWriter(object):
+    # Streams results to a .csv file or, for any other extension, a JSON-lines file.
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.csv = None
+        if path.lower().endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+            self.csv.writeheader()
+
+    def write(self, result):
+        if self.csv is not None:
+            self.csv.writerow(result)
+        else:
+            self.file.write(json.dumps(dict((field, result[field]) for field in RESULT_FIELDS)) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+def simulate(xName, oName, numGames, workers, baseSeed=0, chunkSize=None, writer=None, recordWriter=None):
+    # Play numGames games across a process pool. Returns a dictionary of X wins, O wins and ties.
+    # chunkSize is the games per worker task (by default see defaultChunkSize). Games are seeded
+    # individually, so it does not change the results.
+    # Results go to writer and game records to recordWriter, if given.
+    if chunkSize is None:
+        chunkSize = defaultChunkSize(numGames, workers)
+    tasks = [(xName, oName, first, min(chunkSize, numGames - first), baseSeed)
+             for first in range(0, numGames, chunkSize)]
+    counts = {'X': 0, 'O': 0, 'tie': 0}
+    pool = multiprocessing.Pool(workers)
+    try:
+        for results in pool.imap_unordered(runGames, tasks):
+            for result in results:
+                counts[result['winner']] += 1
+                if writer is not None:
+                    writer.write(result)
+                if recordWriter is not None:
+                    recordWriter.write(result['record'])
+    finally:
+        pool.close()
+        pool.join()
+    return counts
+
+
+def printSummary(xName, oName, counts, seconds):
+    # Prints win/loss/tie counts with confidence intervals.
+    numGames = sum(counts.values())
+    print('%s games of X = %s vs O = %s in %.1f seconds (%.0f games/sec).'
+          % (numGames, xName, oName, seconds, numGames / max(seconds, 1e-9)))
+    for label, key in [('X wins', 'X'), ('O wins', 'O'), ('Ties', 'tie')]:
+        low, high = wilsonInterval(counts[key], numGames)
+        print('%-7s %8s  %6.2f%%  (95%% CI %.2f%% - %.2f%%)'
+              % (label, counts[key], 100.0 * counts[key] / max(numGames, 1), 100 * low, 100 * high))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Reversi games between two registered strategies.')
+    parser.add_argument('x', help='strategy playing X (one of: %s)' % ', '.join(sorted(STRATEGIES)))
+    parser.add_argument('o', help='strategy playing O')
+    parser.add_argument('--games', type=int, default=1000, help='number of games to play (default: 1000)')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='base random seed (default: 0)')
+    parser.add_argument('--chunk-size', type=int,
+                        help='games per worker task (default: enough for %s tasks per worker, at most %s games)'
+                        % (TASKS_PER_WORKER, MAX_CHUNK_SIZE))
+    parser.add_argument('--output', help='stream per-game results to this .csv or .jsonl file')
+    parser.add_argument('--records', help='append every game to this binary record file')
+    args = parser.parse_args()
+
+    for name in (args.x, args.o):
+        if name not in STRATEGIES:
+            parser.error('unknown strategy %r (choose from: %s)' % (name, ', '.join(sorted(STRATEGIES))))
+
+    writer = ResultWriter(args.output) if args.output else None
+    recordWriter = GameRecordWriter(args.records) if args.records else None
+    start = time.time()
+    try:
+        counts = simulate(args.x, args.o, args.games, args.workers, args.seed, args.chunk_size, writer, recordWriter)
+    finally:
+        if writer is not None:
+            writer.close()
+        if recordWriter is not None:
+            recordWriter.close()
+    printSummary(args.x, args.o, counts, time.time() - start)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
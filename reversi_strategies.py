@@ -0,0 +1,150 @@
+# Reversi Strategies
+# The computer players from the AI reversi scripts, registered by name so the
+# simulation tools can pick them from the command line.
+#
+# Every strategy is a function strategy(board, tile) that returns the move to
+# play as an [x, y] list. It is only called when tile has a valid move.
+# The search-based strategies are registered by module and function name, so
+# their modules are only imported when one of them is asked for.
+# Works with Python 2 and Python 3.
+
+import random
+
+from reversi_engine import getValidMoves, getBoardCopy, makeMove, getScoreOfBoard, isOnCorner
+
+# Name -> strategy function. Add new strategies with registerStrategy().
+STRATEGIES = {}
+
+
+def registerStrategy(name, strategy):
+    # Make a strategy available to the simulation tools under the given name.
+    # strategy may also be a (module name, function name) pair, imported the first time it is asked for.
+    if name in STRATEGIES:
+        raise ValueError('A strategy named %r is already registered.' % name)
+    STRATEGIES[name] = strategy
+    return strategy
+
+
+def getStrategy(name):
+    # Returns the strategy registered under name.
+    if name not in STRATEGIES:
+        raise KeyError('Unknown strategy %r. Registered strategies: %s' % (name, ', '.join(sorted(STRATEGIES))))
+    strategy = STRATEGIES[name]
+    if isinstance(strategy, tuple):
+        moduleName, functionName = strategy
+        strategy = STRATEGIES[name] = getattr(__import__(moduleName), functionName)
+    return strategy
+
+
+def getComputerMove(board, computerTile):
+    # Given a board and the computer's tile, determine where to
+    # move and return that move as a [x, y] list.
+    possibleMoves = getValidMoves(board, computerTile)
+
+    # Randomize the order of the possible moves
+    random.shuffle(possibleMoves)
+
+    # Always go for a corner if available.
+    for x, y in possibleMoves:
+        if isOnCorner(x, y):
+            return [x, y]
+
+    # Go through all the possible moves and remember the best scoring move
+    bestScore = -1
+    for x, y in possibleMoves:
+        dupeBoard = getBoardCopy(board)
+        makeMove(dupeBoard, computerTile, x, y)
+        score = getScoreOfBoard(dupeBoard)[computerTile]
+        if score > bestScore:
+            bestMove = [x, y]
+            bestScore = score
+    return bestMove
+
+
+def getRandomMove(board, tile):
+    # Return a random move.
+    return random.choice(getValidMoves(board, tile))
+
+
+def isOnSide(x, y):
+    return x == 0 or x == 7 or y == 0 or y == 7
+
+
+def getCornerSideBestMove(board, tile):
+    # Return a corner move, or a side move, or the best move
+    possibleMoves = getValidMoves(board, tile)
+
+    # Randomize the order of the possible moves
+    random.shuffle(possibleMoves)
+
+    # Always go for a corner if available.
+    for x, y in possibleMoves:
+        if isOnCorner(x, y):
+            return [x, y]
+
+    # If there is no corner, return a side move.
+    for x, y in possibleMoves:
+        if isOnSide(x, y):
+            return [x, y]
+
+    return getComputerMove(board, tile)
+
+
+def getSideBestMove(board, tile):
+    # Return a side move, or the best move
+    possibleMoves = getValidMoves(board, tile)
+
+    # Randomize the order of the possible moves
+    random.shuffle(possibleMoves)
+
+    # Return a side move, if available
+    for x, y in possibleMoves:
+        if isOnSide(x, y):
+            return [x, y]
+
+    return getComputerMove(board, tile)
+
+
+def getWorstMove(board, tile):
+    # Returns the move that flips the least number of tiles.
+    possibleMoves = getValidMoves(board, tile)
+
+    # Randomize the order of the possible moves.
+    random.shuffle(possibleMoves)
+
+    # Go through all the possible moves and remember the worst scoring move
+    worstScore = 64
+    for x, y in possibleMoves:
+        dupeBoard = getBoardCopy(board)
+        makeMove(dupeBoard, tile, x, y)
+        score = getScoreOfBoard(dupeBoard)[tile]
+        if score < worstScore:
+            worstMove = [x, y]
+            worstScore = score
+
+    return worstMove
+
+
+def getCornerWorstMove(board, tile):
+    # Return a corner, a space or the move that flips the least number of tiles
+    possibleMoves = getValidMoves(board, tile)
+
+    # Randomize the order of possible moves
+    random.shuffle(possibleMoves)
+
+    # Always go for a corner if available
+    for x, y in possibleMoves:
+        if isOnCorner(x, y):
+            return [x, y]
+
+    return getWorstMove(board, tile)
+
+
+registerStrategy('greedy', getComputerMove)
+registerStrategy('random', getRandomMove)
+registerStrategy('corner-side-best', getCornerSideBestMove)
+registerStrategy('side-best', getSideBestMove)
+registerStrategy('worst', getWorstMove)
+registerStrategy('corner-worst', getCornerWorstMove)
+registerStrategy('alphabeta', ('reversi_ai', 'getAlphaBetaMove'))
+registerStrategy('mcts', ('reversi_mcts', 'getMCTSMove'))
@@ -0,0 +1,180 @@
+# Reversi Tournament
+# Plays a round robin between registered strategies (see reversi_strategies.py)
+# across a pool of worker processes, then prints an Elo table and a timing
+# profile of the average time each strategy takes to choose a move.
+#
+# Example:
+#   python3 reversi_tournament.py greedy random corner-side-best alphabeta --games 200
+#
+# Every pair plays --games games, swapping colours each game. Like
+# reversi_sim.py, each game is seeded from --seed and its game number.
+
+import argparse
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+from reversi_engine import getScoreOfBoard
+from reversi_play import playGame, randomFirstTile
+from reversi_sim import gameSeed
+from reversi_strategies import STRATEGIES, getStrategy
+
+ELO_BASE = 1500  # The average rating
+ELO_ITERATIONS = 200
+
+
+def timedStrategy(name, profile):
+    # Returns the named strategy wrapped so that it adds its time and move count to profile[name].
+    strategy = getStrategy(name)
+    totals = profile.setdefault(name, [0.0, 0])
+
+    def move(board, tile):
+        start = time.time()
+        result = strategy(board, tile)
+        totals[0] += time.time() - start
+        totals[1] += 1
+        return result
+    return move
+
+
+def playMatch(task):
+    # Worker function: play a block of games between two strategies.
+    # Returns (results, profile): results is a list of (xName, oName, xScore, oScore) and
+    # profile maps each strategy name to [seconds spent choosing moves, moves chosen].
+    nameA, nameB, firstGame, count, baseSeed = task
+    profile = {}
+    players = {nameA: timedStrategy(nameA, profile), nameB: timedStrategy(nameB, profile)}
+    results = []
+    for gameNumber in range(firstGame, firstGame + count):
+        random.seed(gameSeed(baseSeed, gameNumber))
+        # Colours alternate so each strategy plays X in half the games.
+        if gameNumber % 2 == 0:
+            xName, oName = nameA, nameB
+        else:
+            xName, oName = nameB, nameA
+        board, moves = playGame(players[xName], players[oName], randomFirstTile())
+        scores = getScoreOfBoard(board)
+        results.append((xName, oName, scores['X'], scores['O']))
+    return results, profile
+
+
+def roundRobinTasks(names, gamesPerPair, baseSeed, chunkSize):
+    # Returns the worker tasks for every pair of strategies. Game numbers are unique across the tournament.
+    tasks = []
+    pairNumber = 0
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            firstGame = pairNumber * gamesPerPair
+            for first in range(0, gamesPerPair, chunkSize):
+                tasks.append((names[i], names[j], firstGame + first, min(chunkSize, gamesPerPair - first), baseSeed))
+            pairNumber += 1
+    return tasks
+
+
+def fitElo(names, results):
+    # Returns {name: Elo rating} fitted to the game results by maximum likelihood (the Bradley-Terry model).
+    # A tie counts as half a win for each side. Every pair that met is also given one extra tied game,
+    # so a strategy that won (or lost) every game still gets a finite rating.
+    wins = dict((name, 0.0) for name in names)
+    games = dict((name, {}) for name in names)  # name -> {opponent: games played}
+    for xName, oName, xScore, oScore in results:
+        if xScore > oScore:
+            wins[xName] += 1
+        elif xScore < oScore:
+            wins[oName] += 1
+        else:
+            wins[xName] += 0.5
+            wins[oName] += 0.5
+        games[xName][oName] = games[xName].get(oName, 0) + 1
+        games[oName][xName] = games[oName].get(xName, 0) + 1
+    for name in names:
+        for opponent in games[name]:
+            wins[name] += 0.5
+            games[name][opponent] += 1
+
+    strength = dict((name, 1.0) for name in names)
+    for _ in range(ELO_ITERATIONS):
+        updated = {}
+        for name in names:
+            denominator = sum(count / (strength[name] + strength[opponent])
+                              for opponent, count in games[name].items())
+            updated[name] = wins[name] / denominator if denominator else strength[name]
+        # Keep the geometric mean at 1 so the average rating stays at ELO_BASE.
+        logMean = sum(math.log(value) for value in updated.values()) / len(updated)
+        strength = dict((name, value / math.exp(logMean)) for name, value in updated.items())
+    return dict((name, ELO_BASE + 400 * math.log10(strength[name])) for name in names)
+
+
+def runTournament(names, gamesPerPair, workers, baseSeed=0, chunkSize=50):
+    # Play the round robin across a process pool. Returns (results, profile) for all games.
+    tasks = roundRobinTasks(names, gamesPerPair, baseSeed, chunkSize)
+    results = []
+    profile = dict((name, [0.0, 0]) for name in names)
+    pool = multiprocessing.Pool(workers)
+    try:
+        for taskResults, taskProfile in pool.imap_unordered(playMatch, tasks):
+            results.extend(taskResults)
+            for name, (seconds, moves) in taskProfile.items():
+                profile[name][0] += seconds
+                profile[name][1] += moves
+    finally:
+        pool.close()
+        pool.join()
+    return results, profile
+
+
+def printTable(names, results, profile):
+    # Prints the strategies ranked by Elo with their records and average time per move.
+    ratings = fitElo(names, results)
+    record = dict((name, [0, 0, 0]) for name in names)  # wins, losses, ties
+    for xName, oName, xScore, oScore in results:
+        if xScore > oScore:
+            record[xName][0] += 1
+            record[oName][1] += 1
+        elif xScore < oScore:
+            record[oName][0] += 1
+            record[xName][1] += 1
+        else:
+            record[xName][2] += 1
+            record[oName][2] += 1
+
+    print('%4s  %-18s %6s %7s %6s %6s %6s %7s %10s'
+          % ('Rank', 'Strategy', 'Elo', 'Games', 'Wins', 'Losses', 'Ties', 'Score', 'ms/move'))
+    for rank, name in enumerate(sorted(names, key=lambda name: -ratings[name]), 1):
+        won, lost, tied = record[name]
+        played = won + lost + tied
+        seconds, moves = profile[name]
+        print('%4s  %-18s %6.0f %7s %6s %6s %6s %6.1f%% %10.3f'
+              % (rank, name, ratings[name], played, won, lost, tied,
+                 100.0 * (won + 0.5 * tied) / max(played, 1), 1000.0 * seconds / max(moves, 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a round-robin tournament between registered strategies.')
+    parser.add_argument('strategies', nargs='*',
+                        help='strategies to enter (default: all of %s)' % ', '.join(sorted(STRATEGIES)))
+    parser.add_argument('--games', type=int, default=100, help='games per pair of strategies (default: 100)')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='base random seed (default: 0)')
+    parser.add_argument('--chunk-size', type=int, default=50, help='games per worker task (default: 50)')
+    args = parser.parse_args()
+
+    names = args.strategies or sorted(STRATEGIES)
+    for name in names:
+        if name not in STRATEGIES:
+            parser.error('unknown strategy %r (choose from: %s)' % (name, ', '.join(sorted(STRATEGIES))))
+    if len(set(names)) != len(names) or len(names) < 2:
+        parser.error('enter at least two different strategies')
+
+    start = time.time()
+    results, profile = runTournament(names, args.games, args.workers, args.seed, args.chunk_size)
+    print('%s games between %s strategies in %.1f seconds.' % (len(results), len(names), time.time() - start))
+    printTable(names, results, profile)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
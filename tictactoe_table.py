@@ -0,0 +1,83 @@
+# Tic Tac Toe Table
+# Perfect play for Tic Tac Toe from a lookup table, shared by "Tic Tac Toe.py"
+# and "Tic Tac Toe other.py".
+#
+# The whole game is solved once, when this module is imported, by minimax with
+# memoisation over every position that can come up (with either X or O moving
+# first, since the scripts let either side start). A board is turned into a
+# number by reading its squares as a base-3 number (0 empty, 1 X, 2 O), and the
+# best move for each number is stored in a table per letter, so choosing a move
+# is a single lookup.
+#
+# Squares are numbered 0 - 8 from the top-left corner, row by row:
+#   0 | 1 | 2
+#   3 | 4 | 5
+#   6 | 7 | 8
+# Works with Python 2 and Python 3.
+
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+         (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+         (0, 4, 8), (2, 4, 6))             # diagonals
+DIGITS = {' ': 0, 'X': 1, 'O': 2}
+POWERS = [3 ** square for square in range(9)]
+NO_MOVE = 9  # Stored for positions where the game is already over
+
+
+def boardIndex(squares):
+    # Returns the table index of a board given as 9 letters ('X', 'O' or ' ') from the top-left corner.
+    index = 0
+    for square, letter in enumerate(squares):
+        index += DIGITS[letter] * POWERS[square]
+    return index
+
+
+def solveGame():
+    # Returns {1: best moves for X, 2: best moves for O}, each a bytearray indexed by board index.
+    bestMoves = {1: bytearray([NO_MOVE]) * 3 ** 9, 2: bytearray([NO_MOVE]) * 3 ** 9}
+    memo = {}
+    cells = [0] * 9
+
+    def score(index, mover, empties):
+        # Returns the minimax score for mover: positive for a win (larger when it comes sooner),
+        # negative for a loss (larger when it comes later) and 0 for a tie.
+        key = (index, mover)
+        if key in memo:
+            return memo[key]
+        other = 3 - mover
+        for a, b, c in LINES:
+            if cells[a] == other and cells[b] == other and cells[c] == other:
+                memo[key] = -(empties + 1)  # The last move won.
+                return memo[key]
+        if empties == 0:
+            memo[key] = 0
+            return 0
+        best = None
+        bestSquare = NO_MOVE
+        for square in range(9):
+            if cells[square] == 0:
+                cells[square] = mover
+                value = -score(index + mover * POWERS[square], other, empties - 1)
+                cells[square] = 0
+                if best is None or value > best:
+                    best = value
+                    bestSquare = square
+        bestMoves[mover][index] = bestSquare
+        memo[key] = best
+        return best
+
+    score(0, 1, 9)  # X moves first
+    score(0, 2, 9)  # O moves first
+    return bestMoves
+
+
+_bestMoves = solveGame()
+BEST_MOVES = {'X': _bestMoves[1], 'O': _bestMoves[2]}
+
+
+def getBestMove(squares, letter):
+    # Returns the best square (0 - 8) for letter to play on a board of 9 letters from the top-left corner,
+    # or None if the game is already over.
+    move = BEST_MOVES[letter][boardIndex(squares)]
+    if move == NO_MOVE:
+        return None
+    return move